@@ -5,36 +5,578 @@ Lightweight, no auth; fetches prices and device settings from the local hub.
 
 import json
 import os
+import struct
+import time
+from array import array
 
 try:
     import adafruit_requests
 except Exception:
     adafruit_requests = None
 
+try:
+    import errno
+    _EAGAIN = errno.EAGAIN
+    _EINPROGRESS = getattr(errno, "EINPROGRESS", 119)
+except Exception:
+    _EAGAIN = 11
+    _EINPROGRESS = 119
+
+# errno values meaning "not ready yet" on a non-blocking socket
+_RETRY_ERRNOS = (_EAGAIN, _EINPROGRESS, 11, 115, 116, 119)
+
+# Bytes read from the socket per step when streaming a response
+PARSE_CHUNK_SIZE = 512
+
+CONFIG_PATH = 'device_config.json'
+
+# Hub address resolution: a name lookup (mDNS for .local) is reused for
+# HUB_ADDR_TTL seconds and dropped early after HUB_ADDR_MAX_FAILURES
+# consecutive failed requests, so a hub that moved is found again
+HUB_ADDR_TTL = 3600
+HUB_ADDR_MAX_FAILURES = 2
+
+# mDNS service the hub announces (see the hub's setup scripts)
+HUB_MDNS_SERVICE = "_tickertronix"
+HUB_MDNS_TIMEOUT = 2  # seconds
+
+_addr_cache = {}  # (host, port) -> (sockaddr, resolved at)
+
+
+def _resolve(pool, host, port):
+    key = (host, port)
+    now = time.monotonic()
+    entry = _addr_cache.get(key)
+    if entry is not None and now - entry[1] < HUB_ADDR_TTL:
+        return entry[0]
+    addr = pool.getaddrinfo(host, port)[0][-1]
+    _addr_cache[key] = (addr, now)
+    return addr
+
+
+def _forget_addr(host, port):
+    _addr_cache.pop((host, port), None)
+
+
+def _discover_hub():
+    """Base URL of a hub announcing HUB_MDNS_SERVICE on the LAN, or None."""
+    try:
+        import mdns
+        import wifi
+        server = mdns.Server(wifi.radio)
+        for service in server.find(service_type=HUB_MDNS_SERVICE, protocol="_tcp", timeout=HUB_MDNS_TIMEOUT):
+            if service.ipv4_address:
+                return "http://{}:{}".format(service.ipv4_address, service.port)
+    except Exception as e:
+        print("[HUB] mDNS discovery failed:", e)
+    return None
+
+
+def _split_url(url):
+    """Split http://host[:port]/path into (host, port, path)."""
+    rest = url.split("://", 1)[-1]
+    hostport, _, path = rest.partition("/")
+    host, _, port = hostport.partition(":")
+    return host, int(port or 80), "/" + path
+
+
+def _errno(e):
+    try:
+        return e.errno
+    except Exception:
+        return e.args[0] if e.args else None
+
+
+class _BackgroundGet:
+    """
+    Plain-HTTP GET advanced one small slice per poll() on a non-blocking socket,
+    so it can run in the display loop's spare time instead of freezing it.
+    With a sink, a 200 response body is handed over chunk by chunk as it
+    arrives instead of being collected in .body.
+    """
+
+    def __init__(self, pool, url, timeout=10, sink=None):
+        self.status = None
+        self.body = None
+        self.error = None
+        self.date = None  # Date header of the response, if any
+        self._pool = pool
+        self._timeout = timeout
+        self._sink = sink
+        self._started = time.monotonic()
+        self._sock = None
+        self._head = bytearray()
+        self._rx = bytearray(PARSE_CHUNK_SIZE)
+        self._remaining = None  # body bytes still expected (Content-Length), -1 if unknown
+        self._state = "connect"
+        self._host, self._port, path = _split_url(url)
+        self._request = "GET {} HTTP/1.0\r\nHost: {}\r\nConnection: close\r\n\r\n".format(
+            path, self._host).encode()
+
+    @property
+    def done(self):
+        return self._state in ("done", "failed")
+
+    def _fail(self, error):
+        self.error = error
+        self._state = "failed"
+        self.close()
+        try:
+            print("[HUB] Background fetch failed:", error)
+        except Exception:
+            pass
+        return True
+
+    def _finish(self):
+        if self.status is None:
+            return self._fail("incomplete response")
+        if self.body is not None:
+            self.body = bytes(self.body)
+        self._state = "done"
+        self.close()
+        return True
+
+    def _parse_head(self):
+        end = self._head.find(b"\r\n\r\n")
+        if end < 0:
+            return None
+        head = bytes(self._head[:end])
+        rest = bytes(self._head[end + 4:])
+        self._head = None
+        lines = head.split(b"\r\n")
+        try:
+            self.status = int(lines[0].split(b" ", 2)[1])
+        except Exception:
+            self._fail("bad status line")
+            return None
+        self._remaining = -1
+        for line in lines[1:]:
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                self._remaining = int(value.strip())
+            elif name == b"date":
+                self.date = str(value.strip(), "ascii")
+        if self._sink is None or self.status != 200:
+            self._sink = None
+            self.body = bytearray()
+        return rest
+
+    def _take_body(self, data):
+        if data:
+            if self._sink is not None:
+                self._sink(data)
+            else:
+                self.body.extend(data)
+            if self._remaining > 0:
+                self._remaining -= len(data)
+        return self._remaining == 0
+
+    def poll(self):
+        """Advance the request by one step; returns True once it has finished (or failed)."""
+        if self.done:
+            return True
+        if time.monotonic() - self._started > self._timeout:
+            return self._fail("timeout")
+        try:
+            if self._state == "connect":
+                addr = _resolve(self._pool, self._host, self._port)
+                self._sock = self._pool.socket(self._pool.AF_INET, self._pool.SOCK_STREAM)
+                self._sock.setblocking(False)
+                try:
+                    self._sock.connect(addr)
+                except OSError as e:
+                    if _errno(e) not in _RETRY_ERRNOS:
+                        raise
+                self._state = "send"
+            elif self._state == "send":
+                sent = self._sock.send(self._request)
+                if sent:
+                    self._request = self._request[sent:]
+                if not self._request:
+                    self._state = "recv"
+            elif self._state == "recv":
+                n = self._sock.recv_into(self._rx)
+                if not n:
+                    return self._finish()
+                data = memoryview(self._rx)[:n]
+                if self.status is None:
+                    self._head.extend(data)
+                    data = self._parse_head()
+                    if self.done:
+                        return True
+                    if data is None:
+                        return False
+                if self._take_body(data):
+                    return self._finish()
+        except OSError as e:
+            if _errno(e) in _RETRY_ERRNOS:
+                return False
+            return self._fail(e)
+        except Exception as e:
+            return self._fail(e)
+        return False
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except Exception:
+                pass
+            self._sock = None
+
+
+# Keys read from each /prices item -> slot; everything else (including nested values) is skipped
+_PRICE_KEYS = {
+    b"asset_class": 0,
+    b"symbol": 1,
+    b"ticker": 2,
+    b"last_price": 3,
+    b"last": 4,
+    b"lastPrice": 5,
+    b"change_amount": 6,
+    b"change": 7,
+    b"change_percent": 8,
+}
+_WS = b" \t\r\n"
+_DELIMS = b" \t\r\n,]}"
+
+
+def _json_scalar(token):
+    if token == b"null":
+        return None
+    if token == b"true":
+        return True
+    if token == b"false":
+        return False
+    try:
+        return float(token.decode())
+    except Exception:
+        return None
+
+
+def _json_string(raw):
+    if b"\\" in raw:
+        return json.loads(b'"' + raw + b'"')
+    return raw.decode()
+
+
+class PriceStreamParser:
+    """
+    Incremental parser for the hub's /prices body (a JSON array of flat objects).
+
+    Bytes are pushed in with feed() in any chunking; each finished item is
+    handed to on_item(asset_class, symbol, last, change_amount, change_percent)
+    and forgotten, so memory use does not grow with the watchlist. A top-level
+    object (e.g. an error document) is collected and decoded by finish() into
+    .document instead.
+    """
+
+    def __init__(self, on_item):
+        self.on_item = on_item
+        self.count = 0
+        self.document = None
+        self._pending = b""
+        self._depth = 0
+        self._expect_key = False
+        self._slot = -1
+        self._slots = [None] * 9
+        self._object = None
+
+    def _emit(self):
+        s = self._slots
+        try:
+            self.on_item(
+                (s[0] or "").lower(),
+                s[1] or s[2] or "",
+                s[3] or s[4] or s[5] or 0,
+                s[6] or s[7] or 0,
+                s[8] or 0,
+            )
+            self.count += 1
+        except Exception as e:
+            print("[HUB] Skipping bad ticker:", e)
+        for k in range(9):
+            s[k] = None
+
+    def feed(self, chunk):
+        if self._object is not None:
+            self._object.extend(chunk)
+            return
+        buf = self._pending + bytes(chunk) if self._pending else bytes(chunk)
+        self._pending = b""
+        n = len(buf)
+        i = 0
+        while i < n:
+            c = buf[i]
+            if c in _WS:
+                i += 1
+            elif c == 44:  # ,
+                if self._depth == 2:
+                    self._expect_key = True
+                i += 1
+            elif c == 58:  # :
+                i += 1
+            elif c == 123 or c == 91:  # { [
+                if self._depth == 0 and c == 123:
+                    self._object = bytearray(buf[i:])
+                    return
+                self._depth += 1
+                if self._depth == 2:
+                    self._expect_key = c == 123
+                i += 1
+            elif c == 125 or c == 93:  # } ]
+                if self._depth == 2:
+                    self._emit()
+                self._depth -= 1
+                if self._depth == 2:
+                    self._slot = -1
+                i += 1
+            elif c == 34:  # "
+                j = i + 1
+                while True:
+                    j = buf.find(b'"', j)
+                    if j < 0:
+                        break
+                    k = j - 1
+                    while buf[k] == 92:  # backslash
+                        k -= 1
+                    if (j - 1 - k) % 2 == 0:
+                        break
+                    j += 1
+                if j < 0:
+                    self._pending = buf[i:]
+                    return
+                if self._depth == 2:
+                    raw = buf[i + 1:j]
+                    if self._expect_key:
+                        self._slot = _PRICE_KEYS.get(raw, -1)
+                        self._expect_key = False
+                    else:
+                        if self._slot >= 0:
+                            self._slots[self._slot] = _json_string(raw)
+                        self._slot = -1
+                i = j + 1
+            else:  # number, true, false, null
+                j = i + 1
+                while j < n and buf[j] not in _DELIMS:
+                    j += 1
+                if j >= n:
+                    self._pending = buf[i:]
+                    return
+                if self._depth == 2:
+                    if self._slot >= 0:
+                        self._slots[self._slot] = _json_scalar(buf[i:j])
+                    self._slot = -1
+                i = j
+
+    def finish(self):
+        """Call after the last chunk; decodes a top-level object body if there was one."""
+        if self._object is not None:
+            self.document = json.loads(bytes(self._object))
+            self._object = None
+        return self.count
+
+
+# Asset kinds stored in TickerTable.kinds, indexed like the display-setting source names
+KIND_STOCK = 0
+KIND_CRYPTO = 1
+KIND_FOREX = 2
+KIND_NAMES = ('stocks', 'crypto', 'forex')
+
+# Interned symbols kept across fetches before the table is reset
+SYMBOL_INTERN_MAX = 512
+
+# On-flash copy of the last good fetch, drawn at boot before Wi-Fi and the hub are up.
+# Layout: magic, version, saved_at, count, then the table columns and the symbols.
+PRICE_CACHE_PATH = "price_cache.bin"
+PRICE_CACHE_MAGIC = b"TTPC"
+PRICE_CACHE_VERSION = 1
+PRICE_CACHE_MIN_INTERVAL = 3600  # seconds between cache writes, to spare the flash
+_PRICE_CACHE_HEADER = "<BIH"
+
+
+class TickerTable:
+    """
+    Column store for one price fetch: per ticker a kind byte, an interned symbol
+    and two float32 values (price; change amount for stocks, change percent for
+    crypto, unused for forex) instead of a dict or tuple per ticker.
+    """
+
+    def __init__(self, intern=None):
+        self.kinds = bytearray()
+        self.symbols = []
+        self.prices = array('f')
+        self.changes = array('f')
+        self.saved_at = None  # epoch seconds when loaded from the price cache
+        self._intern = intern if intern is not None else {}
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def append(self, kind, symbol, price, change):
+        # Reuse the symbol string from earlier fetches so unchanged watchlists keep no new strings
+        sym = self._intern.get(symbol)
+        if sym is None:
+            sym = symbol
+            self._intern[symbol] = symbol
+        self.kinds.append(kind)
+        self.symbols.append(sym)
+        self.prices.append(price)
+        self.changes.append(change)
+
+    def count(self, kind):
+        n = 0
+        for k in self.kinds:
+            if k == kind:
+                n += 1
+        return n
+
+    def indices(self, kinds):
+        """Row numbers of the given kinds, grouped in the order the kinds are listed."""
+        out = array('H')
+        for kind in kinds:
+            for i, k in enumerate(self.kinds):
+                if k == kind:
+                    out.append(i)
+        return out
+
+    def copy_rows(self, rows, start, count):
+        """New table holding rows[start:start+count] (row numbers into this table)."""
+        t = TickerTable(self._intern)
+        for k in range(start, start + count):
+            i = rows[k]
+            t.append(self.kinds[i], self.symbols[i], self.prices[i], self.changes[i])
+        return t
+
+    def same_row(self, i, other, j):
+        return (self.symbols[i] == other.symbols[j] and self.kinds[i] == other.kinds[j]
+                and self.prices[i] == other.prices[j] and self.changes[i] == other.changes[j])
+
+    def to_bytes(self, saved_at):
+        n = len(self.symbols)
+        values = "<{}f".format(n)
+        return b"".join((
+            PRICE_CACHE_MAGIC,
+            struct.pack(_PRICE_CACHE_HEADER, PRICE_CACHE_VERSION, int(saved_at), n),
+            bytes(self.kinds),
+            struct.pack(values, *self.prices),
+            struct.pack(values, *self.changes),
+            "\n".join(self.symbols).encode(),
+        ))
+
+    @classmethod
+    def from_bytes(cls, data, intern=None):
+        """Table written by to_bytes(); raises ValueError if data is not a current-version cache."""
+        if data[:len(PRICE_CACHE_MAGIC)] != PRICE_CACHE_MAGIC:
+            raise ValueError("bad magic")
+        off = len(PRICE_CACHE_MAGIC)
+        version, saved_at, n = struct.unpack_from(_PRICE_CACHE_HEADER, data, off)
+        if version != PRICE_CACHE_VERSION:
+            raise ValueError("version {}".format(version))
+        off += struct.calcsize(_PRICE_CACHE_HEADER)
+        values = "<{}f".format(n)
+        size = struct.calcsize(values)
+        if len(data) < off + n + 2 * size:
+            raise ValueError("truncated")
+        kinds = data[off:off + n]
+        off += n
+        prices = struct.unpack_from(values, data, off)
+        changes = struct.unpack_from(values, data, off + size)
+        symbols = str(data[off + 2 * size:], "utf-8").split("\n") if n else []
+        if len(symbols) != n:
+            raise ValueError("symbols")
+        table = cls(intern)
+        for i in range(n):
+            table.append(kinds[i], symbols[i], prices[i], changes[i])
+        table.saved_at = saved_at
+        return table
+
+
+_cache_written = None
+
+
+def load_price_cache(intern=None):
+    """The TickerTable last saved by save_price_cache(), or None if there is none usable."""
+    # A missing cache with a leftover temp file means power was lost between remove and rename
+    for path in (PRICE_CACHE_PATH, PRICE_CACHE_PATH + ".tmp"):
+        try:
+            with open(path, "rb") as f:
+                return TickerTable.from_bytes(f.read(), intern)
+        except OSError:
+            pass
+        except Exception as e:
+            print("[CACHE] Ignoring price cache {}: {}".format(path, e))
+    return None
+
+
+def save_price_cache(table, force=False):
+    """
+    Write table to flash as the boot-time price cache. Rate limited to one
+    write per PRICE_CACHE_MIN_INTERVAL unless force; returns True if written.
+    """
+    global _cache_written
+    now = time.monotonic()
+    if not table or (not force and _cache_written is not None and now - _cache_written < PRICE_CACHE_MIN_INTERVAL):
+        return False
+    # Count failed writes too so a read-only filesystem is not retried every cycle
+    _cache_written = now
+    tmp = PRICE_CACHE_PATH + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(table.to_bytes(time.time()))
+        # FAT rename does not replace an existing file
+        try:
+            os.remove(PRICE_CACHE_PATH)
+        except OSError:
+            pass
+        os.rename(tmp, PRICE_CACHE_PATH)
+    except OSError as e:
+        print("[CACHE] Price cache not saved:", e)
+        return False
+    print("[CACHE] Saved {} prices to {}".format(len(table), PRICE_CACHE_PATH))
+    return True
+
 
 class LocalHubAPI:
     """Lightweight client for the local hub (no auth)."""
 
-    def __init__(self, requests_session, base_url=None):
+    def __init__(self, requests_session, base_url=None, socket_pool=None):
         self.session = requests_session
+        self.pool = socket_pool
+        self._prefetch = None
+        self._prefetch_result = None
+        self._symbols = {}
+        self._config = None
+        self._hub_failures = 0
         default_base = "http://tickertronixhub.local:5001"  # Use mDNS hostname
         self.base_url = (base_url or self._load_base_url() or default_base).rstrip('/')
         self.settings_version = None
         self.should_refresh_settings = False
+        self.hub_date = None  # Date header of the last finished background /prices response
         try:
             print("[HUB] Using base URL:", self.base_url)
         except Exception:
             pass
 
+    def _device_config(self):
+        """device_config.json, parsed on first use and kept in memory ({} if unreadable)."""
+        if self._config is None:
+            try:
+                with open(CONFIG_PATH, 'r') as f:
+                    self._config = json.loads(f.read()) or {}
+            except Exception:
+                self._config = {}
+        return self._config
+
+    def reload_config(self):
+        """Drop the in-memory device config so the next call reads the file again."""
+        self._config = None
+
     def _load_base_url(self):
-        try:
-            with open('device_config.json', 'r') as f:
-                cfg = json.loads(f.read())
-                hub = cfg.get('hub_base_url')
-                if hub:
-                    return hub
-        except Exception:
-            pass
+        hub = self._device_config().get('hub_base_url')
+        if hub:
+            return hub
         try:
             hub_env = os.getenv("HUB_BASE_URL")
             if hub_env:
@@ -48,6 +590,10 @@ class LocalHubAPI:
                     return url
         except Exception:
             pass
+        url = _discover_hub()
+        if url:
+            print("[HUB] Found hub via mDNS:", url)
+            return url
         # Fallback: try Wi-Fi gateway as the hub host
         try:
             import wifi
@@ -58,6 +604,29 @@ class LocalHubAPI:
             pass
         return None
 
+    def hub_url(self, path):
+        """URL for path on the hub, with the hub's host name replaced by its cached address."""
+        if self.pool is None or not self.base_url.startswith("http://"):
+            return self.base_url + path
+        host, port, base_path = _split_url(self.base_url)
+        try:
+            addr = _resolve(self.pool, host, port)
+        except Exception as e:
+            print("[HUB] Could not resolve {}: {}".format(host, e))
+            return self.base_url + path
+        return "http://{}:{}{}{}".format(addr[0], addr[1], base_path.rstrip('/'), path)
+
+    def _hub_ok(self):
+        self._hub_failures = 0
+
+    def _hub_failed(self):
+        """Count a request that got no answer; resolve the hub again after a few in a row."""
+        self._hub_failures += 1
+        if self._hub_failures >= HUB_ADDR_MAX_FAILURES:
+            host, port, _ = _split_url(self.base_url)
+            _forget_addr(host, port)
+            self._hub_failures = 0
+
     def send_heartbeat(self):
         """Send periodic heartbeat to hub with device identification."""
         if not self.session:
@@ -66,24 +635,21 @@ class LocalHubAPI:
         device_id = None
         device_type = "matrix_portal_scroll"
         device_name = None
-        try:
-            with open('device_config.json', 'r') as f:
-                cfg = json.loads(f.read()) or {}
-                device_id = cfg.get('device_key') or cfg.get('device_id')
-                device_type = cfg.get('device_type', device_type)
-                device_name = cfg.get('device_name')
-        except Exception:
-            pass
+        cfg = self._device_config()
+        device_id = cfg.get('device_key') or cfg.get('device_id')
+        device_type = cfg.get('device_type', device_type)
+        device_name = cfg.get('device_name')
 
         if not device_id:
             return False
 
         try:
             resp = self.session.post(
-                f"{self.base_url}/device/{device_id}/heartbeat",
+                self.hub_url(f"/device/{device_id}/heartbeat"),
                 json={"device_type": device_type, "device_name": device_name},
                 timeout=5
             )
+            self._hub_ok()
             if resp.status_code == 200:
                 try:
                     data = resp.json()
@@ -99,17 +665,19 @@ class LocalHubAPI:
                 pass
             return False
         except Exception as e:
+            self._hub_failed()
             try:
                 print(f"[HUB] Heartbeat error: {e}")
             except Exception:
                 pass
             return False
 
-    def get_display_settings(self):
-        """
-        Fetch display settings from hub, falling back to local config.
-        Priority: Hub settings > device_config.json > hardcoded defaults
-        """
+    def _read_device_id(self):
+        cfg = self._device_config()
+        return cfg.get('device_key') or cfg.get('device_id')
+
+    def _default_display_settings(self):
+        """Hardcoded defaults overlaid with any values from device_config.json."""
         defaults = {
             'scroll_mode': 'single',
             'top_sources': ['stocks'],
@@ -119,26 +687,32 @@ class LocalHubAPI:
             'scroll_speed': 100,
             'update_interval': 300  # seconds
         }
+        cfg = self._device_config()
+        for k in defaults.keys():
+            if k in cfg:
+                defaults[k] = cfg[k]
+        return defaults
 
-        device_id = None
-        try:
-            with open('device_config.json', 'r') as f:
-                cfg = json.loads(f.read()) or {}
-                device_id = cfg.get('device_key') or cfg.get('device_id')
-                for k in defaults.keys():
-                    if k in cfg:
-                        defaults[k] = cfg[k]
-        except Exception:
-            pass
+    def _apply_hub_settings(self, settings, hub_settings):
+        settings.update(hub_settings)
+        self.settings_version = hub_settings.get('updated_at') or self.settings_version
+        self.should_refresh_settings = False
+        return settings
+
+    def get_display_settings(self):
+        """
+        Fetch display settings from hub, falling back to local config.
+        Priority: Hub settings > device_config.json > hardcoded defaults
+        """
+        defaults = self._default_display_settings()
+        device_id = self._read_device_id()
 
         if device_id and self.session:
             try:
-                resp = self.session.get(f"{self.base_url}/device/{device_id}/settings", timeout=5)
+                resp = self.session.get(self.hub_url(f"/device/{device_id}/settings"), timeout=5)
+                self._hub_ok()
                 if resp.status_code == 200:
-                    hub_settings = resp.json()
-                    defaults.update(hub_settings)
-                    self.settings_version = hub_settings.get('updated_at') or self.settings_version
-                    self.should_refresh_settings = False
+                    self._apply_hub_settings(defaults, resp.json())
                     try:
                         print(f"[HUB] Fetched settings from hub for device {device_id}")
                     except Exception:
@@ -149,6 +723,7 @@ class LocalHubAPI:
                     except Exception:
                         pass
             except Exception as e:
+                self._hub_failed()
                 try:
                     print(f"[HUB] Error fetching settings: {e}")
                 except Exception:
@@ -157,69 +732,152 @@ class LocalHubAPI:
         return defaults
 
     def get_device_config(self):
-        try:
-            with open('device_config.json', 'r') as f:
-                return json.loads(f.read())
-        except Exception:
-            return {}
+        return self._device_config()
+
+    def _new_table(self):
+        if len(self._symbols) > SYMBOL_INTERN_MAX:
+            self._symbols = {}
+        return TickerTable(self._symbols)
+
+    def _price_parser(self, table):
+        """Parser that appends each streamed ticker straight into table."""
+        def on_item(cls, symbol, last, change_amt, change_pct):
+            if cls.startswith('stock'):
+                table.append(KIND_STOCK, symbol, last, change_amt)
+            elif cls == 'crypto':
+                table.append(KIND_CRYPTO, symbol.upper(), last, change_pct)
+            elif cls == 'forex':
+                table.append(KIND_FOREX, symbol.upper(), last, 0)
+
+        return PriceStreamParser(on_item)
+
+    def _finish_prices(self, parser, table):
+        parser.finish()
+        if parser.document is not None:
+            return parser.document if isinstance(parser.document, dict) else {}
+        return table
 
     def get_ticker_data(self):
-        """Fetch prices from local hub and map to ticker format."""
+        """
+        Fetch prices from the local hub, parsing the body as it streams in.
+        Returns a TickerTable, the decoded document if the hub answered with an
+        object (e.g. an orphaned-device notice), or {} on error.
+        """
         if not self.session:
             return {}
+        resp = None
         try:
-            resp = self.session.get(f"{self.base_url}/prices", timeout=10)
+            resp = self.session.get(self.hub_url("/prices"), timeout=10, stream=True)
+            self._hub_ok()
             resp.raise_for_status()
-            data = resp.json()
-            if isinstance(data, list):
-                tickers = []
-                for item in data:
-                    cls = item.get('asset_class')
-                    symbol = item.get('symbol')
-                    last = item.get('last_price') or item.get('last') or item.get('lastPrice')
-                    change_amt = item.get('change_amount') or item.get('change')
-                    change_pct = item.get('change_percent')
-                    tickers.append({
-                        'ticker_type': cls,
-                        'ticker': symbol,
-                        'last_price': last,
-                        'price_change': change_amt,
-                        'percent_change': change_pct
-                    })
-                return {'tickers': tickers}
-            return {}
+            table = self._new_table()
+            parser = self._price_parser(table)
+            for chunk in resp.iter_content(PARSE_CHUNK_SIZE):
+                parser.feed(chunk)
+            return self._finish_prices(parser, table)
         except Exception as e:
+            if resp is None:
+                self._hub_failed()
             try:
                 print("[HUB] Error fetching prices:", e)
             except Exception:
                 pass
             return {}
+        finally:
+            if resp is not None:
+                try:
+                    resp.close()
+                except Exception:
+                    pass
 
-    def parse_ticker_data(self, ticker_data):
-        stocks = []
-        crypto = []
-        forex = []
-        if not ticker_data:
-            return stocks, crypto, forex
-        try:
-            for item in ticker_data.get('tickers', []):
-                cls = (item.get('ticker_type') or '').lower()
-                symbol = item.get('ticker') or item.get('symbol') or ''
-                price = float(item.get('last_price') or 0)
-                change = float(item.get('price_change') or 0)
-                pct = float(item.get('percent_change') or 0)
-                if cls.startswith('stock'):
-                    stocks.append({'ticker': symbol, 'tngoLast': price, 'prcChange': change})
-                elif cls == 'crypto':
-                    crypto.append({'ticker': symbol.upper(), 'lastPrice': price, 'prcChangePct': pct})
-                elif cls == 'forex':
-                    forex.append({'ticker': symbol.upper(), 'mid_price': "{:.4f}".format(price if price else 0)})
-        except Exception as e:
+    # ---- Background prefetch (polled from the display loop) ----
+    def start_prefetch(self, include_settings=False):
+        """
+        Start fetching /prices (and optionally this device's settings) in the
+        background. Returns False if a socket pool is not available or the hub
+        URL is not plain http, in which case callers use the blocking getters.
+        """
+        if self.pool is None or not self.base_url.startswith("http://"):
+            return False
+        self.cancel_prefetch()
+        table = self._new_table()
+        parser = self._price_parser(table)
+        jobs = {'prices': _BackgroundGet(self.pool, self.hub_url("/prices"), timeout=10, sink=parser.feed)}
+        if include_settings:
+            device_id = self._read_device_id()
+            if device_id:
+                jobs['settings'] = _BackgroundGet(
+                    self.pool, self.hub_url(f"/device/{device_id}/settings"), timeout=5)
+        self._prefetch = jobs
+        self._prefetch_result = (parser, table)
+        return True
+
+    def poll_prefetch(self):
+        """Advance every in-flight prefetch request by one step; True once all have finished."""
+        if not self._prefetch:
+            return True
+        finished = True
+        for job in self._prefetch.values():
+            if not job.poll():
+                finished = False
+        if finished and self._prefetch['prices'].date:
+            self.hub_date = self._prefetch['prices'].date
+        return finished
+
+    def prefetch_pending(self):
+        if not self._prefetch:
+            return False
+        for job in self._prefetch.values():
+            if not job.done:
+                return True
+        return False
+
+    def cancel_prefetch(self):
+        if self._prefetch:
+            for job in self._prefetch.values():
+                job.close()
+        self._prefetch = None
+        self._prefetch_result = None
+
+    def take_prefetch(self):
+        """
+        Hand over a finished prefetch as (ticker_data, display_settings).
+        ticker_data is None if nothing was prefetched (an unfinished prefetch is
+        abandoned) and {} if the fetch failed, as get_ticker_data; display_settings
+        is None unless fetched successfully.
+        """
+        jobs = self._prefetch
+        if not jobs:
+            return None, None
+        if self.prefetch_pending():
+            self.cancel_prefetch()
+            return None, None
+        self._prefetch = None
+
+        parser, table = self._prefetch_result
+        self._prefetch_result = None
+        ticker_data = {}
+        job = jobs.get('prices')
+        if job.status is None:
+            self._hub_failed()
+        else:
+            self._hub_ok()
+        if job.status == 200:
             try:
-                print("[HUB] Parse error:", e)
-            except Exception:
-                pass
-        return stocks, crypto, forex
+                ticker_data = self._finish_prices(parser, table)
+            except Exception as e:
+                print("[HUB] Error parsing prefetched prices:", e)
+        elif job.status is not None:
+            print(f"[HUB] Prefetch prices failed: HTTP {job.status}")
+
+        settings = None
+        job = jobs.get('settings')
+        if job is not None and job.status == 200:
+            try:
+                settings = self._apply_hub_settings(self._default_display_settings(), json.loads(job.body))
+            except Exception as e:
+                print("[HUB] Error parsing prefetched settings:", e)
+        return ticker_data, settings
 
     # Compatibility no-ops for legacy flows
     def get_last_claim_code(self):
@@ -9,7 +9,7 @@ LOGO_PATH = "boot_logo.bmp"
 LOGO_WIDTH = 128
 LOGO_HEIGHT = 32
 MATRIX_WIDTH = 256  # set to 128 if only two panels
-MATRIX_HEIGHT = 32
+MATRIX_HEIGHT = 32  # 64 for 64-row panels (match PANEL_HEIGHT in code.py)
 
 
 def init_display_hardware():
@@ -28,7 +28,7 @@ def init_display_hardware():
         rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1,
                   board.MTX_R2, board.MTX_G2, board.MTX_B2],
         addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB,
-                   board.MTX_ADDRC, board.MTX_ADDRD],
+                   board.MTX_ADDRC, board.MTX_ADDRD] + ([board.MTX_ADDRE] if MATRIX_HEIGHT >= 64 else []),
         clock_pin=board.MTX_CLK,
         latch_pin=board.MTX_LAT,
         output_enable_pin=board.MTX_OE,
@@ -30,10 +30,16 @@ except Exception as e:
     raise RuntimeError("Required networking libraries not found: {}".format(e))
 
 try:
-    from api_client import LocalHubAPI
+    from api_client import (LocalHubAPI, KIND_STOCK, KIND_CRYPTO, KIND_FOREX, KIND_NAMES,
+                            load_price_cache, save_price_cache)
 except Exception as e:
     raise RuntimeError("api_client.py not found in this folder: {}".format(e))
 
+try:
+    from frame_scheduler import FrameScheduler, ticks_ms, ticks_diff
+except Exception as e:
+    raise RuntimeError("frame_scheduler.py not found in this folder: {}".format(e))
+
 try:
     import boot_logo
 except Exception:
@@ -58,7 +64,13 @@ except Exception:
     bitmap_font = None
     adafruit_ticks = None
 
+try:
+    import bitmaptools
+except Exception:
+    bitmaptools = None
+
 # ---- Panel configuration ----
+# Panels are chained left to right; 64-row panels (PANEL_HEIGHT = 64) also use the E address line.
 PANEL_WIDTH = 64
 PANEL_HEIGHT = 32
 NUM_PANELS = 4
@@ -74,21 +86,60 @@ BOTTOM_LINE_SCROLL_SPEED = 0.030 # seconds per pixel for dual-line bottom row
 DUAL_FRAMELOCK_ENABLED = False
 DUAL_FRAMELOCK_FPS = 60
 
+# ---- Frame scheduler ----
+FRAME_MIN_MS = 5           # shortest frame the dual-line loop will pace at
+FRAME_BUDGET_MS = None     # per-frame work before idle tasks are skipped (None = half a frame)
+MAX_CATCHUP_STEPS = 4      # steps replayed after a stall; the rest are dropped
+GC_IDLE_INTERVAL_MS = 1000 # min spacing of gc.collect() in idle frame time
+FRAME_STATS_ENABLED = True # print frame-time histograms after each cycle ('f' over serial at any time)
+
+# ---- Background prefetch ----
+PREFETCH_LEAD_SEC = 8          # start fetching the next cycle's data this long before it is due
+PREFETCH_SLICES_PER_FRAME = 4  # max socket steps per idle slot
+
 # ---- Fonts & layout ----
 SINGLE_LINE_FONT_PATH = "fonts/spleen-16x32.bdf"
 DUAL_LINE_FONT_PATH = "fonts/spleen-8x16.bdf"
-SINGLE_LINE_Y_POS = -6  # center 32px font on 32px panel
-TOP_LINE_Y_POS = 0
-BOTTOM_LINE_Y_POS = 16
+SINGLE_LINE_HEIGHT = 32  # chunk bitmap height for the single-line font
+DUAL_LINE_HEIGHT = 16    # chunk bitmap height for each dual-line row
+SINGLE_LINE_Y_POS = (DISPLAY_HEIGHT - SINGLE_LINE_HEIGHT) // 2 - 6  # center 32px font (-6 on a 32px panel)
+TOP_LINE_Y_POS = (DISPLAY_HEIGHT // 2 - DUAL_LINE_HEIGHT) // 2
+BOTTOM_LINE_Y_POS = DISPLAY_HEIGHT // 2 + TOP_LINE_Y_POS
 CHUNK_WIDTH_MULTIPLIER = 16
 MESSAGE_CHAR_SPACING = 2
 
+# Chunk sizing: chunks are DISPLAY_WIDTH times a power of two wide, capped by
+# CHUNK_WIDTH_MULTIPLIER, CHUNK_WIDTH_MAX and a share of the free heap at build time
+CHUNK_WIDTH_MAX = 4096
+CHUNK_MEM_RESERVE = 32 * 1024  # heap left for sockets, the price parser and the next fetch
+CHUNKS_ALIVE = 3               # chunk bitmaps per line: two on screen, one being drawn ahead
+
+# Glyph cache (colour-indexed glyph bitmaps reused across chunks)
+GLYPH_CACHE_MAX = 256
+# Glyphs converted while the boot probe waits on the hub: price (white) and change (green/red)
+BOOT_GLYPHS_PRICE = "$.0123456789"
+BOOT_GLYPHS_CHANGE = "+-.%0123456789↑↓"
+
+# Ticker block layout (pixels)
+BLOCK_CHAR_SPACING = 2
+BLOCK_SEGMENT_GAP = 8
+BLOCK_SPACING = 10
+
 # Palette indices
 COL_BLACK = 0
 COL_WHITE = 1
 COL_GREEN = 2
 COL_RED = 3
 
+# Corner square marking prices drawn from the on-flash cache until live data arrives
+STALE_MARKER_SIZE = 3
+
+# Colours behind the palette indices above (plus the background layer) per display mode
+PALETTE_COLORS = {
+    "dark": (0x000000, 0xFFFFFF, 0x00FF00, 0xFF0000),
+    "lite": (0xFFFFFF, 0x000000, 0x006600, 0x880000),
+}
+
 # Brightness guard for multi-panel rig
 MAX_BRIGHTNESS_PERCENT = 10
 
@@ -97,12 +148,15 @@ _matrix = None
 _rgb_core = None
 _root_group = None
 _bg_palette = None
+_text_palette = None  # shared by every chunk and message tile; recoloured in place on mode change
 _scroll_group = None
 _top_scroll_group = None
 _bottom_scroll_group = None
 _single_line_font = None
 _dual_line_font = None
 _display_mode = "dark"
+_glyph_cache = {}
+_chunk_cache = {}  # scroll line -> its _ChunkStream, whose bitmaps the next build reuses
 
 
 # ---------------- Wi-Fi & Credentials ----------------
@@ -240,7 +294,6 @@ def ensure_credentials(api, prov_key=None) -> bool:
 def _init_matrix_once():
     global _matrix, _rgb_core, _root_group, _bg_palette
     global _scroll_group, _top_scroll_group, _bottom_scroll_group
-    global _single_line_font, _dual_line_font
 
     if not displayio or not framebufferio or not rgbmatrix:
         print("[MATRIX] Display libraries not available; skipping visual output")
@@ -274,10 +327,7 @@ def _init_matrix_once():
                     board.MTX_R1, board.MTX_G1, board.MTX_B1,
                     board.MTX_R2, board.MTX_G2, board.MTX_B2,
                 ],
-                addr_pins=[
-                    board.MTX_ADDRA, board.MTX_ADDRB,
-                    board.MTX_ADDRC, board.MTX_ADDRD,
-                ],
+                addr_pins=_addr_pins(),
                 clock_pin=board.MTX_CLK,
                 latch_pin=board.MTX_LAT,
                 output_enable_pin=board.MTX_OE,
@@ -304,24 +354,9 @@ def _init_matrix_once():
 
         bg_bitmap = displayio.Bitmap(DISPLAY_WIDTH, DISPLAY_HEIGHT, 1)
         bg_palette = displayio.Palette(1)
-        bg_palette[0] = 0x000000
+        bg_palette[0] = PALETTE_COLORS[_display_mode][COL_BLACK]
         _bg_palette = bg_palette
         _root_group.append(displayio.TileGrid(bg_bitmap, pixel_shader=bg_palette))
-
-        try:
-            _single_line_font = bitmap_font.load_font(SINGLE_LINE_FONT_PATH)
-            print("[MATRIX] Loaded single-line font:", SINGLE_LINE_FONT_PATH)
-        except Exception as e:
-            print("[MATRIX] Failed to load single-line font:", e)
-            _single_line_font = None
-
-        try:
-            _dual_line_font = bitmap_font.load_font(DUAL_LINE_FONT_PATH)
-            print("[MATRIX] Loaded dual-line font:", DUAL_LINE_FONT_PATH)
-        except Exception as e:
-            print("[MATRIX] Failed to load dual-line font:", e)
-            _dual_line_font = None
-
         _root_group.append(_scroll_group)
         _matrix.root_group = _root_group
         print("[MATRIX] Initialized scrolling display {}x{} ({} panels)".format(DISPLAY_WIDTH, DISPLAY_HEIGHT, NUM_PANELS))
@@ -329,6 +364,25 @@ def _init_matrix_once():
         print("[MATRIX] Init error:", e)
 
 
+def _load_font(path, label):
+    if not displayio:
+        return None
+    try:
+        font = bitmap_font.load_font(path)
+        print("[MATRIX] Loaded {} font: {}".format(label, path))
+        return font
+    except Exception as e:
+        print("[MATRIX] Failed to load {} font: {}".format(label, e))
+        return None
+
+
+def _addr_pins():
+    pins = [board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD]
+    if PANEL_HEIGHT >= 64:
+        pins.append(board.MTX_ADDRE)
+    return pins
+
+
 def _apply_brightness(brightness_percent):
     try:
         if brightness_percent is None:
@@ -373,13 +427,28 @@ def _apply_display_mode(mode):
     if _display_mode == "lite" and NUM_PANELS > 1:
         print("[DISPLAY] Lite mode draws too much power on multi-panel rig; forcing dark mode")
         _display_mode = "dark"
+    # Tiles share these palettes, so everything on screen changes colour without a redraw
     try:
+        colors = PALETTE_COLORS[_display_mode]
         if _bg_palette is not None:
-            _bg_palette[0] = 0xFFFFFF if _display_mode == "lite" else 0x000000
+            _bg_palette[0] = colors[COL_BLACK]
+        if _text_palette is not None:
+            for idx, rgb in enumerate(colors):
+                _text_palette[idx] = rgb
     except Exception:
         pass
 
 
+def _shared_palette():
+    """The 4-colour text palette, created on first use in the current mode's colours."""
+    global _text_palette
+    if _text_palette is None:
+        _text_palette = displayio.Palette(4)
+        for idx, rgb in enumerate(PALETTE_COLORS[_display_mode]):
+            _text_palette[idx] = rgb
+    return _text_palette
+
+
 def _clamp(value, low, high):
     try:
         if value < low:
@@ -391,6 +460,12 @@ def _clamp(value, low, high):
     return value
 
 
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
 def _effective_fetch_interval(cfg):
     try:
         raw = (cfg or {}).get("update_interval")
@@ -446,26 +521,88 @@ def _measure_text(font, text):
     return width
 
 
+def _cached_glyph(font, ch, color_idx):
+    """
+    Return (bitmap, width, height, dy) for a glyph pre-coloured with color_idx,
+    converting it from the font only the first time it is used.
+    """
+    key = (id(font), ord(ch), color_idx)
+    try:
+        return _glyph_cache[key]
+    except KeyError:
+        pass
+
+    g = font.get_glyph(ord(ch))
+    if not g:
+        entry = None
+    else:
+        gw = g.width
+        gh = g.height
+        bm = displayio.Bitmap(max(1, gw), max(1, gh), 4)
+        src = g.bitmap
+        for yy in range(gh):
+            for xx in range(gw):
+                if src[xx, yy]:
+                    bm[xx, yy] = color_idx
+        entry = (bm, gw, gh, getattr(g, "dy", 0))
+
+    if len(_glyph_cache) >= GLYPH_CACHE_MAX:
+        _glyph_cache.clear()
+    _glyph_cache[key] = entry
+    return entry
+
+
+def _blit(dest, src, x, y, width, height):
+    """Copy the non-background pixels of src (width x height) into dest at (x, y), clipped."""
+    x1 = 0
+    y1 = 0
+    x2 = width
+    y2 = height
+    if x < 0:
+        x1 = -x
+        x = 0
+    if y < 0:
+        y1 = -y
+        y = 0
+    if x + (x2 - x1) > dest.width:
+        x2 = x1 + dest.width - x
+    if y + (y2 - y1) > dest.height:
+        y2 = y1 + dest.height - y
+    if x2 <= x1 or y2 <= y1:
+        return
+
+    if bitmaptools is not None:
+        try:
+            bitmaptools.blit(dest, src, x, y, x1=x1, y1=y1, x2=x2, y2=y2, skip_source_index=COL_BLACK)
+            return
+        except Exception:
+            pass
+    if hasattr(dest, "blit"):
+        try:
+            dest.blit(x, y, src, x1=x1, y1=y1, x2=x2, y2=y2, skip_index=COL_BLACK)
+            return
+        except Exception:
+            pass
+
+    for yy in range(y1, y2):
+        by = y + yy - y1
+        for xx in range(x1, x2):
+            v = src[xx, yy]
+            if v:
+                dest[x + xx - x1, by] = v
+
+
 def _draw_text(bm, font, text, x, y, color_idx):
     if not font or not text:
         return
     pen = x
     for ch in text:
-        g = font.get_glyph(ord(ch))
-        if not g:
+        entry = _cached_glyph(font, ch, color_idx)
+        if not entry:
             pen += MESSAGE_CHAR_SPACING
             continue
-        gw = g.width
-        gh = g.height
-        dy = getattr(g, "dy", 0)
-        for yy in range(gh):
-            by = y + yy + dy
-            if 0 <= by < bm.height:
-                for xx in range(gw):
-                    if g.bitmap[xx, yy]:
-                        bx = pen + xx
-                        if 0 <= bx < bm.width:
-                            bm[bx, by] = color_idx
+        gbm, gw, gh, dy = entry
+        _blit(bm, gbm, pen, y + dy, gw, gh)
         pen += gw + MESSAGE_CHAR_SPACING
 
 
@@ -495,18 +632,6 @@ def _show_message(lines, dwell_seconds=0):
     except Exception:
         pass
 
-    palette = displayio.Palette(4)
-    if _display_mode == "lite":
-        palette[COL_BLACK] = 0xFFFFFF
-        palette[COL_WHITE] = 0x000000
-        palette[COL_GREEN] = 0x006600
-        palette[COL_RED] = 0x880000
-    else:
-        palette[COL_BLACK] = 0x000000
-        palette[COL_WHITE] = 0xFFFFFF
-        palette[COL_GREEN] = 0x00FF00
-        palette[COL_RED] = 0xFF0000
-
     bm = displayio.Bitmap(DISPLAY_WIDTH, DISPLAY_HEIGHT, 4)
 
     try:
@@ -524,7 +649,7 @@ def _show_message(lines, dwell_seconds=0):
         y = start_y + idx * (line_height + 4)
         _draw_text(bm, font, text, x, y, color_idx if 0 <= color_idx < 4 else COL_WHITE)
 
-    tile = displayio.TileGrid(bm, pixel_shader=palette, x=0, y=0)
+    tile = displayio.TileGrid(bm, pixel_shader=_shared_palette(), x=0, y=0)
     _root_group.append(tile)
     try:
         _matrix.refresh()
@@ -537,186 +662,159 @@ def _show_message(lines, dwell_seconds=0):
             time.sleep(0.1)
 
 
+def _show_cached_prices(table):
+    """
+    Draw the start of the single-line cycle for prices loaded from the
+    on-flash cache, standing still, with a red corner marker. It stays up
+    while Wi-Fi and the hub come up; the first live cycle replaces it and
+    reuses its chunk bitmaps.
+    """
+    if not displayio or not _root_group or not _single_line_font:
+        return False
+    line = _TickerLine(table, range(len(KIND_NAMES)))
+    chunks, _covered, _cycle_width = _build_line_chunks(
+        line, _single_line_font, SINGLE_LINE_HEIGHT, SINGLE_LINE_Y_POS, _scroll_group, "single")
+    if not chunks:
+        return False
+    while len(_root_group) > 1:
+        _root_group.pop()
+    _root_group.append(_scroll_group)
+    chunks[0]['tile'].x = 0
+
+    marker = displayio.Bitmap(STALE_MARKER_SIZE, STALE_MARKER_SIZE, 4)
+    marker.fill(COL_RED)
+    _root_group.append(displayio.TileGrid(marker, pixel_shader=_shared_palette(),
+                                          x=DISPLAY_WIDTH - STALE_MARKER_SIZE, y=0))
+    return True
+
+
 # ---------------- Data formatting helpers ----------------
-def _combine_ticker_data(stocks, crypto, forex):
-    combined = []
-    try:
-        for it in (stocks or []):
-            ticker = it.get("ticker", "?")
-            last = float(it.get("tngoLast", 0) or 0)
-            chg = float(it.get("prcChange", 0) or 0)
-            arrow = "↑" if chg >= 0 else "↓"
-            combined.append((ticker, "${:.2f}".format(last), arrow, "{:+.2f}".format(chg), chg >= 0))
-        for it in (crypto or []):
-            ticker = (it.get("ticker") or "?").upper()
-            last = float(it.get("lastPrice", 0) or 0)
-            pct = float(it.get("prcChangePct", 0) or 0)
-            arrow = "↑" if pct >= 0 else "↓"
-            combined.append((ticker, "${:.2f}".format(last), arrow, "{:+.2f}%".format(pct), pct >= 0))
-        for it in (forex or []):
-            ticker = (it.get("ticker") or "?").upper()
-            mid = it.get("mid_price") or "0.0000"
-            combined.append((ticker, str(mid), "", "", True))
-    except Exception as e:
-        print("[DATA] Combine error:", e)
-    return combined
+def _source_kinds(sources):
+    """Map display-setting source names ('stocks', 'crypto', 'forex') to TickerTable kinds."""
+    kinds = []
+    for kind, name in enumerate(KIND_NAMES):
+        if name in (sources or []):
+            kinds.append(kind)
+    return kinds
 
 
-def _format_stock_data(stocks):
-    formatted = []
-    try:
-        for it in (stocks or []):
-            ticker = it.get("ticker", "?")
-            last = float(it.get("tngoLast", 0) or 0)
-            chg = float(it.get("prcChange", 0) or 0)
-            arrow = "↑" if chg >= 0 else "↓"
-            formatted.append((ticker, "${:.2f}".format(last), arrow, "{:+.2f}".format(chg), chg >= 0))
-    except Exception as e:
-        print("[DATA] Format stock error:", e)
-    return formatted
+def _format_block(table, i):
+    """(ticker, price, arrow, change, is_pos) strings for one row, built only while drawing."""
+    kind = table.kinds[i]
+    symbol = table.symbols[i]
+    price = table.prices[i]
+    if kind == KIND_FOREX:
+        return (symbol, "{:.4f}".format(price), "", "", True)
+    change = table.changes[i]
+    arrow = "↑" if change >= 0 else "↓"
+    if kind == KIND_CRYPTO:
+        return (symbol, "${:.2f}".format(price), arrow, "{:+.2f}%".format(change), change >= 0)
+    return (symbol, "${:.2f}".format(price), arrow, "{:+.2f}".format(change), change >= 0)
 
 
-def _format_crypto_data(crypto):
-    formatted = []
-    try:
-        for it in (crypto or []):
-            ticker = (it.get("ticker") or "?").upper()
-            last = float(it.get("lastPrice", 0) or 0)
-            pct = float(it.get("prcChangePct", 0) or 0)
-            arrow = "↑" if pct >= 0 else "↓"
-            formatted.append((ticker, "${:.2f}".format(last), arrow, "{:+.2f}%".format(pct), pct >= 0))
-    except Exception as e:
-        print("[DATA] Format crypto error:", e)
-    return formatted
+class _TickerLine:
+    """The rows of a TickerTable shown on one scroll line, in display order."""
 
+    def __init__(self, table, kinds):
+        self.table = table
+        self.rows = table.indices(kinds)
 
-def _format_forex_data(forex):
-    formatted = []
-    try:
-        for it in (forex or []):
-            ticker = (it.get("ticker") or "?").upper()
-            mid = it.get("mid_price") or "0.0000"
-            formatted.append((ticker, str(mid), "", "", True))
-    except Exception as e:
-        print("[DATA] Format forex error:", e)
-    return formatted
+    def __len__(self):
+        return len(self.rows)
 
+    def block(self, i):
+        return _format_block(self.table, self.rows[i])
 
-def _filter_ticker_data_by_source(stocks, crypto, forex, sources):
-    combined = []
-    try:
-        if 'stocks' in (sources or []):
-            combined.extend(_format_stock_data(stocks))
-        if 'crypto' in (sources or []):
-            combined.extend(_format_crypto_data(crypto))
-        if 'forex' in (sources or []):
-            combined.extend(_format_forex_data(forex))
-    except Exception as e:
-        print("[DATA] Filter error:", e)
-    return combined
+    def symbols_key(self, start, count):
+        symbols = self.table.symbols
+        rows = self.rows
+        return tuple(symbols[rows[start + k]] for k in range(count))
 
+    def snapshot(self, start, count):
+        """Copy of rows start..start+count, kept with a chunk to detect changes later."""
+        return self.table.copy_rows(self.rows, start, count)
 
-# ---------------- Scrolling builders ----------------
-def _render_single_line_bitmap_chunk(combined, font, start_index=0, max_width=1024, y_position=None, target_group=None, clear_group=False):
-    if not displayio or not _matrix or not font:
-        return None, 0, start_index
+    def matches(self, i, snapshot, k):
+        return self.table.same_row(self.rows[i], snapshot, k)
 
-    n = len(combined or [])
-    if n == 0:
-        return None, 0, start_index
+    def same_rows(self, start, snapshot):
+        for k in range(len(snapshot)):
+            if not self.table.same_row(self.rows[start + k], snapshot, k):
+                return False
+        return True
 
-    if y_position is None:
-        y_position = SINGLE_LINE_Y_POS
-    if target_group is None:
-        target_group = _scroll_group
 
-    char_spacing = 2
-    block_spacing = 10
-    text_width = 0
+# ---------------- Scrolling builders ----------------
+def _layout_block(font, block, elements=None):
+    """
+    Measure one ticker block laid out from x=0 and return (width, ascent).
+    When a list is passed as elements, (glyph_entry, x_offset) pairs are appended to it.
+    """
+    change_color = COL_GREEN if block[4] else COL_RED
+    width = 0
+    ascent = 0
+    # segments: ticker, price, arrow, change (arrow/change are skipped when empty)
+    for idx in range(4):
+        text = block[idx]
+        if idx >= 2 and not text:
+            continue
+        if idx:
+            width += BLOCK_SEGMENT_GAP
+        color_idx = COL_WHITE if idx < 2 else change_color
+        for ch in text:
+            entry = _cached_glyph(font, ch, color_idx)
+            if entry:
+                if elements is not None:
+                    elements.append((entry, width))
+                width += entry[1] + BLOCK_CHAR_SPACING
+                asc = entry[2] + entry[3]
+                if asc > ascent:
+                    ascent = asc
+    return width + BLOCK_SPACING, ascent
+
+
+def _raster_block(bm, font, block, x0, ascent, vertical_offset):
     elements = []
-    max_ascent = 0
+    _layout_block(font, block, elements)
+    for entry, xoff in elements:
+        gbm, gw, gh, dy = entry
+        _blit(bm, gbm, x0 + xoff, ascent - (gh + dy) + vertical_offset, gw, gh)
 
-    def add_text(text, color_idx):
-        nonlocal text_width, max_ascent
-        for ch in text:
-            g = font.get_glyph(ord(ch))
-            if g:
-                elements.append((g, color_idx, text_width))
-                text_width += g.width + char_spacing
-                asc = g.height + getattr(g, "dy", 0)
-                if asc > max_ascent:
-                    max_ascent = asc
-
-    i = start_index % n
-    placed_any = False
-    start_loop = True
 
-    while True:
-        ticker, price, arrow, change, is_pos = combined[i]
-        arrow_color = COL_GREEN if is_pos else COL_RED
-        change_color = arrow_color
-
-        prev_width = text_width
-        add_text(ticker, COL_WHITE)
-        text_width += 8
-        add_text(price, COL_WHITE)
-        if arrow:
-            text_width += 8
-            add_text(arrow, arrow_color)
-        if change:
-            text_width += 8
-            add_text(change, change_color)
-        text_width += block_spacing
-        placed_any = True
-
-        if text_width > max_width and prev_width > 0:
-            elements = [e for e in elements if e[2] < prev_width]
-            text_width = prev_width
-            break
-
-        i = (i + 1) % n
-        if i == start_index and not start_loop:
-            break
-        start_loop = False
-        if text_width >= max_width:
-            break
-
-    if text_width <= 0 or not placed_any:
-        return None, 0, start_index
-
-    bitmap_height = 16 if y_position in (TOP_LINE_Y_POS, BOTTOM_LINE_Y_POS) else DISPLAY_HEIGHT
-    bm = displayio.Bitmap(text_width, bitmap_height, 4)
-    palette = displayio.Palette(4)
-    if _display_mode == "lite":
-        palette[COL_BLACK] = 0xFFFFFF
-        palette[COL_WHITE] = 0x000000
-        palette[COL_GREEN] = 0x006600
-        palette[COL_RED] = 0x880000
-    else:
-        palette[COL_BLACK] = 0x000000
-        palette[COL_WHITE] = 0xFFFFFF
-        palette[COL_GREEN] = 0x00FF00
-        palette[COL_RED] = 0xFF0000
-
-    vertical_offset = 2 if bitmap_height == 16 else 6
-    for g, color_idx, xoff in elements:
-        baseline_offset = max_ascent - (g.height + getattr(g, "dy", 0)) + vertical_offset
-        for y in range(g.height):
-            by = y + baseline_offset
-            if 0 <= by < bitmap_height:
-                for x in range(g.width):
-                    if g.bitmap[x, y]:
-                        bx = xoff + x
-                        if 0 <= bx < text_width:
-                            bm[bx, by] = color_idx
-
-    tile = displayio.TileGrid(bm, pixel_shader=palette, x=DISPLAY_WIDTH, y=y_position)
-    if clear_group and target_group is not None:
-        while len(target_group) > 0:
-            target_group.pop()
-    if target_group is not None:
-        target_group.append(tile)
-    return tile, text_width, i
+def _fill_rect(bm, x, y, width, height, value):
+    if bitmaptools is not None:
+        try:
+            bitmaptools.fill_region(bm, x, y, x + width, y + height, value)
+            return
+        except Exception:
+            pass
+    for yy in range(y, y + height):
+        for xx in range(x, x + width):
+            bm[xx, yy] = value
+
+
+def _pack_blocks(widths, max_width):
+    """Split consecutive block widths into (start, count, width) chunks no wider than max_width."""
+    plan = []
+    start = 0
+    count = 0
+    width = 0
+    for i, w in enumerate(widths):
+        if count and width + w > max_width:
+            plan.append((start, count, width))
+            start = i
+            count = 0
+            width = 0
+        width += w
+        count += 1
+        if width >= max_width:
+            plan.append((start, count, width))
+            start = i + 1
+            count = 0
+            width = 0
+    if count:
+        plan.append((start, count, width))
+    return plan
 
 
 def _safe_group_remove(group, tile):
@@ -731,49 +829,336 @@ def _safe_group_remove(group, tile):
         pass
 
 
-def _build_all_chunks(combined, font, max_width, y_position=None, target_group=None):
-    n = len(combined or [])
+def _in_group(group, tile):
+    for t in group:
+        if t is tile:
+            return True
+    return False
+
+
+def _release_chunk_cache(keep=()):
+    """Free the chunk bitmaps kept for every scroll line not listed in keep."""
+    for name in list(_chunk_cache.keys()):
+        if name not in keep:
+            _chunk_cache.pop(name).close()
+
+
+def _chunk_width_budget(bitmap_height, lines=1):
+    """
+    Widest chunk to allocate for a line bitmap_height pixels tall: DISPLAY_WIDTH
+    doubled while it stays within CHUNK_WIDTH_MULTIPLIER, CHUNK_WIDTH_MAX and
+    an equal share of the free heap above CHUNK_MEM_RESERVE for each of the
+    CHUNKS_ALIVE chunks of every line. Powers of two keep the width, and with it the chunk
+    cache, stable from one fetch to the next.
+    """
+    limit = min(DISPLAY_WIDTH * CHUNK_WIDTH_MULTIPLIER, CHUNK_WIDTH_MAX)
+    try:
+        gc.collect()
+        free = gc.mem_free()
+    except Exception:
+        free = None
+    if free is not None:
+        # 4-colour bitmaps store 2 bits per pixel
+        per_chunk = max(0, free - CHUNK_MEM_RESERVE) // (CHUNKS_ALIVE * lines)
+        limit = min(limit, per_chunk * 4 // bitmap_height)
+    width = DISPLAY_WIDTH
+    while width * 2 <= limit:
+        width *= 2
+    return width
+
+
+def _build_line_chunks(combined, font, bitmap_height, y_position, target_group, cache_key, lines=1):
+    """_build_all_chunks at the memory-derived chunk width, halving it if an allocation fails."""
+    max_width = _chunk_width_budget(bitmap_height, lines)
+    while True:
+        try:
+            return _build_all_chunks(combined, font, max_width, y_position, target_group, cache_key=cache_key)
+        except MemoryError:
+            _release_chunk_cache(keep=[name for name in _chunk_cache if name != cache_key])
+            while len(target_group):
+                target_group.pop()
+            gc.collect()
+            if max_width <= DISPLAY_WIDTH:
+                print("[SCROLL] Out of memory building chunks")
+                return None, 0, 0
+            max_width //= 2
+            print("[SCROLL] Out of memory; retrying with {}px chunks".format(max_width))
+
+
+class _ChunkStream:
+    """
+    One scroll line's ticker cycle as a sequence of chunk tiles drawn on demand.
+
+    Only the layout (block widths and the chunk plan) is worked out up front.
+    stream[j] returns chunk j, finishing it first if needed, and the chunk
+    after the last one requested is drawn ahead a few blocks at a time from
+    the frame scheduler's idle slots (idle_task). At most CHUNKS_ALIVE chunk
+    bitmaps exist per line (the two on screen and the one being drawn), so
+    memory follows the panel width rather than the watchlist. A chunk that
+    scrolled off, or was kept from the previous fetch, is reused before
+    anything is allocated: as is if its tickers are unchanged, patched if its
+    block widths line up, otherwise cleared and redrawn if its bitmap fits.
+    """
+
+    def __init__(self, combined, font, max_width, y_position, group, spares=()):
+        self.combined = combined
+        self.font = font
+        self.y = y_position
+        self.group = group
+        self.height = DUAL_LINE_HEIGHT if y_position in (TOP_LINE_Y_POS, BOTTOM_LINE_Y_POS) else SINGLE_LINE_HEIGHT
+        self.vertical_offset = 2 if self.height == DUAL_LINE_HEIGHT else 6
+        widths = []
+        ascents = []
+        for i in range(len(combined)):
+            w, asc = _layout_block(font, combined.block(i))
+            widths.append(w)
+            ascents.append(asc)
+        self.plan = _pack_blocks(widths, max_width)
+        self.shapes = []
+        self.total_width = 0
+        # Every chunk bitmap gets the widest chunk's width so any spare fits any chunk;
+        # the unused tail stays background-coloured and sits under the next tile
+        self.bitmap_width = 0
+        for start, count, width in self.plan:
+            self.shapes.append((tuple(widths[start:start + count]), max(ascents[start:start + count])))
+            self.total_width += width
+            if width > self.bitmap_width:
+                self.bitmap_width = width
+        self._alive = {}  # plan index -> finished chunk
+        self._spare = list(spares)  # chunks off screen, kept for reuse
+        self._recent = []  # the last two plan indices handed out (on screen)
+        self._ahead = None
+        self._job = None
+        self.reused = 0
+        self.patched = 0
+        self.rendered = 0
+        self.peak_alive = 0
+
+    def __len__(self):
+        return len(self.plan)
+
+    def __getitem__(self, j):
+        if j in self._recent:
+            self._recent.remove(j)
+        self._recent.append(j)
+        if len(self._recent) > 2:
+            self._recent.pop(0)
+        c = self._alive.get(j)
+        if c is None:
+            if self._job is None or self._job['j'] != j:
+                self._start(j)
+            self._run(None)
+            c = self._alive[j]
+        self._ahead = (j + 1) % len(self.plan)
+        if self.group is not None and not _in_group(self.group, c['tile']):
+            c['tile'].x = DISPLAY_WIDTH
+            self.group.append(c['tile'])
+        return c
+
+    def idle_task(self):
+        """FrameScheduler idle task that draws the next chunk ahead of the scroll."""
+        def task(deadline):
+            if self._job is None:
+                j = self._ahead
+                if j is None or j in self._alive:
+                    return
+                self._start(j)
+            self._run(deadline)
+        return task
+
+    def close(self):
+        """Free every chunk bitmap held by the stream."""
+        self._abandon()
+        for c in list(self._alive.values()) + self._spare:
+            _safe_group_remove(self.group, c['tile'])
+        self._alive = {}
+        self._spare = []
+
+    def release(self):
+        """Hand the stream's chunks over as spares for the next build of the same line."""
+        self._abandon()
+        chunks = list(self._alive.values()) + self._spare
+        self._alive = {}
+        self._spare = []
+        for c in chunks:
+            _safe_group_remove(self.group, c['tile'])
+        return chunks
+
+    def report(self, name):
+        print("[SCROLL] {}: {} chunks, {} reused, {} patched, {} rendered, {} alive max".format(
+            name, len(self.plan), self.reused, self.patched, self.rendered, self.peak_alive))
+
+    def _abandon(self):
+        # A half-drawn chunk can still lend its bitmap, but not its content
+        job = self._job
+        self._job = None
+        if job is not None:
+            job['chunk']['rows'] = None
+            job['chunk']['widths'] = None
+            self._spare.append(job['chunk'])
+
+    def _start(self, j):
+        self._abandon()
+        start, count, width = self.plan[j]
+        shape = self.shapes[j]
+        combined = self.combined
+
+        # Chunks no longer on screen become spares
+        for k in list(self._alive.keys()):
+            if k not in self._recent:
+                c = self._alive.pop(k)
+                _safe_group_remove(self.group, c['tile'])
+                self._spare.append(c)
+
+        chunk = None
+        todo = None
+        clear = False  # blocks drawn over old pixels need clearing first
+        for c in self._spare:
+            if (c['widths'] == shape[0] and c['rows'] is not None
+                    and c['rows'].symbols == list(combined.symbols_key(start, count))):
+                if combined.same_rows(start, c['rows']):
+                    chunk = c
+                    todo = []
+                    self.reused += 1
+                    break
+        if chunk is None:
+            for c in self._spare:
+                if c['widths'] == shape[0] and c['ascent'] == shape[1] and c['rows'] is not None:
+                    chunk = c
+                    todo = [k for k in range(count) if not combined.matches(start + k, c['rows'], k)]
+                    clear = True
+                    self.patched += 1
+                    break
+        if chunk is None:
+            for c in self._spare:
+                bm = c['tile'].bitmap
+                if bm.width >= width:
+                    chunk = c
+                    todo = list(range(count))
+                    bm.fill(COL_BLACK)
+                    self.rendered += 1
+                    break
+        if chunk is not None:
+            self._spare.remove(chunk)
+        else:
+            # Free spares before allocating so the line never holds more than CHUNKS_ALIVE bitmaps
+            while self._spare and len(self._alive) + len(self._spare) >= CHUNKS_ALIVE:
+                self._spare.pop(0)
+            gc.collect()
+            try:
+                bm = displayio.Bitmap(self.bitmap_width, self.height, 4)
+            except MemoryError:
+                self._spare = []
+                gc.collect()
+                bm = displayio.Bitmap(self.bitmap_width, self.height, 4)
+            tile = displayio.TileGrid(bm, pixel_shader=_shared_palette(), x=DISPLAY_WIDTH, y=self.y)
+            chunk = {'tile': tile}
+            todo = list(range(count))
+            self.rendered += 1
+        while self._spare and len(self._alive) + 1 + len(self._spare) > CHUNKS_ALIVE:
+            self._spare.pop(0)
+
+        chunk['width'] = width
+        chunk['inc'] = count
+        chunk['rows'] = None
+        chunk['widths'] = None
+        chunk['ascent'] = shape[1]
+        offsets = []
+        x0 = 0
+        for w in shape[0]:
+            offsets.append(x0)
+            x0 += w
+        self._job = {'j': j, 'chunk': chunk, 'todo': todo, 'next': 0, 'offsets': offsets, 'clear': clear}
+
+    def _run(self, deadline):
+        """Draw blocks of the pending chunk until it is done or deadline passes (None: finish)."""
+        job = self._job
+        chunk = job['chunk']
+        bm = chunk['tile'].bitmap
+        start, count, _width = self.plan[job['j']]
+        widths, ascent = self.shapes[job['j']]
+        todo = job['todo']
+        while job['next'] < len(todo):
+            k = todo[job['next']]
+            x0 = job['offsets'][k]
+            if job['clear']:
+                _fill_rect(bm, x0, 0, widths[k], bm.height, COL_BLACK)
+            _raster_block(bm, self.font, self.combined.block(start + k), x0, ascent, self.vertical_offset)
+            job['next'] += 1
+            if deadline is not None and ticks_diff(deadline, ticks_ms()) <= 0:
+                return
+        chunk['rows'] = self.combined.snapshot(start, count)
+        chunk['widths'] = widths
+        self._alive[job['j']] = chunk
+        self._job = None
+        alive = len(self._alive) + len(self._spare)
+        if alive > self.peak_alive:
+            self.peak_alive = alive
+
+
+def _build_all_chunks(combined, font, max_width, y_position=None, target_group=None, cache_key=None):
+    """
+    Lay out the ticker cycle (a _TickerLine) into chunks of at most max_width
+    pixels and return (stream, tickers, total_width). Only the first chunk is
+    drawn here; the rest are drawn by the returned _ChunkStream as the line
+    scrolls. With a cache_key the previous stream of the same line lends its
+    chunk bitmaps to the new one.
+    """
+    if not displayio or not _matrix or not font:
+        return None, 0, 0
+    n = len(combined) if combined else 0
     if n == 0:
-        return [], 0, 0
-    chunks = []
-    start = 0
-    covered = 0
-    guard = 0
-    total_width = 0
-    while covered < n and guard < (n + 5):
-        tile, width, nxt = _render_single_line_bitmap_chunk(
-            combined,
-            font,
-            start_index=start,
-            max_width=max_width,
-            y_position=y_position,
-            target_group=target_group,
-            clear_group=False,
-        )
-        if not tile or width <= 0:
-            break
-        inc = (nxt - start) % n
-        if inc == 0:
-            inc = max(1, n - covered)
-        chunks.append({'tile': tile, 'width': width, 'start': start, 'next': nxt, 'inc': inc})
-        covered += inc
-        total_width += width
-        start = nxt
-        guard += 1
-    return chunks, covered, total_width
-
-
-def _scroll_single_line_until_update(combined, fetch_interval, speed, step):
+        return None, 0, 0
+    if y_position is None:
+        y_position = SINGLE_LINE_Y_POS
+    if target_group is None:
+        target_group = _scroll_group
+
+    spares = ()
+    previous = _chunk_cache.pop(cache_key, None) if cache_key else None
+    if previous is not None:
+        if previous.font is font and previous.y == y_position:
+            spares = previous.release()
+        else:
+            previous.close()
+    previous = None
+    stream = _ChunkStream(combined, font, max_width, y_position, target_group, spares)
+    spares = None
+    if cache_key:
+        _chunk_cache[cache_key] = stream
+    stream[0]
+    return stream, n, stream.total_width
+
+
+def _prefetch_idle_task(api):
+    """FrameScheduler idle task that advances the api's background fetch within the frame deadline."""
+    def task(deadline):
+        for _ in range(PREFETCH_SLICES_PER_FRAME):
+            if api.poll_prefetch() or ticks_diff(deadline, ticks_ms()) <= 0:
+                return
+    return task
+
+
+def _maybe_start_prefetch(api, started, elapsed, fetch_interval, include_settings):
+    if api is None or started or elapsed < fetch_interval - PREFETCH_LEAD_SEC:
+        return started
+    if api.start_prefetch(include_settings=include_settings):
+        print("[API] Prefetching next cycle in background")
+    return True
+
+
+def _scroll_single_line_until_update(combined, fetch_interval, speed, step, api=None, prefetch_settings=False):
     if not _single_line_font:
         return
 
-    chunk_width = min(DISPLAY_WIDTH * CHUNK_WIDTH_MULTIPLIER, 4096)
-    chunks, covered, _cycle_width = _build_all_chunks(
+    _release_chunk_cache(keep=("single",))
+    chunks, _covered, _cycle_width = _build_line_chunks(
         combined,
         _single_line_font,
-        chunk_width,
+        SINGLE_LINE_HEIGHT,
         SINGLE_LINE_Y_POS,
         _scroll_group,
+        "single",
     )
     if not chunks:
         return
@@ -884,97 +1269,75 @@ def _scroll_single_line_until_update(combined, fetch_interval, speed, step):
 
         return _pos, _tile_a, _w_a, _inc_a, _tile_b, _w_b, _inc_b, _shown, _ci_a, _ci_b
 
-    if adafruit_ticks:
-        ticks_ms = adafruit_ticks.ticks_ms
-        ticks_diff = adafruit_ticks.ticks_diff
-        last_step = ticks_ms()
-
-        while True:
-            now = ticks_ms()
-            if ticks_diff(now, last_step) >= step_ms:
-                if tile_a:
-                    pos -= step
-                    tile_a.x = pos
-                    if tile_b:
-                        tile_b.x = pos + w_a
-                last_step = now
-
-                # Call wrap handler and unpack results
-                pos, tile_a, w_a, inc_a, tile_b, w_b, inc_b, shown_count, ci_a, ci_b = _do_wrap()
-
-            if (not pending_shutdown and len(combined) and shown_count >= len(combined)
-                    and (time.monotonic() - start_seconds) >= fetch_interval):
-                pending_shutdown = True
-                allow_recycle = False
-                # Drop tile_b inline
-                if tile_b:
-                    _remove_tile(tile_b)
-                    tile_b = None
-                    w_b = 0
-                    inc_b = 0
-
-            if pending_shutdown and tile_a is None and tile_b is None:
-                if _scroll_group is not None:
-                    while len(_scroll_group):
-                        _scroll_group.pop()
-                return
+    sched = FrameScheduler(step_ms, budget_ms=FRAME_BUDGET_MS, max_catchup=MAX_CATCHUP_STEPS,
+                           gc_interval_ms=GC_IDLE_INTERVAL_MS)
+    line = sched.timeline(step_ms)
+    prefetch_started = False
+    sched.add_idle(chunks.idle_task())
+    if api is not None:
+        sched.add_idle(_prefetch_idle_task(api))
 
-            time.sleep(0.001)
-    else:
-        step_interval = step_ms / 1000.0
-        last_step = time.monotonic()
-
-        while True:
-            now = time.monotonic()
-            if (now - last_step) >= step_interval:
-                if tile_a:
-                    pos -= step
-                    tile_a.x = pos
-                    if tile_b:
-                        tile_b.x = pos + w_a
-                last_step = now
-
-                # Call wrap handler and unpack results
-                pos, tile_a, w_a, inc_a, tile_b, w_b, inc_b, shown_count, ci_a, ci_b = _do_wrap()
-
-            if (not pending_shutdown and len(combined) and shown_count >= len(combined)
-                    and (time.monotonic() - start_seconds) >= fetch_interval):
-                pending_shutdown = True
-                allow_recycle = False
-                # Drop tile_b inline
+    while True:
+        sched.wait_frame()
+        moves = sched.steps(line)
+        if moves:
+            if tile_a:
+                pos -= step * moves
+                tile_a.x = pos
                 if tile_b:
-                    _remove_tile(tile_b)
-                    tile_b = None
-                    w_b = 0
-                    inc_b = 0
-
-            if pending_shutdown and tile_a is None and tile_b is None:
-                if _scroll_group is not None:
-                    while len(_scroll_group):
-                        _scroll_group.pop()
-                return
+                    tile_b.x = pos + w_a
+
+            # Call wrap handler and unpack results
+            pos, tile_a, w_a, inc_a, tile_b, w_b, inc_b, shown_count, ci_a, ci_b = _do_wrap()
 
-            time.sleep(0.001)
+        elapsed = time.monotonic() - start_seconds
+        prefetch_started = _maybe_start_prefetch(api, prefetch_started, elapsed, fetch_interval, prefetch_settings)
+        # Keep scrolling until the next cycle's data has arrived, then drain at the chunk boundary
+        if (not pending_shutdown and len(combined) and shown_count >= len(combined)
+                and elapsed >= fetch_interval and not (api is not None and api.prefetch_pending())):
+            pending_shutdown = True
+            allow_recycle = False
+            # Drop tile_b inline
+            if tile_b:
+                _remove_tile(tile_b)
+                tile_b = None
+                w_b = 0
+                inc_b = 0
+
+        sched.end_frame()
+
+        if pending_shutdown and tile_a is None and tile_b is None:
+            if _scroll_group is not None:
+                while len(_scroll_group):
+                    _scroll_group.pop()
+            if FRAME_STATS_ENABLED:
+                sched.report()
+                chunks.report("single")
+            return
 
 
-def _scroll_dual_lines_until_update(top_combined, bottom_combined, fetch_interval, step):
+def _scroll_dual_lines_until_update(top_combined, bottom_combined, fetch_interval, step, api=None, prefetch_settings=False):
     if not _dual_line_font:
         return
 
-    chunk_width = min(DISPLAY_WIDTH * CHUNK_WIDTH_MULTIPLIER, 4096)
-    top_chunks, _, top_cycle_width = _build_all_chunks(
+    _release_chunk_cache(keep=("top", "bottom"))
+    top_chunks, _, top_cycle_width = _build_line_chunks(
         top_combined,
         _dual_line_font,
-        chunk_width,
+        DUAL_LINE_HEIGHT,
         TOP_LINE_Y_POS,
         _top_scroll_group,
+        "top",
+        lines=2,
     )
-    bottom_chunks, _, bottom_cycle_width = _build_all_chunks(
+    bottom_chunks, _, bottom_cycle_width = _build_line_chunks(
         bottom_combined,
         _dual_line_font,
-        chunk_width,
+        DUAL_LINE_HEIGHT,
         BOTTOM_LINE_Y_POS,
         _bottom_scroll_group,
+        "bottom",
+        lines=2,
     )
     if not top_chunks or not bottom_chunks:
         return
@@ -1022,7 +1385,6 @@ def _scroll_dual_lines_until_update(top_combined, bottom_combined, fetch_interva
             'allow_recycle': True,
             'blank': False,
             'interval_ms': interval_ms,
-            'interval_sec': interval_ms / 1000.0,
             'cycle_width': cycle_width if cycle_width > 0 else DISPLAY_WIDTH,
         }
 
@@ -1145,52 +1507,42 @@ def _scroll_dual_lines_until_update(top_combined, bottom_combined, fetch_interva
     handoff_threshold = max(DISPLAY_WIDTH // 2, step * 64)
     start_seconds = time.monotonic()
 
-    if adafruit_ticks:
-        ticks_ms = adafruit_ticks.ticks_ms
-        ticks_diff = adafruit_ticks.ticks_diff
-        now_ticks = ticks_ms()
-        top_line['last_step'] = now_ticks
-        bottom_line['last_step'] = now_ticks
-
-        def should_step(line):
-            now_local = ticks_ms()
-            if ticks_diff(now_local, line['last_step']) >= line['interval_ms']:
-                line['last_step'] = now_local
-                return True
-            return False
-    else:
-        now_secs = time.monotonic()
-        top_line['last_step'] = now_secs
-        bottom_line['last_step'] = now_secs
-
-        def should_step(line):
-            now_local = time.monotonic()
-            if (now_local - line['last_step']) >= line['interval_sec']:
-                line['last_step'] = now_local
-                return True
-            return False
+    # Frame on the common divisor of both cadences so each line steps on exact multiples
+    frame_ms = _gcd(top_interval_ms, bottom_interval_ms)
+    if frame_ms < FRAME_MIN_MS:
+        frame_ms = min(top_interval_ms, bottom_interval_ms)
+    sched = FrameScheduler(frame_ms, budget_ms=FRAME_BUDGET_MS,
+                           max_catchup=MAX_CATCHUP_STEPS, gc_interval_ms=GC_IDLE_INTERVAL_MS)
+    top_line['timeline'] = sched.timeline(top_interval_ms)
+    bottom_line['timeline'] = sched.timeline(bottom_interval_ms)
+    prefetch_started = False
+    sched.add_idle(top_chunks.idle_task())
+    sched.add_idle(bottom_chunks.idle_task())
+    if api is not None:
+        sched.add_idle(_prefetch_idle_task(api))
+
+    def advance(line):
+        moves = sched.steps(line['timeline'])
+        if not moves:
+            return
+        if line['tile_a']:
+            line['pos'] -= step * moves
+            line['tile_a'].x = line['pos']
+            if line['tile_b']:
+                line['tile_b'].x = line['pos'] + line['w_a']
+        handle_wrap(line)
 
     while True:
-        if should_step(top_line):
-            if top_line['tile_a']:
-                top_line['pos'] -= step
-                top_line['tile_a'].x = top_line['pos']
-                if top_line['tile_b']:
-                    top_line['tile_b'].x = top_line['pos'] + top_line['w_a']
-            handle_wrap(top_line)
-
-        if should_step(bottom_line):
-            if bottom_line['tile_a']:
-                bottom_line['pos'] -= step
-                bottom_line['tile_a'].x = bottom_line['pos']
-                if bottom_line['tile_b']:
-                    bottom_line['tile_b'].x = bottom_line['pos'] + bottom_line['w_a']
-            handle_wrap(bottom_line)
+        sched.wait_frame()
+        advance(top_line)
+        advance(bottom_line)
 
         top_ready = (top_line['total'] == 0) or (top_line['shown'] >= top_line['total'])
         bottom_ready = (bottom_line['total'] == 0) or (bottom_line['shown'] >= bottom_line['total'])
-        if (not pending_shutdown and top_ready and bottom_ready
-                and (time.monotonic() - start_seconds) >= fetch_interval):
+        elapsed = time.monotonic() - start_seconds
+        prefetch_started = _maybe_start_prefetch(api, prefetch_started, elapsed, fetch_interval, prefetch_settings)
+        if (not pending_shutdown and top_ready and bottom_ready and elapsed >= fetch_interval
+                and not (api is not None and api.prefetch_pending())):
             pending_shutdown = True
 
         if pending_shutdown:
@@ -1213,9 +1565,14 @@ def _scroll_dual_lines_until_update(top_combined, bottom_combined, fetch_interva
                 if _bottom_scroll_group is not None:
                     while len(_bottom_scroll_group):
                         _bottom_scroll_group.pop()
+                sched.end_frame()
+                if FRAME_STATS_ENABLED:
+                    sched.report()
+                    top_chunks.report("top")
+                    bottom_chunks.report("bottom")
                 return
 
-        time.sleep(0.001)
+        sched.end_frame()
 
 
 # ---------------- Orphaned handling ----------------
@@ -1261,95 +1618,216 @@ def _handle_orphaned_state(api, device_key):
         time.sleep(15)
         try:
             test_raw = api.get_ticker_data() or {}
+            # A TickerTable means prices are flowing again; only a dict can be an orphan notice
+            if not (isinstance(test_raw, dict) and test_raw.get('orphaned')):
+                print("[MAIN] Device no longer orphaned - resuming normal operation")
+                return
         except Exception as e:
             print("[MAIN] Error checking claim status:", e)
-            continue
-        if not test_raw.get('orphaned'):
-            print("[MAIN] Device no longer orphaned - resuming normal operation")
-            return
 
 
-# ---------------- Main ----------------
-def main():
-    print("=" * 50)
-    print("[MAIN] CODE VERSION: 2025-10-06-SCROLL")
-    print("=" * 50)
-    global _matrix, _rgb_core
-    if boot_logo:
-        try:
-            boot_display, boot_rgb_core = boot_logo.show_boot_logo()
-            _matrix = boot_display or _matrix
-            _rgb_core = boot_rgb_core or _rgb_core
-        except Exception as e:
-            print("[BOOT] Boot logo failed:", e)
+# ---------------- Boot ----------------
+class _BootSequence:
+    """
+    Boot as a cooperative state machine: each step() advances the current
+    phase, which returns True once it is finished. The hub probe is the first
+    /prices + settings fetch on a non-blocking socket; while it is in flight
+    the remaining local work (dual-line font, glyph cache, device key) runs
+    one slice per step between socket polls. NTP only runs when the probe did
+    not bring the hub's time back. Phase durations are printed when boot ends.
+    """
 
-    def _has_wifi_file():
-        try:
-            with open("wifi.dat", "r") as f:
-                return bool(f.read().strip())
-        except Exception:
+    PHASES = ("logo", "provision", "matrix", "cache", "wifi", "probe", "clock")
+
+    def __init__(self):
+        self.failed = False
+        self.pool = None
+        self.api = None
+        self.showing_cache = False
+        self.time_source = None
+        self.timings = []
+        self._index = 0
+        self._phase_start = None
+        self._started = ticks_ms()
+        self._local = []
+        self._probing = False
+
+    @property
+    def done(self):
+        return self.failed or self._index >= len(self.PHASES)
+
+    def step(self):
+        name = self.PHASES[self._index]
+        if self._phase_start is None:
+            self._phase_start = ticks_ms()
+        if not getattr(self, "_phase_" + name)():
+            return
+        self.timings.append((name, ticks_diff(ticks_ms(), self._phase_start)))
+        self._phase_start = None
+        self._index += 1
+        if self.done:
+            self.report()
+
+    def report(self):
+        parts = ["{}={}ms".format(name, ms) for name, ms in self.timings]
+        print("[BOOT] {} total={}ms time={}".format(
+            " ".join(parts), ticks_diff(ticks_ms(), self._started), self.time_source))
+
+    def _phase_logo(self):
+        global _matrix, _rgb_core
+        if boot_logo:
+            try:
+                boot_display, boot_rgb_core = boot_logo.show_boot_logo()
+                _matrix = boot_display or _matrix
+                _rgb_core = boot_rgb_core or _rgb_core
+            except Exception as e:
+                print("[BOOT] Boot logo failed:", e)
+        return True
+
+    def _phase_provision(self):
+        needs_provision = not (_has_wifi_file() and _has_hub_config())
+
+        if _a1_switch_closed():
+            needs_provision = True
+            print("[MODE] A1 grounded: forcing provisioning")
+
+        if needs_provision:
+            print("[MODE] Starting provisioning portal (missing Wi-Fi or hub URL)…")
+            try:
+                import wifimgr
+                wifimgr.start_provisioning()
+            except Exception as e:
+                print("[MODE] Provisioning launcher failed:", e)
+            while True:
+                time.sleep(1)
+        return True
+
+    def _phase_matrix(self):
+        global _single_line_font
+        _init_matrix_once()
+        _single_line_font = _load_font(SINGLE_LINE_FONT_PATH, "single-line")
+        return True
+
+    def _phase_cache(self):
+        # Last saved prices on screen within a second of boot instead of after Wi-Fi, NTP and the first fetch
+        cached = load_price_cache()
+        if cached:
+            print("[CACHE] Showing {} cached prices saved at {}".format(len(cached), cached.saved_at))
+            self.showing_cache = _show_cached_prices(cached)
+        return True
+
+    def _phase_wifi(self):
+        if not connect_wifi():
+            print("[MAIN] No Wi-Fi. Starting provisioning portal…")
+            try:
+                import wifimgr
+                wifimgr.start_provisioning()
+            except Exception as e:
+                print("[MAIN] Provisioning failed:", e)
+            self.failed = True
+            return True
+        self.pool = socketpool.SocketPool(wifi.radio)  # type: ignore[attr-defined]
+        return True
+
+    def _phase_probe(self):
+        if not self._probing:
+            self._probing = True
+            # Ensure device_key/device_id exists so the probe can fetch this device's settings
+            _ensure_device_key()
+            session = adafruit_requests.Session(self.pool, ssl.create_default_context())
+            self.api = LocalHubAPI(session, socket_pool=self.pool)
+            if not ensure_credentials(self.api):
+                print("[MAIN] Missing credentials/config; provision via A1 switch")
+                self.failed = True
+                return True
+            if self.api.start_prefetch(include_settings=True):
+                print("[BOOT] Probing hub in background")
+            self._local = [_boot_load_dual_font(), _boot_warm_glyphs()]
             return False
 
-    def _has_hub_config():
-        try:
-            with open("device_config.json", "r") as f:
-                cfg = json.loads(f.read() or "{}")
-                return bool(cfg.get("hub_base_url"))
-        except Exception:
+        for _ in range(PREFETCH_SLICES_PER_FRAME):
+            if self.api.poll_prefetch():
+                break
+        if self._local:
+            try:
+                next(self._local[0])
+            except StopIteration:
+                self._local.pop(0)
             return False
+        return not self.api.prefetch_pending()
 
-    needs_provision = not (_has_wifi_file() and _has_hub_config())
-
-    if _a1_switch_closed():
-        needs_provision = True
-        print("[MODE] A1 grounded: forcing provisioning")
-
-    if needs_provision:
-        print("[MODE] Starting provisioning portal (missing Wi-Fi or hub URL)…")
+    def _phase_clock(self):
         try:
-            import wifimgr
-            wifimgr.start_provisioning()
+            from time_sync import sync_time, sync_with_hub, sync_from_http_date, validate_time
         except Exception as e:
-            print("[MODE] Provisioning launcher failed:", e)
-        while True:
-            time.sleep(1)
+            print(f"[MAIN] Time sync error: {e}")
+            return True
+        # A Date header on the probe means the hub answered: ask its /time (one
+        # LAN request, round-trip compensated), or keep the Date of an older hub
+        if self.api.hub_date and sync_with_hub(self.api.session, self.api.hub_url("")):
+            self.time_source = "hub"
+        elif self.api.hub_date and sync_from_http_date(self.api.hub_date):
+            self.time_source = "hub-date"
+        else:
+            print("[MAIN] Hub time unavailable; synchronizing with NTP...")
+            if sync_time(self.pool, force_ntp=True):
+                self.time_source = "ntp"
+            else:
+                print("[MAIN] Warning: Time synchronization failed")
+        is_valid, timestamp, year = validate_time()
+        print(f"[MAIN] Time status - Valid: {is_valid}, Year: {year}")
+        return True
 
-    if not connect_wifi():
-        print("[MAIN] No Wi-Fi. Starting provisioning portal…")
-        try:
-            import wifimgr
-            wifimgr.start_provisioning()
-        except Exception as e:
-            print("[MAIN] Provisioning failed:", e)
-        return
 
-    pool = socketpool.SocketPool(wifi.radio)  # type: ignore[attr-defined]
-    session = adafruit_requests.Session(pool, ssl.create_default_context())
+def _has_wifi_file():
+    try:
+        with open("wifi.dat", "r") as f:
+            return bool(f.read().strip())
+    except Exception:
+        return False
+
 
-    # Time sync before API calls
+def _has_hub_config():
     try:
-        from time_sync import sync_time, validate_time
-        print("[MAIN] Synchronizing system time...")
-        is_valid, timestamp, year = validate_time()
-        print(f"[MAIN] Current time status - Valid: {is_valid}, Year: {year}")
-        print("[MAIN] Forcing time synchronization...")
-        if sync_time(pool, force_ntp=True):
-            is_valid, timestamp, year = validate_time()
-            print(f"[MAIN] After sync - Valid: {is_valid}, Year: {year}")
-        else:
-            print("[MAIN] Warning: Time synchronization failed, HMAC may fail")
-    except Exception as e:
-        print(f"[MAIN] Time sync error: {e}")
+        with open("device_config.json", "r") as f:
+            cfg = json.loads(f.read() or "{}")
+            return bool(cfg.get("hub_base_url"))
+    except Exception:
+        return False
+
+
+def _boot_load_dual_font():
+    global _dual_line_font
+    _dual_line_font = _load_font(DUAL_LINE_FONT_PATH, "dual-line")
+    yield
 
-    # Ensure device_key/device_id exists
-    cfg = _ensure_device_key()
 
-    api = LocalHubAPI(session)
-    if not ensure_credentials(api):
-        print("[MAIN] Missing credentials/config; provision via A1 switch")
+def _boot_warm_glyphs():
+    """Convert the price and change glyphs of the single-line font a few per step."""
+    font = _single_line_font
+    if not font:
         return
+    for chars, colors in ((BOOT_GLYPHS_PRICE, (COL_WHITE,)), (BOOT_GLYPHS_CHANGE, (COL_GREEN, COL_RED))):
+        for color_idx in colors:
+            for ch in chars:
+                _cached_glyph(font, ch, color_idx)
+            yield
+
+
+# ---------------- Main ----------------
+def main():
+    print("=" * 50)
+    print("[MAIN] CODE VERSION: 2025-10-06-SCROLL")
+    print("=" * 50)
 
-    _init_matrix_once()
+    boot = _BootSequence()
+    while not boot.done:
+        boot.step()
+    if boot.failed:
+        return
+    api = boot.api
+    showing_cache = boot.showing_cache
+    boot = None
 
     hb_interval = 120  # seconds between heartbeats
     last_hb = 0
@@ -1360,6 +1838,13 @@ def main():
 
     while True:
         now = time.monotonic()
+        # Data fetched in the background during the previous scroll cycle (None if not prefetched)
+        prefetched_raw, prefetched_settings = api.take_prefetch()
+        if prefetched_settings is not None:
+            cached_display_settings = prefetched_settings
+            cached_device_config = api.get_device_config() or {}
+            last_settings_fetch = now
+
         if now - last_hb > hb_interval:
             try:
                 print("[API] Sending heartbeat...")
@@ -1381,7 +1866,11 @@ def main():
                     pass
             last_hb = now
 
-        _cleanup_scroll_groups()
+        # Keep the cached prices up until the first live fetch is ready to replace them
+        if showing_cache:
+            showing_cache = False
+        else:
+            _cleanup_scroll_groups()
         gc.collect()
 
         if (now - last_settings_fetch > settings_cache_interval) or cached_display_settings is None:
@@ -1403,50 +1892,64 @@ def main():
         eff_speed = _effective_scroll_speed(display_settings)
 
         try:
-            print(f"[API] Fetching prices (interval {eff_interval}s)...")
+            if prefetched_raw is None:
+                print(f"[API] Fetching prices (interval {eff_interval}s)...")
+            else:
+                print(f"[API] Using prefetched prices (interval {eff_interval}s)")
         except Exception:
             pass
 
-        raw = api.get_ticker_data() or {}
-        if raw.get('orphaned'):
-            device_key = raw.get('device_key') or api.device_key
-            _handle_orphaned_state(api, device_key)
-            continue
+        if prefetched_raw is not None:
+            raw = prefetched_raw
+        else:
+            raw = api.get_ticker_data()
+        if isinstance(raw, dict):
+            if raw.get('orphaned'):
+                device_key = raw.get('device_key') or api.device_key
+                _handle_orphaned_state(api, device_key)
+                continue
+            raw = None
+        table = raw
 
-        stocks, crypto, forex = api.parse_ticker_data(raw)
-        try:
-            print(f"[API] Tickers -> stocks:{len(stocks)} crypto:{len(crypto)} forex:{len(forex)}")
-        except Exception:
-            pass
-        if not stocks and not crypto and not forex:
+        if not table:
             _show_message([
                 ("NO DATA", COL_WHITE),
                 ("CHECK APP", COL_WHITE),
             ], dwell_seconds=10)
             continue
+        try:
+            print(f"[API] Tickers -> stocks:{table.count(KIND_STOCK)} crypto:{table.count(KIND_CRYPTO)} forex:{table.count(KIND_FOREX)}")
+        except Exception:
+            pass
+        save_price_cache(table)
+
+        # Fetch settings alongside the next prices if the cache will be stale by then
+        prefetch_settings = (time.monotonic() - last_settings_fetch + eff_interval) > settings_cache_interval
 
         scroll_mode = (display_settings.get('scroll_mode') or 'single').lower()
         if scroll_mode == 'dual':
             top_sources = display_settings.get('top_sources') or ['stocks']
             bottom_sources = display_settings.get('bottom_sources') or ['crypto', 'forex']
-            top_combined = _filter_ticker_data_by_source(stocks, crypto, forex, top_sources)
-            bottom_combined = _filter_ticker_data_by_source(stocks, crypto, forex, bottom_sources)
+            top_combined = _TickerLine(table, _source_kinds(top_sources))
+            bottom_combined = _TickerLine(table, _source_kinds(bottom_sources))
             if not top_combined or not bottom_combined:
                 _show_message([
                     ("INSUFFICIENT DATA", COL_RED),
                     ("FOR DUAL MODE", COL_WHITE),
                 ], dwell_seconds=8)
                 continue
-            _scroll_dual_lines_until_update(top_combined, bottom_combined, eff_interval, SCROLL_STEP)
+            _scroll_dual_lines_until_update(top_combined, bottom_combined, eff_interval, SCROLL_STEP,
+                                            api=api, prefetch_settings=prefetch_settings)
         else:
-            combined = _combine_ticker_data(stocks, crypto, forex)
+            combined = _TickerLine(table, range(len(KIND_NAMES)))
             if not combined:
                 _show_message([
                     ("NO DATA", COL_WHITE),
                     ("CHECK SOURCES", COL_WHITE),
                 ], dwell_seconds=8)
                 continue
-            _scroll_single_line_until_update(combined, fetch_interval=eff_interval, speed=eff_speed, step=SCROLL_STEP)
+            _scroll_single_line_until_update(combined, fetch_interval=eff_interval, speed=eff_speed, step=SCROLL_STEP,
+                                             api=api, prefetch_settings=prefetch_settings)
 
 
 if __name__ == "__main__":
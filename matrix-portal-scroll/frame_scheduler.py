@@ -0,0 +1,197 @@
+"""
+Frame scheduler for the scroll loops (scroll build).
+
+Fixed-timestep animation: each timeline accumulates elapsed time and is
+advanced in whole steps, so a stall is caught up with a few extra pixels
+instead of stretching every later step. The time left in each frame is
+handed to idle tasks (gc.collect, background work) and the rest is slept.
+Frame intervals and per-frame work time are kept as histograms that can be
+printed over serial.
+"""
+
+import gc
+import sys
+import time
+
+try:
+    import adafruit_ticks
+except Exception:
+    adafruit_ticks = None
+
+try:
+    import supervisor
+except Exception:
+    supervisor = None
+
+if adafruit_ticks:
+    ticks_ms = adafruit_ticks.ticks_ms
+    ticks_diff = adafruit_ticks.ticks_diff
+else:
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+# Histogram bucket upper bounds (ms); the last bucket collects everything above
+HIST_EDGES_MS = (2, 5, 10, 15, 20, 30, 50, 100)
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(HIST_EDGES_MS) + 1)
+        self.max_ms = 0
+        self.total_ms = 0
+        self.samples = 0
+
+    def add(self, ms):
+        idx = 0
+        for edge in HIST_EDGES_MS:
+            if ms < edge:
+                break
+            idx += 1
+        self.counts[idx] += 1
+        self.samples += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def format(self):
+        parts = []
+        for i, count in enumerate(self.counts):
+            if i < len(HIST_EDGES_MS):
+                parts.append("<{}:{}".format(HIST_EDGES_MS[i], count))
+            else:
+                parts.append(">={}:{}".format(HIST_EDGES_MS[-1], count))
+        avg = (self.total_ms / self.samples) if self.samples else 0
+        return "{} avg={:.1f} max={}".format(" ".join(parts), avg, self.max_ms)
+
+
+class FrameScheduler:
+    """
+    Paces a scroll loop at frame_ms and converts elapsed time into fixed steps.
+
+    Typical loop:
+        sched = FrameScheduler(frame_ms)
+        line = sched.timeline(step_ms)
+        while True:
+            sched.wait_frame()
+            n = sched.steps(line)
+            ... move n steps ...
+            sched.end_frame()
+    """
+
+    def __init__(self, frame_ms, budget_ms=None, max_catchup=4, gc_interval_ms=1000, gc_min_slack_ms=4):
+        self.frame_ms = max(1, int(frame_ms))
+        # Work allowed per frame before idle tasks are skipped
+        self.budget_ms = int(budget_ms) if budget_ms else max(1, self.frame_ms // 2)
+        self.max_catchup = max(1, int(max_catchup))
+        self.gc_interval_ms = gc_interval_ms
+        self.gc_min_slack_ms = gc_min_slack_ms
+        self._step_ms = []
+        self._acc = []
+        self._idle = []
+        now = ticks_ms()
+        self._frame_start = now
+        self._last_frame = now
+        self._last_gc = now
+        self.intervals = _Histogram()
+        self.work = _Histogram()
+        self.gc_times = _Histogram()
+        self.frames = 0
+        self.overruns = 0
+        self.dropped_steps = 0
+
+    def timeline(self, step_ms):
+        """Register an animation advanced every step_ms; returns its handle."""
+        self._step_ms.append(max(1, int(step_ms)))
+        self._acc.append(0)
+        return len(self._step_ms) - 1
+
+    def add_idle(self, task):
+        """
+        Register task(deadline_ticks) to run in spare frame time. It should do
+        a small slice of work and return promptly; True means it wants more time.
+        """
+        self._idle.append(task)
+
+    def remove_idle(self, task):
+        try:
+            self._idle.remove(task)
+        except ValueError:
+            pass
+
+    def _run_idle(self, deadline):
+        for task in self._idle:
+            if ticks_diff(deadline, ticks_ms()) <= 0:
+                return
+            try:
+                task(deadline)
+            except Exception as e:
+                print("[FRAME] Idle task error:", e)
+
+        now = ticks_ms()
+        slack = ticks_diff(deadline, now)
+        if slack >= self.gc_min_slack_ms and ticks_diff(now, self._last_gc) >= self.gc_interval_ms:
+            gc.collect()
+            done = ticks_ms()
+            self.gc_times.add(ticks_diff(done, now))
+            self._last_gc = done
+
+    def _poll_serial(self):
+        if supervisor is None:
+            return
+        try:
+            if not supervisor.runtime.serial_bytes_available:
+                return
+            ch = sys.stdin.read(1)
+        except Exception:
+            return
+        if ch in ("f", "F"):
+            self.report()
+
+    def wait_frame(self):
+        """Use the rest of the current frame for idle work, then sleep until the next one."""
+        deadline = self._frame_start + self.frame_ms
+        if ticks_diff(ticks_ms(), self._frame_start) < self.budget_ms:
+            self._run_idle(deadline)
+        self._poll_serial()
+        remaining = ticks_diff(deadline, ticks_ms())
+        if remaining > 0:
+            time.sleep(remaining / 1000)
+
+        now = ticks_ms()
+        elapsed = ticks_diff(now, self._last_frame)
+        self._last_frame = now
+        self._frame_start = now
+        self.frames += 1
+        self.intervals.add(elapsed)
+        for i in range(len(self._acc)):
+            self._acc[i] += elapsed
+
+    def steps(self, line):
+        """Whole steps due for a timeline this frame (capped at max_catchup)."""
+        step_ms = self._step_ms[line]
+        acc = self._acc[line]
+        n = acc // step_ms
+        if n > self.max_catchup:
+            self.dropped_steps += n - self.max_catchup
+            n = self.max_catchup
+            acc = 0
+        else:
+            acc -= n * step_ms
+        self._acc[line] = acc
+        return n
+
+    def end_frame(self):
+        used = ticks_diff(ticks_ms(), self._frame_start)
+        self.work.add(used)
+        if used > self.frame_ms:
+            self.overruns += 1
+
+    def report(self, tag="[FRAME]"):
+        print("{} frames={} frame_ms={} budget_ms={} overruns={} dropped_steps={}".format(
+            tag, self.frames, self.frame_ms, self.budget_ms, self.overruns, self.dropped_steps))
+        print("{} interval ms {}".format(tag, self.intervals.format()))
+        print("{} work ms {}".format(tag, self.work.format()))
+        print("{} gc ms {} (n={})".format(tag, self.gc_times.format(), self.gc_times.samples))
@@ -1,6 +1,7 @@
 """
 Time Synchronization Module for CircuitPython Matrix Portal S3
-Handles NTP synchronization and proper time management for HMAC authentication
+Sets the RTC from the local hub's /time (one LAN request, round-trip
+compensated), falling back to NTP and HTTP Date headers
 """
 
 import time
@@ -17,6 +18,27 @@ except ImportError:
     print("[TIME] Warning: adafruit_ntp library not found")
     NTP_AVAILABLE = False
 
+HUB_TIME_PATH = "/time"
+HUB_TIME_TIMEOUT = 3  # seconds; the hub is on the LAN
+UNIX_2000 = 946684800  # Unix time of 2000-01-01, the epoch of some CircuitPython ports
+
+
+def _epoch_offset():
+    """Seconds to subtract from Unix time to get this port's time.time() epoch"""
+    try:
+        return UNIX_2000 if time.localtime(0)[0] == 2000 else 0
+    except Exception:
+        return 0
+
+
+def _hub_time(resp):
+    """Unix time from a hub response: the X-Hub-Time header, else the /time body"""
+    headers = getattr(resp, "headers", None) or {}
+    value = headers.get("x-hub-time") or headers.get("X-Hub-Time")
+    if value:
+        return float(value)
+    return float(resp.json()["epoch"])
+
 class TimeSync:
     """Handles time synchronization for CircuitPython devices"""
     
@@ -32,6 +54,11 @@ class TimeSync:
             "time.nist.gov"
         ]
         self._is_synced = False
+        self.source = None
+        self.last_rtt = None
+        # Unix time and monotonic clock at the last sync, to extrapolate from if the RTC reads wrong
+        self._synced_unix = None
+        self._synced_mono = None
         
     def _log(self, message):
         """Debug logging"""
@@ -74,8 +101,55 @@ class TimeSync:
             
         except Exception as e:
             self._log(f"Error getting timestamp: {e}")
-            # Fallback to a reasonable current time (approximate)
-            return 1704067200  # January 1, 2024 as emergency fallback
+            # Extrapolate from the last sync; None if there never was one
+            if self._synced_mono is None:
+                return None
+            return int(self._synced_unix + time.monotonic() - self._synced_mono)
+
+    def set_unix_time(self, unix_time, source):
+        """Set the RTC to unix_time (rounded to the second) and record it as a sync"""
+        try:
+            self.rtc_obj.datetime = time.localtime(int(unix_time + 0.5) - _epoch_offset())
+        except Exception as e:
+            self._log(f"Setting RTC failed: {e}")
+            return False
+        self._synced_unix = unix_time
+        self._synced_mono = time.monotonic()
+        self.last_sync_time = self._synced_mono
+        self._is_synced = True
+        self.source = source
+        return self.check_rtc_validity()
+
+    def sync_with_hub(self, session, base_url):
+        """
+        Synchronize with the local hub's /time. The hub stamps the time when it
+        answers, so half the measured round trip is added to it.
+        """
+        if not session or not base_url:
+            return False
+        resp = None
+        try:
+            start = time.monotonic()
+            resp = session.get(base_url.rstrip("/") + HUB_TIME_PATH, timeout=HUB_TIME_TIMEOUT)
+            rtt = time.monotonic() - start
+            if resp.status_code != 200:
+                self._log(f"Hub time failed: HTTP {resp.status_code}")
+                return False
+            hub_time = _hub_time(resp)
+        except Exception as e:
+            self._log(f"Hub time failed: {e}")
+            return False
+        finally:
+            if resp is not None:
+                try:
+                    resp.close()
+                except Exception:
+                    pass
+        self.last_rtt = rtt
+        if not self.set_unix_time(hub_time + rtt / 2, "hub"):
+            return False
+        self._log(f"RTC set from hub time {hub_time:.3f} (rtt {rtt * 1000:.0f} ms)")
+        return True
     
     def sync_with_ntp(self, force=False):
         """Synchronize time using NTP"""
@@ -117,6 +191,7 @@ class TimeSync:
                 # Update sync tracking
                 self.last_sync_time = current_mono
                 self._is_synced = True
+                self.source = "ntp"
                 
                 # Verify the sync worked
                 if self.check_rtc_validity():
@@ -179,6 +254,7 @@ class TimeSync:
             # Mark as synced
             self._is_synced = True
             self.last_sync_time = time.monotonic()
+            self.source = "http-date"
             
             return self.check_rtc_validity()
             
@@ -186,8 +262,8 @@ class TimeSync:
             self._log(f"HTTP date sync failed: {e}")
             return False
     
-    def ensure_time_sync(self, http_date_header=None):
-        """Ensure time is synchronized, trying multiple methods"""
+    def ensure_time_sync(self, http_date_header=None, session=None, base_url=None):
+        """Ensure time is synchronized: the hub first, then NTP, then an HTTP Date header"""
         self._log("Ensuring time synchronization...")
         
         # First, check if RTC already has valid time
@@ -197,7 +273,10 @@ class TimeSync:
                 self._log("RTC already has valid, recent time")
                 return True
         
-        # Try NTP sync first
+        if self.sync_with_hub(session, base_url):
+            return True
+
+        # Fall back to public NTP servers
         if self.sync_with_ntp():
             return True
         
@@ -214,6 +293,8 @@ class TimeSync:
         """Get current sync status information"""
         return {
             'is_synced': self._is_synced,
+            'source': self.source,
+            'last_rtt': self.last_rtt,
             'last_sync_time': self.last_sync_time,
             'rtc_valid': self.check_rtc_validity(),
             'current_timestamp': self.get_unix_timestamp(),
@@ -224,16 +305,22 @@ class TimeSync:
 time_sync = TimeSync(debug=True)
 
 # Module-level convenience functions for backward compatibility
-def sync_time(pool=None, force_ntp=False):
-    """Sync time using NTP (module-level convenience function)"""
+def sync_time(pool=None, force_ntp=False, session=None, base_url=None):
+    """Sync time from the hub when a session and hub URL are given, else NTP (module-level convenience function)"""
+    if time_sync.sync_with_hub(session, base_url):
+        return True
     return time_sync.sync_with_ntp(force=force_ntp)
 
+def sync_with_hub(session, base_url):
+    """Sync time from the local hub's /time"""
+    return time_sync.sync_with_hub(session, base_url)
+
 def validate_time():
     """Validate current time and return status"""
     timestamp = time_sync.get_unix_timestamp()
     is_valid = time_sync.check_rtc_validity()
     try:
-        year = time.localtime(timestamp)[0] if timestamp > 946684800 else 2000
+        year = time.localtime(timestamp - _epoch_offset())[0] if timestamp and timestamp > UNIX_2000 else 2000
     except:
         year = 2000
     return is_valid, timestamp, year
@@ -0,0 +1,170 @@
+"""
+Host memory benchmark for one price-fetch cycle of the scroll build.
+
+Feeds a synthetic /prices body through two pipelines under tracemalloc:
+
+  dicts    the previous path: resp.json() into a list of dicts, one
+           display-ready tuple of strings per ticker, then one combined list
+  table    LocalHubAPI.get_ticker_data() streaming into a TickerTable and
+           the _TickerLine the renderer reads from
+
+and reports per cycle the peak heap growth, the bytes and blocks still held
+by the result, and (second cycle) what symbol interning saves when the next
+fetch carries the same watchlist. CPython object sizes are larger than
+CircuitPython's, so compare the ratios rather than the absolute numbers.
+
+Usage:
+    python tools/bench_memory.py [--tickers 100] [--chunk 512]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import host_displayio  # noqa: E402
+
+
+def make_body(count, seed=1):
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        cls = ("stocks", "crypto", "forex")[i % 3]
+        sym = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(2, 5)))
+        if cls == "crypto":
+            sym = sym.lower() + "usd"
+        elif cls == "forex":
+            sym = sym[:3] + "/USD"
+        items.append({
+            "asset_class": cls,
+            "symbol": sym,
+            "last_price": round(rng.uniform(1, 900), 4),
+            "change_amount": round(rng.uniform(-25, 25), 2),
+            "change_percent": round(rng.uniform(-5, 5), 2),
+            "updated_at": "2025-01-01T00:00:00Z",
+        })
+    return json.dumps(items).encode()
+
+
+class _Response:
+    def __init__(self, body):
+        self._body = body
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self._body.decode())
+
+    def iter_content(self, chunk_size):
+        for k in range(0, len(self._body), chunk_size):
+            yield self._body[k:k + chunk_size]
+
+    def close(self):
+        pass
+
+
+class _Session:
+    def __init__(self, body):
+        self.body = body
+
+    def get(self, _url, **_kwargs):
+        return _Response(self.body)
+
+
+def dicts_cycle(session):
+    """The dict-based fetch/parse/combine path the firmware used before the TickerTable."""
+    data = session.get("/prices").json()
+    by_class = {"stocks": [], "crypto": [], "forex": []}
+    for item in data:
+        cls = (item.get("asset_class") or "").lower()
+        by_class.setdefault(cls, []).append(item)
+    stocks, crypto, forex = [], [], []
+    for s in by_class["stocks"]:
+        last = s.get("last_price") or 0
+        chg = s.get("change_amount") or 0
+        stocks.append((s["symbol"], "${:.2f}".format(last), "↑" if chg >= 0 else "↓",
+                       "{:+.2f}".format(chg), chg >= 0))
+    for c in by_class["crypto"]:
+        last = c.get("last_price") or 0
+        pct = c.get("change_percent") or 0
+        crypto.append((c["symbol"].upper(), "${:.2f}".format(last), "↑" if pct >= 0 else "↓",
+                       "{:+.2f}%".format(pct), pct >= 0))
+    for f in by_class["forex"]:
+        forex.append((f["symbol"].upper(), "{:.4f}".format(f.get("last_price") or 0), "", "", True))
+    data = by_class = None
+    combined = []
+    combined.extend(stocks)
+    combined.extend(crypto)
+    combined.extend(forex)
+    return combined
+
+
+def table_cycle(code, api):
+    table = api.get_ticker_data()
+    return code._TickerLine(table, range(len(code.KIND_NAMES)))
+
+
+def measure(fn):
+    """(result, peak growth, retained bytes, retained blocks) for one call of fn."""
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    base, _ = tracemalloc.get_traced_memory()
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    diff = tracemalloc.take_snapshot().compare_to(before, "filename")
+    blocks = sum(max(0, stat.count_diff) for stat in diff)
+    return result, peak - base, current - base, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--chunk", type=int, default=None, help="stream parse chunk size (default PARSE_CHUNK_SIZE)")
+    args = parser.parse_args()
+
+    code = host_displayio.load_firmware(os.path.join(HERE, "..", "code.py"))
+    api_client = sys.modules["api_client"]
+    if args.chunk:
+        api_client.PARSE_CHUNK_SIZE = args.chunk
+    body = make_body(args.tickers)
+    session = _Session(body)
+    api = api_client.LocalHubAPI(session, base_url="http://bench")
+
+    print("tickers={} body={} bytes parse_chunk={}".format(args.tickers, len(body), api_client.PARSE_CHUNK_SIZE))
+
+    tracemalloc.start()
+    rows = []
+    kept = []
+    for cycle in (1, 2):
+        for name, fn in (("dicts", lambda: dicts_cycle(session)), ("table", lambda: table_cycle(code, api))):
+            result, peak, retained, blocks = measure(fn)
+            kept.append(result)
+            rows.append((cycle, name, peak, retained, blocks, len(result)))
+    tracemalloc.stop()
+
+    for cycle, name, peak, retained, blocks, n in rows:
+        print("cycle {} {:<6} peak={:8d} B  retained={:7d} B  blocks={:5d}  rows={}".format(
+            cycle, name, peak, retained, blocks, n))
+    for cycle in (1, 2):
+        d = [r for r in rows if r[0] == cycle and r[1] == "dicts"][0]
+        t = [r for r in rows if r[0] == cycle and r[1] == "table"][0]
+        print("cycle {} saved: peak {:.1f}x  retained {:.1f}x  blocks {} -> {}".format(
+            cycle, d[2] / max(1, t[2]), d[3] / max(1, t[3]), d[4], t[4]))
+
+    # The renderer must see the same text either way
+    line = kept[-1]
+    same = [line.block(i) for i in range(len(line))] == kept[-2]
+    print("identical blocks={}".format(same))
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
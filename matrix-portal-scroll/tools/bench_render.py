@@ -0,0 +1,208 @@
+"""
+Host benchmark for the scroll build's chunk renderer.
+
+Runs the _ChunkStream from ../code.py under desktop CPython with the
+stubbed displayio in host_displayio.py and compares three strategies:
+
+  legacy   per-pixel copy straight from font glyphs (the pre-cache renderer)
+  cached   glyph cache, per-pixel fallback in _blit (no bitmaptools)
+  blit     glyph cache + bitmaptools.blit bulk copies
+
+All three must produce identical chunks. For each it reports the time to
+the first chunk (what the panel waits for after a fetch), the time to draw
+the whole cycle and the most chunk bitmaps alive at once. A second pass
+rebuilds a short watchlist (one that fits in CHUNKS_ALIVE chunks) after
+changing a fraction of the prices, comparing reuse of the previous
+stream's chunks (as is / patched in place) against a cold build.
+
+Usage:
+    python tools/bench_render.py [--tickers 100] [--repeat 5] [--changed 0.1] [--font fonts/spleen-16x32.bdf]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+import host_displayio  # noqa: E402
+from api_client import TickerTable  # noqa: E402
+
+
+def make_tickers(code, count, seed=1):
+    """A _TickerLine over a synthetic TickerTable of stocks, crypto and forex rows."""
+    rng = random.Random(seed)
+    table = TickerTable()
+    for i in range(count):
+        sym = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(2, 5)))
+        last = rng.uniform(1, 900)
+        chg = rng.uniform(-25, 25)
+        kind = i % 3
+        if kind == code.KIND_STOCK:
+            table.append(kind, sym, last, chg)
+        elif kind == code.KIND_CRYPTO:
+            table.append(kind, sym + "USD", last, chg / 10)
+        else:
+            table.append(kind, sym[:3] + "/USD", last / 500, 0)
+    return code._TickerLine(table, range(len(code.KIND_NAMES)))
+
+
+class _LegacyGlyph:
+    """Font glyph plus the colour it is drawn in (no pre-converted bitmap)."""
+
+    def __init__(self, glyph, color_idx):
+        self.glyph = glyph
+        self.color_idx = color_idx
+
+
+def _legacy_cached_glyph(font, ch, color_idx):
+    g = font.get_glyph(ord(ch))
+    if not g:
+        return None
+    return (_LegacyGlyph(g, color_idx), g.width, g.height, getattr(g, "dy", 0))
+
+
+def _legacy_blit(dest, src, x, y, width, height):
+    # Same nested loop the renderer used before the glyph cache
+    g = src.glyph
+    color_idx = src.color_idx
+    for yy in range(height):
+        by = y + yy
+        if 0 <= by < dest.height:
+            for xx in range(width):
+                if g.bitmap[xx, yy]:
+                    bx = x + xx
+                    if 0 <= bx < dest.width:
+                        dest[bx, by] = color_idx
+
+
+def mutate(code, combined, fraction, seed=2):
+    """Next fetch: same tickers, a fraction of them with a new price."""
+    rng = random.Random(seed)
+    old = combined.table
+    table = TickerTable()
+    for i in range(len(old)):
+        table.append(old.kinds[i], old.symbols[i], old.prices[i], old.changes[i])
+    for i in rng.sample(range(len(table)), int(len(table) * fraction)):
+        # nudge the last displayed digit so most blocks keep their width
+        table.prices[i] += 0.01 if table.kinds[i] != code.KIND_FOREX else 0.0001
+    return code._TickerLine(table, range(len(code.KIND_NAMES)))
+
+
+def build(code, combined, font, max_width, group=None, cache_key=None):
+    """
+    Draw the cycle chunk by chunk, as the scroll loop consumes it. Returns
+    (rows of each chunk cropped to its width, seconds to the first chunk, stream).
+    """
+    if group is None:
+        group = code.displayio.Group()
+    t0 = time.perf_counter()
+    stream, _n, _total = code._build_all_chunks(
+        combined, font, max_width, target_group=group, cache_key=cache_key)
+    first = time.perf_counter() - t0
+    out = []
+    for j in range(len(stream)):
+        c = stream[j]
+        w = c['width']
+        out.append([row[:w] for row in c['tile'].bitmap.rows()])
+        # draw the next chunk ahead the way the idle slots would
+        stream.idle_task()(None)
+    return out, first, stream
+
+
+def run_rebuild(code, combined, changed, font, max_width, repeat):
+    """Time cold vs cache-assisted rebuilds of the cycle after some prices changed."""
+    full = []
+    incremental = []
+    result = None
+    for _ in range(repeat):
+        code._release_chunk_cache()
+        t0 = time.perf_counter()
+        build(code, changed, font, max_width)
+        full.append(time.perf_counter() - t0)
+
+        group = code.displayio.Group()
+        build(code, combined, font, max_width, group, cache_key="bench")
+        while len(group):
+            group.pop()
+        t0 = time.perf_counter()
+        result, _first, _stream = build(code, changed, font, max_width, group, cache_key="bench")
+        incremental.append(time.perf_counter() - t0)
+    code._release_chunk_cache()
+    return full, incremental, result
+
+
+def run_mode(code, mode, combined, font, max_width, repeat):
+    original = (code._cached_glyph, code._blit, code.bitmaptools)
+    try:
+        if mode == "legacy":
+            code._cached_glyph = _legacy_cached_glyph
+            code._blit = _legacy_blit
+        elif mode == "cached":
+            code.bitmaptools = None
+        times = []
+        firsts = []
+        result = None
+        peak = 0
+        for _ in range(repeat):
+            code._glyph_cache.clear()
+            t0 = time.perf_counter()
+            result, first, stream = build(code, combined, font, max_width)
+            times.append(time.perf_counter() - t0)
+            firsts.append(first)
+            peak = max(peak, stream.peak_alive)
+        return times, firsts, peak, result
+    finally:
+        code._cached_glyph, code._blit, code.bitmaptools = original
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--changed", type=float, default=0.1, help="fraction of prices changed between fetches")
+    parser.add_argument("--rebuild-tickers", type=int, default=30, help="watchlist size for the rebuild pass")
+    parser.add_argument("--font", default=None, help="BDF font (default: the single-line font)")
+    args = parser.parse_args()
+
+    code = host_displayio.load_firmware(os.path.join(HERE, "..", "code.py"))
+    font_path = args.font or os.path.join(HERE, "..", code.SINGLE_LINE_FONT_PATH)
+    font = host_displayio.load_font(font_path)
+    max_width = code.DISPLAY_WIDTH * code.CHUNK_WIDTH_MULTIPLIER
+    combined = make_tickers(code, args.tickers)
+
+    print("font={} tickers={} chunk_max_width={} repeat={}".format(
+        os.path.basename(font_path), len(combined), max_width, args.repeat))
+
+    results = {}
+    for mode in ("legacy", "cached", "blit"):
+        results[mode] = run_mode(code, mode, combined, font, max_width, args.repeat)
+
+    reference = results["legacy"][3]
+    base = min(results["legacy"][0])
+    for mode, (times, firsts, peak, chunks) in results.items():
+        same = chunks == reference
+        best = min(times)
+        print("{:<7} first={:7.1f} ms  cycle={:8.1f} ms  speedup={:5.1f}x  chunks={}  alive<={}  identical={}".format(
+            mode, min(firsts) * 1000, best * 1000, base / best if best else 0, len(chunks), peak, same))
+        if not same:
+            sys.exit(1)
+
+    short = make_tickers(code, args.rebuild_tickers)
+    changed = mutate(code, short, args.changed)
+    full, incremental, chunks = run_rebuild(code, short, changed, font, max_width, args.repeat)
+    expected, _first, _stream = build(code, changed, font, max_width)
+    same = chunks == expected
+    print("rebuild {} tickers ({:.0%} changed) cold={:8.1f} ms  reusing={:8.1f} ms  speedup={:5.1f}x  identical={}".format(
+        len(short), args.changed, min(full) * 1000, min(incremental) * 1000,
+        min(full) / min(incremental) if min(incremental) else 0, same))
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Host-side stand-ins for the CircuitPython modules used by code.py.
+
+Lets the scroll renderer run under desktop CPython for benchmarking:
+
+    import host_displayio
+    code = host_displayio.load_firmware("../code.py")
+
+Only the parts of displayio / bitmaptools / adafruit_bitmap_font that the
+firmware touches are implemented. Bitmaps store one byte per pixel, and
+bitmaptools.blit uses whole-row operations so that it behaves like the
+native bulk copy rather than a per-pixel Python loop.
+"""
+
+import importlib.util
+import os
+import sys
+import time
+import types
+
+
+# ---------------- displayio ----------------
+class Bitmap:
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+        self._buf = bytearray(width * height)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            x, y = key
+            return self._buf[y * self.width + x]
+        return self._buf[key]
+
+    def __setitem__(self, key, value):
+        if isinstance(key, tuple):
+            x, y = key
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError("pixel out of bounds")
+            self._buf[y * self.width + x] = value
+        else:
+            self._buf[key] = value
+
+    def fill(self, value):
+        self._buf[:] = bytes([value]) * len(self._buf)
+
+    def rows(self):
+        w = self.width
+        return [bytes(self._buf[y * w:(y + 1) * w]) for y in range(self.height)]
+
+
+class Palette:
+    def __init__(self, color_count):
+        self._colors = [0] * color_count
+
+    def __len__(self):
+        return len(self._colors)
+
+    def __getitem__(self, idx):
+        return self._colors[idx]
+
+    def __setitem__(self, idx, value):
+        self._colors[idx] = value
+
+
+class TileGrid:
+    def __init__(self, bitmap, *, pixel_shader=None, x=0, y=0, **_kwargs):
+        self.bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.x = x
+        self.y = y
+        self.hidden = False
+
+
+class Group(list):
+    def __init__(self, *, scale=1, x=0, y=0):
+        super().__init__()
+        self.scale = scale
+        self.x = x
+        self.y = y
+        self.hidden = False
+
+    def __eq__(self, other):
+        return self is other
+
+    __hash__ = object.__hash__
+
+
+class OnDiskBitmap(Bitmap):
+    def __init__(self, _file):
+        super().__init__(1, 1, 2)
+        self.pixel_shader = Palette(2)
+
+
+def release_displays():
+    pass
+
+
+# ---------------- bitmaptools ----------------
+_SKIP_MASKS = {}
+
+
+def _skip_mask_table(skip):
+    table = _SKIP_MASKS.get(skip)
+    if table is None:
+        table = bytes(0xFF if v == skip else 0x00 for v in range(256))
+        _SKIP_MASKS[skip] = table
+    return table
+
+
+def blit(dest, source, x, y, *, x1=0, y1=0, x2=None, y2=None,
+         skip_source_index=None, skip_dest_index=None):
+    if x2 is None:
+        x2 = source.width
+    if y2 is None:
+        y2 = source.height
+    span = x2 - x1
+    if span <= 0:
+        return
+    dw = dest.width
+    sw = source.width
+    dbuf = dest._buf
+    sbuf = source._buf
+    table = _skip_mask_table(skip_source_index) if skip_source_index is not None else None
+    for row in range(y2 - y1):
+        dy = y + row
+        if dy < 0 or dy >= dest.height:
+            continue
+        s0 = (y1 + row) * sw + x1
+        d0 = dy * dw + x
+        src_row = bytes(sbuf[s0:s0 + span])
+        if table is None:
+            dbuf[d0:d0 + span] = src_row
+            continue
+        # keep dest where src == skip, else take src (all in C-level int ops)
+        keep = int.from_bytes(src_row.translate(table), 'little')
+        merged = int.from_bytes(src_row, 'little') | (int.from_bytes(dbuf[d0:d0 + span], 'little') & keep)
+        dbuf[d0:d0 + span] = merged.to_bytes(span, 'little')
+
+
+def fill_region(dest, x1, y1, x2, y2, value):
+    for yy in range(max(0, y1), min(dest.height, y2)):
+        start = yy * dest.width + max(0, x1)
+        end = yy * dest.width + min(dest.width, x2)
+        if end > start:
+            dest._buf[start:end] = bytes([value]) * (end - start)
+
+
+# ---------------- adafruit_bitmap_font ----------------
+class Glyph:
+    __slots__ = ("bitmap", "tile_index", "width", "height", "dx", "dy", "shift_x", "shift_y")
+
+    def __init__(self, bitmap, width, height, dx, dy, shift_x):
+        self.bitmap = bitmap
+        self.tile_index = 0
+        self.width = width
+        self.height = height
+        self.dx = dx
+        self.dy = dy
+        self.shift_x = shift_x
+        self.shift_y = 0
+
+
+class BDF:
+    """Minimal BDF loader providing get_glyph()/get_bounding_box()."""
+
+    def __init__(self, path):
+        self._glyphs = {}
+        self._bbox = (0, 0, 0, 0)
+        self._load(path)
+
+    def _load(self, path):
+        enc = None
+        dwidth = 0
+        bbx = None
+        rows = None
+        with open(path, "r", encoding="latin-1") as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                kw = parts[0]
+                if rows is not None:
+                    if kw == "ENDCHAR":
+                        self._add(enc, dwidth, bbx, rows)
+                        rows = None
+                    else:
+                        rows.append(int(kw, 16))
+                elif kw == "FONTBOUNDINGBOX":
+                    self._bbox = tuple(int(p) for p in parts[1:5])
+                elif kw == "ENCODING":
+                    enc = int(parts[1])
+                elif kw == "DWIDTH":
+                    dwidth = int(parts[1])
+                elif kw == "BBX":
+                    bbx = tuple(int(p) for p in parts[1:5])
+                elif kw == "BITMAP":
+                    rows = []
+
+    def _add(self, enc, dwidth, bbx, rows):
+        if enc is None or enc < 0 or bbx is None:
+            return
+        w, h, dx, dy = bbx
+        bm = Bitmap(max(1, w), max(1, h), 2)
+        row_bits = ((w + 7) // 8) * 8
+        for yy, bits in enumerate(rows[:h]):
+            for xx in range(w):
+                if bits & (1 << (row_bits - 1 - xx)):
+                    bm[xx, yy] = 1
+        # adafruit_bitmap_font reports dy relative to the top of the font box
+        top = self._bbox[1] + self._bbox[3]
+        self._glyphs[enc] = Glyph(bm, w, h, dx, top - (h + dy), dwidth)
+
+    def get_glyph(self, code):
+        return self._glyphs.get(code)
+
+    def get_bounding_box(self):
+        return self._bbox
+
+    def load_glyphs(self, _codes):
+        pass
+
+
+def load_font(path):
+    return BDF(path)
+
+
+# ---------------- misc stubs ----------------
+def _ticks_ms():
+    return int(time.monotonic() * 1000) & 0x3FFFFFFF
+
+
+def _ticks_diff(a, b):
+    return ((a - b + 0x20000000) & 0x3FFFFFFF) - 0x20000000
+
+
+def _ticks_add(a, delta):
+    return (a + delta) & 0x3FFFFFFF
+
+
+def _module(name, **attrs):
+    mod = types.ModuleType(name)
+    mod.__dict__.update(attrs)
+    return mod
+
+
+def install():
+    """Register the stub modules in sys.modules (idempotent)."""
+    if "displayio" in sys.modules and getattr(sys.modules["displayio"], "_host_stub", False):
+        return
+    displayio = _module(
+        "displayio", Bitmap=Bitmap, Palette=Palette, TileGrid=TileGrid, Group=Group,
+        OnDiskBitmap=OnDiskBitmap, release_displays=release_displays, _host_stub=True,
+    )
+    bitmap_font = _module("adafruit_bitmap_font.bitmap_font", load_font=load_font)
+    radio = types.SimpleNamespace(connected=False, ipv4_address=None, ipv4_gateway=None,
+                                  mac_address=b"\x00\x11\x22\x33\x44\x55")
+    sys.modules.update({
+        "displayio": displayio,
+        "bitmaptools": _module("bitmaptools", blit=blit, fill_region=fill_region),
+        "framebufferio": _module("framebufferio"),
+        "rgbmatrix": _module("rgbmatrix"),
+        "adafruit_bitmap_font": _module("adafruit_bitmap_font", bitmap_font=bitmap_font),
+        "adafruit_bitmap_font.bitmap_font": bitmap_font,
+        "adafruit_ticks": _module("adafruit_ticks", ticks_ms=_ticks_ms, ticks_diff=_ticks_diff,
+                                  ticks_add=_ticks_add),
+        "supervisor": _module("supervisor", runtime=types.SimpleNamespace(serial_bytes_available=0)),
+        "wifi": _module("wifi", radio=radio),
+        "socketpool": _module("socketpool", SocketPool=lambda radio: None),
+        "adafruit_requests": _module("adafruit_requests", Session=lambda *a, **k: None),
+        "board": _module("board"),
+        "digitalio": _module("digitalio"),
+    })
+
+
+class FakeDisplay:
+    """Stands in for framebufferio.FramebufferDisplay."""
+
+    width = 0
+    height = 0
+    brightness = 0.1
+    auto_refresh = True
+    root_group = None
+
+    def refresh(self, **_kwargs):
+        return True
+
+
+def load_firmware(code_path, module_name="ticker_code"):
+    """Import a firmware code.py under CPython without running main()."""
+    install()
+    code_path = os.path.abspath(code_path)
+    sys.path.insert(0, os.path.dirname(code_path))
+    spec = importlib.util.spec_from_file_location(module_name, code_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    display = FakeDisplay()
+    display.width = module.DISPLAY_WIDTH
+    display.height = module.DISPLAY_HEIGHT
+    module._matrix = display
+    return module
@@ -36,7 +36,8 @@ except Exception as e:
     raise RuntimeError("Required networking libraries not found: {}".format(e))
 
 try:
-    from api_client import LocalHubAPI
+    from api_client import (LocalHubAPI, TickerTable, KIND_STOCK, KIND_CRYPTO, KIND_FOREX, KIND_NAMES,
+                            load_price_cache, save_price_cache)
 except Exception as e:
     raise RuntimeError("api_client.py not found in this folder: {}".format(e))
 
@@ -64,6 +65,11 @@ except Exception:
     bitmap_font = None
     adafruit_ticks = None
 
+try:
+    import bitmaptools
+except Exception:
+    bitmaptools = None
+
 # ---- Panel configuration (single 64x32) ----
 PANEL_WIDTH = 64
 PANEL_HEIGHT = 32
@@ -75,6 +81,7 @@ DISPLAY_HEIGHT = PANEL_HEIGHT
 FETCH_INTERVAL_DEFAULT = 300  # seconds between data refreshes
 ITEM_DWELL_SEC_DEFAULT = 2.5  # seconds to show each asset
 ITEM_DWELL_RANGE = (1.0, 30.0)
+PREFETCH_LEAD_SEC = 8  # start fetching the next cycle's data this long before it is due
 
 # Asset order (local override until API provides asset_order)
 ASSET_ORDER = ['stocks', 'crypto', 'forex']
@@ -94,6 +101,20 @@ COL_WHITE = 1
 COL_GREEN = 2
 COL_RED = 3
 
+# Corner square marking a card drawn from the on-flash price cache until live data arrives
+STALE_MARKER_SIZE = 2
+
+# Colours behind the palette indices above (plus the background layer) per display mode.
+# Status/claim message cards always use the dark set.
+PALETTE_COLORS = {
+    'dark': (0x000000, 0xFFFFFF, 0x00FF00, 0xFF0000),
+    'lite': (0xFFFFFF, 0x000000, 0x00CC00, 0xCC0000),
+}
+
+# Card rendering
+CARD_POOL_SIZE = 6     # pre-allocated 64×32 card bitmaps (also the card text cache size)
+GLYPH_CACHE_MAX = 128  # colour-indexed glyph bitmaps kept between cards
+
 # Globals
 _matrix = None
 _root_group = None
@@ -103,6 +124,12 @@ _refresh_ok = 0
 _refresh_errs = 0
 _bg_palette = None  # palette for background layer (to switch dark/lite)
 _display_mode = 'dark'
+_card_palette = None  # shared by every ticker card; recoloured on mode change
+_message_palette = None  # shared by status/claim message cards (always dark)
+_card_slots = []  # [{'tile', 'key', 'used'}] pooled card bitmaps
+_card_clock = 0
+_shown_card = None
+_glyph_cache = {}
 
 
 # ---------------- Wi‑Fi & Credentials ----------------
@@ -280,12 +307,14 @@ def _init_matrix_once():
         try:
             bm = displayio.Bitmap(DISPLAY_WIDTH, DISPLAY_HEIGHT, 1)
             pal = displayio.Palette(1)
-            pal[0] = 0x000000
+            pal[0] = PALETTE_COLORS[_display_mode][COL_BLACK]
             _bg_palette = pal
             _root_group.append(displayio.TileGrid(bm, pixel_shader=pal))
         except Exception:
             pass
 
+        _init_card_pool()
+
         # Load font once
         try:
             _font8 = bitmap_font.load_font(FONT_PATH)
@@ -341,9 +370,12 @@ def _apply_display_mode(mode):
     if m not in ('dark', 'lite', 'light'):
         m = 'dark'
     _display_mode = 'lite' if m in ('lite', 'light') else 'dark'
+    # Cards share these palettes, so the one on screen changes colour without a redraw
     try:
         if _bg_palette is not None:
-            _bg_palette[0] = 0xFFFFFF if _display_mode == 'lite' else 0x000000
+            _bg_palette[0] = PALETTE_COLORS[_display_mode][COL_BLACK]
+        if _card_palette is not None:
+            _fill_palette(_card_palette, _display_mode)
     except Exception:
         pass
 
@@ -405,28 +437,90 @@ def _measure_text(font, text):
     return w
 
 
+def _cached_glyph(font, ch, color_idx):
+    """
+    Return (bitmap, width, height, dy) for a glyph pre-coloured with color_idx,
+    converting it from the font only the first time it is used.
+    """
+    key = (id(font), ord(ch), color_idx)
+    try:
+        return _glyph_cache[key]
+    except KeyError:
+        pass
+
+    g = font.get_glyph(ord(ch))
+    if not g:
+        entry = None
+    else:
+        gw = g.width
+        gh = g.height
+        bm = displayio.Bitmap(max(1, gw), max(1, gh), 4)
+        src = g.bitmap
+        for yy in range(gh):
+            for xx in range(gw):
+                if src[xx, yy]:
+                    bm[xx, yy] = color_idx
+        entry = (bm, gw, gh, getattr(g, 'dy', 0))
+
+    if len(_glyph_cache) >= GLYPH_CACHE_MAX:
+        _glyph_cache.clear()
+    _glyph_cache[key] = entry
+    return entry
+
+
+def _blit(dest, src, x, y, width, height):
+    """Copy the non-background pixels of src (width x height) into dest at (x, y), clipped."""
+    x1 = 0
+    y1 = 0
+    x2 = width
+    y2 = height
+    if x < 0:
+        x1 = -x
+        x = 0
+    if y < 0:
+        y1 = -y
+        y = 0
+    if x + (x2 - x1) > dest.width:
+        x2 = x1 + dest.width - x
+    if y + (y2 - y1) > dest.height:
+        y2 = y1 + dest.height - y
+    if x2 <= x1 or y2 <= y1:
+        return
+
+    if bitmaptools is not None:
+        try:
+            bitmaptools.blit(dest, src, x, y, x1=x1, y1=y1, x2=x2, y2=y2, skip_source_index=COL_BLACK)
+            return
+        except Exception:
+            pass
+    if hasattr(dest, 'blit'):
+        try:
+            dest.blit(x, y, src, x1=x1, y1=y1, x2=x2, y2=y2, skip_index=COL_BLACK)
+            return
+        except Exception:
+            pass
+
+    for yy in range(y1, y2):
+        by = y + yy - y1
+        for xx in range(x1, x2):
+            v = src[xx, yy]
+            if v:
+                dest[x + xx - x1, by] = v
+
+
 def _draw_text(bm, font, text, x, y, color_idx):
     if not font or not text:
         return x
     px = x
+    # Baseline adjustment: small positive offset for centering
+    base = y + LINE_VOFF
     for ch in text:
-        g = font.get_glyph(ord(ch))
-        if not g:
+        entry = _cached_glyph(font, ch, color_idx)
+        if not entry:
             px += CHAR_SPACING
             continue
-        gw = g.width
-        gh = g.height
-        dy = getattr(g, 'dy', 0)
-        # Baseline adjustment: small positive offset for centering
-        base = y + LINE_VOFF
-        for yy in range(gh):
-            by = base + yy + dy
-            if 0 <= by < bm.height:
-                for xx in range(gw):
-                    if g.bitmap[xx, yy]:
-                        bx = px + xx
-                        if 0 <= bx < bm.width:
-                            bm[bx, by] = color_idx
+        gbm, gw, gh, dy = entry
+        _blit(bm, gbm, px, base + dy, gw, gh)
         px += gw + CHAR_SPACING
     return px
 
@@ -516,40 +610,24 @@ def _create_claim_instruction_card(device_key):
 
 def _create_claim_code_card(claim_code):
     """Create a card showing the claim code."""
-    print(f"[CARD] Creating claim code card with: '{claim_code}'")
     # Truncate claim code if too long (show first 6 characters)
     short_code = claim_code[:6] if len(claim_code) > 6 else claim_code
-    print(f"[CARD] Short code: '{short_code}'")
-
-    card = _create_message_card("CLAIM", f"{short_code}", "USE APP", COL_GREEN)
-    print(f"[CARD] Claim code card created: {card}")
-    return card
+    return _create_message_card("CLAIM", f"{short_code}", "USE APP", COL_GREEN)
 
 def _create_message_card(line1, line2, line3, color):
     """Create a generic 3-line message card."""
-    print(f"[CARD] Creating message card: '{line1}', '{line2}', '{line3}', color={color}")
+    global _message_palette
+    print(f"[CARD] Message card: '{line1}', '{line2}', '{line3}'")
 
     if not displayio or not _matrix or not _font8:
         print("[CARD] Missing display components - displayio, matrix, or font")
         return None
 
     try:
-        # Create bitmap and palette
         bm = displayio.Bitmap(64, 32, 4)
-        print(f"[CARD] Bitmap created: {bm}")
-
-        # Always create a fresh palette to avoid issues
-        pal = displayio.Palette(4)
-        pal[COL_BLACK] = 0x000000
-        pal[COL_WHITE] = 0xFFFFFF
-        pal[COL_GREEN] = 0x00FF00
-        pal[COL_RED] = 0xFF0000
-        print(f"[CARD] Palette created: {pal}")
-
-        # Clear background
-        for y in range(32):
-            for x in range(64):
-                bm[x, y] = COL_BLACK
+        if _message_palette is None:
+            _message_palette = displayio.Palette(4)
+            _fill_palette(_message_palette, 'dark')
 
         # Draw lines (centered, with bounds checking)
         if line1 and line1.strip():
@@ -574,160 +652,191 @@ def _create_message_card(line1, line2, line3, color):
             x3 = max(0, min(64 - w3, 32 - (w3 // 2)))
             _draw_text(bm, _font8, display_line3, x3, BOTTOM_Y, color)
 
-        tile_grid = displayio.TileGrid(bm, pixel_shader=pal, x=0, y=0)
-        print(f"[CARD] Message card TileGrid created successfully: {tile_grid}")
-        return tile_grid
+        return displayio.TileGrid(bm, pixel_shader=_message_palette, x=0, y=0)
     except Exception as e:
         print(f"[CARD] Message card error: {e}")
-        import traceback
-        traceback.print_exc()
         return None
 
-def _render_card(item):
-    """Render a 64×32 card with 3 lines: Ticker, Price, Change. Returns a TileGrid or None."""
-    if not displayio or not _matrix or not _font8:
-        return None
+def _fill_palette(pal, mode):
+    # Index 0 is the card background
+    for idx, rgb in enumerate(PALETTE_COLORS[mode]):
+        pal[idx] = rgb
+
+
+def _init_card_pool():
+    """Allocate the card bitmaps and shared palette once and stack the cards, hidden, above the background."""
+    global _card_palette, _shown_card
     try:
-        bm = displayio.Bitmap(64, 32, 4)
-        pal = displayio.Palette(4)
-        # Index 0 is the card background; align with display mode
-        if _display_mode == 'lite':
-            pal[COL_BLACK] = 0xFFFFFF  # background white
-            pal[COL_WHITE] = 0x000000  # text black
-        else:
-            pal[COL_BLACK] = 0x000000  # background black
-            pal[COL_WHITE] = 0xFFFFFF  # text white
-        pal[COL_GREEN] = 0x00CC00 if _display_mode == 'lite' else 0x00FF00
-        pal[COL_RED] = 0xCC0000 if _display_mode == 'lite' else 0xFF0000
-
-        # Extract item data
-        symbol = item.get('symbol', '')
-        typ = item.get('type', '')
-        price_val = item.get('price_val')  # float for stocks/crypto
-        price_str = item.get('price_str')  # string for forex
-        change_val = item.get('change_val')
-        change_pct = item.get('change_pct')
-        is_pos = item.get('is_pos', True)
-
-        # Line 1: Ticker symbol (centered)
-        symbol_w = _measure_text(_font8, symbol)
-        symbol_x = 0 if symbol_w >= 64 else (32 - (symbol_w // 2))
-        _draw_text(bm, _font8, symbol, symbol_x, TOP_Y, COL_WHITE)
-
-        # Line 2: Price (centered)
-        maxw = 64
-        if typ == 'stock':
-            price_text = _format_price_stock(price_val or 0.0, maxw, _font8)
-        elif typ == 'crypto':
-            price_text = _format_price_crypto(price_val or 0.0, maxw, _font8)
-        else:  # forex
-            price_text = price_str or "0.0000"
-
-        price_w = _measure_text(_font8, price_text)
-        price_x = 0 if price_w >= 64 else (32 - (price_w // 2))
-        _draw_text(bm, _font8, price_text, price_x, MIDDLE_Y, COL_WHITE)
-
-        # Line 3: Change with colored arrow (centered)
-        change_text = ""
-        change_color = COL_GREEN if is_pos else COL_RED
-        
-        if typ == 'stock' and change_val is not None:
-            arrow, text = _format_change_abs(change_val)
-            change_text = arrow + " " + text if text else arrow
-        elif typ == 'crypto' and change_pct is not None:
-            arrow, text = _format_change_pct(change_pct)
-            change_text = arrow + " " + text if text else arrow
-        elif typ == 'forex':
-            change_text = ""  # No change data for forex typically
-        
-        if change_text:
-            change_w = _measure_text(_font8, change_text)
-            change_x = 0 if change_w >= 64 else (32 - (change_w // 2))
-            _draw_text(bm, _font8, change_text, change_x, BOTTOM_Y, change_color)
+        if _card_palette is None:
+            _card_palette = displayio.Palette(4)
+        _fill_palette(_card_palette, _display_mode)
+        # Tiles can only belong to one group, so a new root group gets a fresh pool
+        _card_slots.clear()
+        for _ in range(CARD_POOL_SIZE):
+            bm = displayio.Bitmap(DISPLAY_WIDTH, DISPLAY_HEIGHT, 4)
+            tile = displayio.TileGrid(bm, pixel_shader=_card_palette, x=0, y=0)
+            tile.hidden = True
+            _root_group.append(tile)
+            _card_slots.append({'tile': tile, 'key': None, 'used': 0})
+        _shown_card = None
+    except Exception as e:
+        print("[CARD] Pool init error:", e)
+
+
+def _is_pooled(tile):
+    for slot in _card_slots:
+        if slot['tile'] is tile:
+            return True
+    return False
+
 
-        return displayio.TileGrid(bm, pixel_shader=pal, x=0, y=0)
+def _card_text(kind, symbol, price_val, change):
+    """
+    (symbol, price, change, change colour) drawn on a ticker card; change is the
+    amount for stocks and the percent for crypto, None leaves the line blank.
+    The tuple doubles as the card's cache key.
+    """
+    maxw = 64
+    if kind == KIND_STOCK:
+        price_text = _format_price_stock(price_val or 0.0, maxw, _font8)
+    elif kind == KIND_CRYPTO:
+        price_text = _format_price_crypto(price_val or 0.0, maxw, _font8)
+    else:  # forex
+        price_text = "{:.4f}".format(price_val or 0.0)
+
+    change_text = ""
+    if kind == KIND_STOCK and change is not None:
+        arrow, text = _format_change_abs(change)
+        change_text = arrow + " " + text if text else arrow
+    elif kind == KIND_CRYPTO and change is not None:
+        arrow, text = _format_change_pct(change)
+        change_text = arrow + " " + text if text else arrow
+    # No change data for forex typically
+
+    change_color = COL_GREEN if change is None or change >= 0 else COL_RED
+    return (symbol, price_text, change_text, change_color)
+
+
+def _draw_card(bm, text):
+    """Render a 64×32 card with 3 centered lines: Ticker, Price, Change."""
+    symbol, price_text, change_text, change_color = text
+    bm.fill(COL_BLACK)
+    for line, y, color in ((symbol, TOP_Y, COL_WHITE), (price_text, MIDDLE_Y, COL_WHITE),
+                           (change_text, BOTTOM_Y, change_color)):
+        if line:
+            w = _measure_text(_font8, line)
+            x = 0 if w >= 64 else (32 - (w // 2))
+            _draw_text(bm, _font8, line, x, y, color)
+
+
+def _render_card(kind, symbol, price_val, change):
+    """
+    Return a pooled TileGrid showing the card, drawing it only if no pool slot
+    already holds the same text. The least recently used slot that is not on
+    screen is redrawn. Returns None if the display is not available.
+    """
+    global _card_clock
+    if not displayio or not _card_slots or not _font8:
+        return None
+    try:
+        key = _card_text(kind, symbol, price_val, change)
+        _card_clock += 1
+        victim = None
+        for slot in _card_slots:
+            if slot['key'] == key:
+                slot['used'] = _card_clock
+                return slot['tile']
+            if slot['tile'] is not _shown_card and (victim is None or slot['used'] < victim['used']):
+                victim = slot
+        if victim is None:
+            return None
+        victim['key'] = None
+        _draw_card(victim['tile'].bitmap, key)
+        victim['key'] = key
+        victim['used'] = _card_clock
+        return victim['tile']
     except Exception as e:
         print("[CARD] Render error:", e)
         return None
 
 
 def _show_card(tile):
-    print(f"[DISPLAY] _show_card called with tile: {tile}")
-    print(f"[DISPLAY] _root_group exists: {_root_group is not None}")
-    print(f"[DISPLAY] _matrix exists: {_matrix is not None}")
-
+    """
+    Bring tile to the front. Pooled cards are swapped by toggling hidden (no
+    allocation); other tiles (message cards) are stacked above the pool.
+    """
+    global _shown_card
     if not _root_group or not tile:
-        print("[DISPLAY] Cannot show card - missing root_group or tile")
         return
-
     try:
-        print(f"[DISPLAY] Current root_group length: {len(_root_group)}")
-
-        # Append new card above background
-        _root_group.append(tile)
-        print(f"[DISPLAY] Added tile to root_group, new length: {len(_root_group)}")
-
-        # Remove any previous card (keep bottom-most background + newest card)
-        while len(_root_group) > 2:
-            _root_group.pop(1)
-            print(f"[DISPLAY] Removed old card, current length: {len(_root_group)}")
+        pooled = _is_pooled(tile)
+        if pooled:
+            tile.hidden = False
+        elif tile is not _shown_card:
+            _root_group.append(tile)
+        if _shown_card is not None and _shown_card is not tile and _is_pooled(_shown_card):
+            _shown_card.hidden = True
+        _shown_card = tile
+
+        # Drop message tiles from earlier calls (keep background + pool + this tile)
+        base = 1 + len(_card_slots)
+        while len(_root_group) > base + (0 if pooled else 1):
+            _root_group.pop(base)
 
         try:
-            print("[DISPLAY] Calling matrix.refresh()...")
             _matrix.refresh()
-            print("[DISPLAY] Matrix refresh successful")
-        except Exception as refresh_e:
-            print(f"[DISPLAY] Matrix refresh failed: {refresh_e}")
-
+        except Exception:
+            pass
     except Exception as e:
         print(f"[DISPLAY] Show card error: {e}")
-        import traceback
-        traceback.print_exc()
 
 
 def _cleanup_display():
+    """Drop message tiles above the card pool; a pooled card stays up until the next swap."""
+    global _shown_card
     if not _root_group:
         return
     try:
-        while len(_root_group) > 1:
+        base = 1 + len(_card_slots)
+        while len(_root_group) > base:
             _root_group.pop()
+        if _shown_card is not None and not _is_pooled(_shown_card):
+            _shown_card = None
     except Exception:
         pass
 
 
-def _build_items(stocks, crypto, forex, order):
-    out = []
+def _build_items(table, order):
+    """Row numbers of table to show, grouped by kind in the configured asset order."""
     try:
-        for kind in order:
-            if kind == 'stocks':
-                for it in (stocks or []):
-                    sym = it.get('ticker', '')
-                    val = float(it.get('tngoLast', 0) or 0)
-                    chg = float(it.get('prcChange', 0) or 0)
-                    out.append({
-                        'type': 'stock', 'symbol': sym, 'price_val': val,
-                        'change_val': chg, 'change_pct': None, 'is_pos': (chg >= 0)
-                    })
-            elif kind == 'crypto':
-                for it in (crypto or []):
-                    sym = (it.get('ticker') or '').upper()
-                    val = float(it.get('lastPrice', 0) or 0)
-                    pct = float(it.get('prcChangePct', 0) or 0)
-                    out.append({
-                        'type': 'crypto', 'symbol': sym, 'price_val': val,
-                        'change_val': None, 'change_pct': pct, 'is_pos': (pct >= 0)
-                    })
-            elif kind == 'forex':
-                for it in (forex or []):
-                    sym = (it.get('ticker') or '').upper()
-                    mid = it.get('mid_price') or '0.0000'
-                    out.append({
-                        'type': 'forex', 'symbol': sym, 'price_val': None,
-                        'price_str': str(mid), 'change_val': None, 'change_pct': None, 'is_pos': True
-                    })
+        return table.indices([KIND_NAMES.index(name) for name in order if name in KIND_NAMES])
     except Exception as e:
         print("[DATA] Build items error:", e)
-    return out
+        return []
+
+
+def _show_cached_prices(table):
+    """
+    Show the first card of prices loaded from the on-flash cache with a red
+    corner marker while Wi-Fi and the hub come up. The marker is a message
+    tile, so the first live card swap removes it.
+    """
+    items = _build_items(table, ASSET_ORDER)
+    if not items or not _card_palette:
+        return False
+    row = items[0]
+    tile = _render_card(table.kinds[row], table.symbols[row], table.prices[row], table.changes[row])
+    if not tile:
+        return False
+    _show_card(tile)
+    try:
+        marker = displayio.Bitmap(STALE_MARKER_SIZE, STALE_MARKER_SIZE, 4)
+        marker.fill(COL_RED)
+        _root_group.append(displayio.TileGrid(marker, pixel_shader=_card_palette,
+                                              x=DISPLAY_WIDTH - STALE_MARKER_SIZE, y=0))
+    except Exception as e:
+        print("[CARD] Stale marker error:", e)
+    return True
 
 
 def _refresh_display():
@@ -787,6 +896,15 @@ def main():
         else:
             print("[MODE] A1 grounded but already configured — continuing normal run")
 
+    # Last saved prices on screen within a second of boot instead of after Wi-Fi, NTP and the first fetch
+    _init_matrix_once()
+    showing_cache = False
+    cached = load_price_cache()
+    if cached:
+        print("[CACHE] Showing {} cached prices saved at {}".format(len(cached), cached.saved_at))
+        showing_cache = _show_cached_prices(cached)
+    cached = None
+
     connected = connect_wifi()
     if not connected:
         if _a1_switch_closed():
@@ -804,7 +922,15 @@ def main():
     pool = socketpool.SocketPool(wifi.radio)  # type: ignore[attr-defined]
     session = adafruit_requests.Session(pool, ssl.create_default_context())
     
-    # Synchronize time before API calls
+    # Ensure device key exists (provisioning writes it when A1 grounded)
+    _ensure_device_key()
+
+    api = LocalHubAPI(session, socket_pool=pool)
+    if not ensure_credentials(api):
+        print("[MAIN] Missing credentials/config; provision via A1 switch")
+        return
+
+    # Synchronize time before API calls, from the hub's /time when it answers
     try:
         from time_sync import sync_time, validate_time
         print("[MAIN] Synchronizing system time...")
@@ -815,7 +941,7 @@ def main():
         
         # Always force time sync on startup to ensure accuracy
         print("[MAIN] Forcing time synchronization...")
-        if sync_time(pool, force_ntp=True):
+        if sync_time(pool, force_ntp=True, session=session, base_url=api.hub_url("")):
             is_valid, timestamp, year = validate_time()
             print(f"[MAIN] After sync - Valid: {is_valid}, Year: {year}")
         else:
@@ -823,33 +949,33 @@ def main():
             
     except Exception as e:
         print(f"[MAIN] Time sync error: {e}")
-    
-    # Ensure device key exists (provisioning writes it when A1 grounded)
-    _ensure_device_key()
-
-    api = LocalHubAPI(session)
-    if not ensure_credentials(api):
-        print("[MAIN] Missing credentials/config; provision via A1 switch")
-        return
-
-    _init_matrix_once()
 
     # Steady-state loop
     hb_interval = 120
     last_hb = 0
     while True:
         now = time.monotonic()
+        # Data fetched in the background while the previous cycle was on screen
+        prefetched_raw, prefetched_settings = api.take_prefetch()
+
         if now - last_hb > hb_interval:
             print("[API] Sending heartbeat...")
             if api.send_heartbeat():
                 print("[API] Heartbeat OK")
             last_hb = now
 
-        # Free display state before fetch
-        _cleanup_display()
+        # Drop message cards before fetch (the pooled ticker card stays up);
+        # the cached card keeps its stale marker until live data replaces it
+        if showing_cache:
+            showing_cache = False
+        else:
+            _cleanup_display()
         gc.collect()
 
-        display_settings = api.get_display_settings() or {}
+        if prefetched_settings is not None and not api.should_refresh_settings:
+            display_settings = prefetched_settings
+        else:
+            display_settings = api.get_display_settings() or {}
         # Apply brightness and color mode as soon as settings are fetched
         try:
             _apply_brightness(display_settings.get('brightness'))
@@ -872,11 +998,16 @@ def main():
         asset_order = _effective_asset_order(display_settings)
         print("[API] interval=", eff_interval, "dwell=", eff_dwell, "order=", asset_order, "mode=", _display_mode)
 
-        raw = api.get_ticker_data() or {}
-        print(f"[MAIN] API response: {raw}")
+        if prefetched_raw is not None:
+            raw = prefetched_raw
+        else:
+            raw = api.get_ticker_data() or {}
+        if isinstance(raw, TickerTable):
+            print("[MAIN] API response: stocks={} crypto={} forex={}".format(
+                raw.count(KIND_STOCK), raw.count(KIND_CRYPTO), raw.count(KIND_FOREX)))
 
         # Check if device is orphaned
-        if raw.get('orphaned'):
+        if isinstance(raw, dict) and raw.get('orphaned'):
             print("[MAIN] Device is orphaned - attempting recovery")
             device_key = raw.get('device_key', 'UNKNOWN')
 
@@ -929,7 +1060,7 @@ def main():
                     # Periodically check if device is still orphaned
                     try:
                         test_raw = api.get_ticker_data() or {}
-                        if not test_raw.get('orphaned'):
+                        if not (isinstance(test_raw, dict) and test_raw.get('orphaned')):
                             print("[MAIN] Device no longer orphaned - returning to normal operation")
                             break  # Device was claimed, exit claim display loop
                     except Exception as e:
@@ -947,13 +1078,14 @@ def main():
                     time.sleep(0.1)
                 continue
 
-        stocks, crypto, forex = api.parse_ticker_data(raw)
-        items = _build_items(stocks, crypto, forex, asset_order)
+        table = raw if isinstance(raw, TickerTable) else None
+        items = _build_items(table, asset_order) if table else []
+        if items:
+            save_price_cache(table)
 
         if not items:
             # Render a simple No Data card
-            dummy = {'type': 'stock', 'symbol': 'NO DATA', 'price_val': None, 'price_str': '', 'is_pos': True}
-            tile = _render_card(dummy)
+            tile = _render_card(KIND_STOCK, 'NO DATA', None, None)
             _show_card(tile)
             # Wait a bit and retry
             t0 = time.monotonic()
@@ -961,23 +1093,42 @@ def main():
                 time.sleep(0.1)
             continue
 
-        # Cycle through items until refresh interval elapses
+        # Cycle through items until refresh interval elapses; the next cycle's data is
+        # fetched in the background during the last PREFETCH_LEAD_SEC and swapped in
+        # at a card boundary once it has arrived.
         t_start = time.monotonic()
         idx = 0
         n = len(items)
-        while time.monotonic() - t_start < eff_interval:
-            item = items[idx]
-            tile = _render_card(item)
+        prefetch_started = False
+        while True:
+            elapsed = time.monotonic() - t_start
+            if elapsed >= eff_interval and not api.prefetch_pending():
+                break
+            if not prefetch_started and elapsed >= eff_interval - PREFETCH_LEAD_SEC:
+                if api.start_prefetch(include_settings=True):
+                    print("[API] Prefetching next cycle in background")
+                prefetch_started = True
+            row = items[idx]
+            tile = _render_card(table.kinds[row], table.symbols[row], table.prices[row], table.changes[row])
             if tile:
                 _show_card(tile)
+            # Draw the next card into a spare pool slot while this one dwells,
+            # so the change at the end of the dwell is only a swap
+            if n > 1:
+                row = items[(idx + 1) % n]
+                _render_card(table.kinds[row], table.symbols[row], table.prices[row], table.changes[row])
             # Dwell timing using adafruit_ticks if available
             if adafruit_ticks:
                 last = adafruit_ticks.ticks_ms()
                 step = int(max(1, eff_dwell * 1000))
                 while adafruit_ticks.ticks_diff(adafruit_ticks.ticks_ms(), last) < step:
-                    time.sleep(0)
+                    if api.poll_prefetch():
+                        time.sleep(0)
             else:
-                time.sleep(eff_dwell)
+                t_dwell = time.monotonic()
+                while time.monotonic() - t_dwell < eff_dwell:
+                    if api.poll_prefetch():
+                        time.sleep(0.01)
             idx = (idx + 1) % n
 
 
@@ -1,10 +1,11 @@
 """
 Time Synchronization Module for CircuitPython
-Provides NTP and HTTP date synchronization for Matrix Portal S3
+Sets the clock from the local hub's /time, with NTP and HTTP date
+synchronization as fallbacks, for Matrix Portal S3
 
 Usage:
     from time_sync import sync_time
-    if sync_time(pool):
+    if sync_time(pool, session=session, base_url=hub_url):
         print("Time synchronized successfully")
 """
 
@@ -18,6 +19,52 @@ MONTH_MAP = {
     'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
 }
 
+HUB_TIME_PATH = "/time"
+HUB_TIME_TIMEOUT = 3  # seconds; the hub is on the LAN
+UNIX_2000 = 946684800   # Unix time of 2000-01-01, the epoch of some CircuitPython ports
+VALID_MIN = 1704067200  # Jan 1, 2024: anything earlier means the clock was never set
+VALID_MAX = 4102444800  # Jan 1, 2100
+
+def _epoch_offset():
+    """Seconds to subtract from Unix time to get this port's time.time() epoch"""
+    try:
+        return UNIX_2000 if time.localtime(0)[0] == 2000 else 0
+    except Exception:
+        return 0
+
+def sync_with_hub(session, base_url):
+    """
+    Sync system time from the local hub's /time endpoint.
+    The hub stamps the time when it answers, so half the round trip is added.
+    Returns True if successful, False otherwise
+    """
+    if not session or not base_url:
+        return False
+    resp = None
+    try:
+        start = time.monotonic()
+        resp = session.get(base_url.rstrip("/") + HUB_TIME_PATH, timeout=HUB_TIME_TIMEOUT)
+        rtt = time.monotonic() - start
+        if resp.status_code != 200:
+            print(f"[TIME_SYNC] Hub time failed: HTTP {resp.status_code}")
+            return False
+        value = resp.headers.get('x-hub-time') or resp.headers.get('X-Hub-Time')
+        hub_time = float(value) if value else float(resp.json()['epoch'])
+
+        rtc.RTC().datetime = time.localtime(int(hub_time + rtt / 2 + 0.5) - _epoch_offset())
+        print(f"[TIME_SYNC] Hub time sync successful (rtt {rtt * 1000:.0f} ms)")
+        return get_unix_timestamp() is not None
+
+    except Exception as e:
+        print(f"[TIME_SYNC] Hub time sync failed: {e}")
+        return False
+    finally:
+        if resp is not None:
+            try:
+                resp.close()
+            except Exception:
+                pass
+
 def sync_with_ntp(pool):
     """
     Sync system time using NTP
@@ -52,8 +99,8 @@ def sync_with_ntp(pool):
                 print(f"[TIME_SYNC] NTP sync successful with {server}")
                 print(f"[TIME_SYNC] System time now: {new_time}")
                 
-                # Sanity check: should be between 2024-2026
-                if 1704067200 <= new_time <= 1767139200:  # 2024-2026
+                # Sanity check: the clock must now read a current date
+                if get_unix_timestamp() is not None:
                     return True
                 else:
                     print(f"[TIME_SYNC] NTP returned invalid time: {new_time}")
@@ -125,17 +172,17 @@ def get_unix_timestamp():
         current_time = time.time()
         
         # If already Unix timestamp (>= 2024)
-        if current_time >= 1704067200:  # Jan 1, 2024
+        if current_time >= VALID_MIN:
             # Double check it's not too far in future
-            if current_time <= 1767139200:  # Jan 1, 2026
+            if current_time <= VALID_MAX:
                 return int(current_time)
         
         # If CircuitPython 2000-epoch, convert carefully
         if 0 < current_time < 1000000000:  # Reasonable 2000-epoch range
-            unix_time = current_time + 946684800
+            unix_time = current_time + UNIX_2000
             
-            # Sanity check result (2024-2026)
-            if 1704067200 <= unix_time <= 1767139200:
+            # Sanity check result
+            if VALID_MIN <= unix_time <= VALID_MAX:
                 return int(unix_time)
         
         print(f"[TIME_SYNC] Invalid system time: {current_time}")
@@ -145,13 +192,14 @@ def get_unix_timestamp():
         print(f"[TIME_SYNC] Failed to get timestamp: {e}")
         return None
 
-def sync_time(pool, force_ntp=False):
+def sync_time(pool, force_ntp=False, session=None, base_url=None):
     """
     Main time synchronization function
     
     Args:
         pool: SocketPool for network requests
-        force_ntp: If True, always try NTP even if time seems correct
+        force_ntp: If True, always resync even if time seems correct
+        session, base_url: requests session and hub URL; the hub's /time is tried first
     
     Returns:
         True if time is synchronized, False otherwise
@@ -165,7 +213,11 @@ def sync_time(pool, force_ntp=False):
         
         print("[TIME_SYNC] Starting time synchronization...")
         
-        # Try NTP first
+        # The local hub first: one LAN request instead of public NTP servers
+        if sync_with_hub(session, base_url):
+            return True
+        
+        # Then NTP
         if sync_with_ntp(pool):
             return True
         
@@ -226,11 +278,11 @@ def validate_time():
             return False, None, None
         
         # Convert to struct_time to get year
-        tm = time.localtime(timestamp)
+        tm = time.localtime(timestamp - _epoch_offset())
         year = tm.tm_year
         
-        # Check if year is reasonable (2024-2026 for current use)
-        is_valid = 2024 <= year <= 2026
+        # get_unix_timestamp() already rejects times outside VALID_MIN..VALID_MAX
+        is_valid = True
         
         return is_valid, timestamp, year
         
@@ -9,6 +9,7 @@ import time
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import config
+import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,7 @@ class AlpacaClient:
         """
         self.api_key = api_key
         self.api_secret = api_secret
-        self.session = requests.Session()
+        self.session = metrics.instrument_session(requests.Session(), 'alpaca')
 
         # Set up authentication headers
         if api_key and api_secret:
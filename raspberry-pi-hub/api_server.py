@@ -4,17 +4,25 @@ Uses Flask to provide REST endpoints for querying price information.
 """
 
 import logging
-from flask import Flask, jsonify, request
-from datetime import datetime
+import time
+from flask import Flask, Response, g, jsonify, request
+from datetime import datetime, timezone
 import threading
 
 import config
+import font_metrics
+import metrics
+import profiling
 from db import Database
 
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__)
+profiling.install(app, 'api')
+
+# Routes polled by the displays; counted per client for device poll rates
+DEVICE_ROUTE_PREFIXES = ('/prices', '/time', '/device/')
 
 # Global database instance (will be set when server starts)
 db: Database = None
@@ -34,6 +42,138 @@ def init_api(database: Database, price_scheduler):
     scheduler = price_scheduler
 
 
+def _apply_layout(prices):
+    """
+    Attach per-item text widths when the request names a display font.
+
+    Query parameters:
+        font: BDF font name used by the device (e.g. 'spleen-16x32')
+        spacing, gap, block_spacing (optional): layout overrides in pixels
+
+    Returns:
+        An error response tuple if the font is unknown, otherwise None.
+    """
+    font_name = request.args.get('font')
+    if not font_name:
+        return None
+
+    spacing = request.args.get('spacing', font_metrics.DEFAULT_CHAR_SPACING, type=int)
+    gap = request.args.get('gap', font_metrics.DEFAULT_SEGMENT_GAP, type=int)
+    block_spacing = request.args.get('block_spacing', font_metrics.DEFAULT_BLOCK_SPACING, type=int)
+
+    if not font_metrics.attach_layouts(prices, font_name, spacing, gap, block_spacing):
+        return jsonify({'error': f'Unknown font: {font_name}'}), 404
+    return None
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _record_request_metrics(response):
+    """Record latency and status per route template (not per raw path)."""
+    start = g.pop('request_start', None)
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    if start is not None:
+        metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start,
+                                             method=request.method, route=route)
+    metrics.HTTP_REQUESTS.inc(method=request.method, route=route, status=response.status_code)
+    if route.startswith(DEVICE_ROUTE_PREFIXES):
+        client = request.remote_addr or 'unknown'
+        metrics.DEVICE_REQUESTS.inc(client=client, route=route)
+        metrics.DEVICE_LAST_SEEN.set(time.time(), client=client)
+    return response
+
+
+@app.after_request
+def _stamp_hub_time(response):
+    """
+    Add the hub's clock to every response (Unix seconds, millisecond
+    precision) so devices can set their RTC from whatever request they make
+    first. The HTTP server already sends a second-resolution Date header.
+    """
+    response.headers['X-Hub-Time'] = f"{time.time():.3f}"
+    return response
+
+
+@app.route('/time', methods=['GET'])
+def get_time():
+    """
+    Current hub time, for devices that sync their clock from the hub instead of NTP.
+
+    Returns:
+        JSON object with Unix time in seconds (float) and milliseconds, and the UTC ISO time
+
+    Example response:
+    {
+        "epoch": 1760000000.123,
+        "epoch_ms": 1760000000123,
+        "iso": "2025-10-09T08:53:20.123000+00:00"
+    }
+    """
+    epoch_ms = int(time.time() * 1000)
+    return jsonify({
+        'epoch': epoch_ms / 1000,
+        'epoch_ms': epoch_ms,
+        'iso': datetime.fromtimestamp(epoch_ms / 1000, timezone.utc).isoformat()
+    }), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Counters and histograms for the hub's hot paths in the Prometheus text format.
+
+    Covers API latency per route, time per Database method, provider request
+    latency with error and 429 counts, scheduler cycle duration and symbols
+    updated per cycle, and device request counts per client address.
+
+    Example response:
+        # HELP tickertronix_http_requests_total Local API responses by route template and status code.
+        # TYPE tickertronix_http_requests_total counter
+        tickertronix_http_requests_total{method="GET",route="/prices",status="200"} 42
+    """
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+@app.route('/admin/profiling', methods=['GET', 'POST'])
+def admin_profiling():
+    """
+    Show or change request profiling at runtime.
+
+    Request body (POST, all optional):
+        {
+            "enabled": true,
+            "mode": "sample",        # or "cprofile"
+            "sample_rate": 0.05,     # share of requests always kept
+            "slow_ms": 300,          # also keep requests slower than this (0 = off)
+            "interval_ms": 5         # stack sampling interval
+        }
+
+    Returns:
+        JSON object with the current settings and the newest profile files
+    """
+    if not profiling.admin_allowed():
+        return jsonify({'error': 'Forbidden'}), 403
+    if request.method == 'GET':
+        return jsonify(profiling.profiler.status()), 200
+
+    body = request.get_json(silent=True) or {}
+    try:
+        status = profiling.profiler.configure(
+            enabled=body.get('enabled'),
+            mode=body.get('mode'),
+            sample_rate=body.get('sample_rate'),
+            slow_ms=body.get('slow_ms'),
+            interval_ms=body.get('interval_ms')
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(status), 200
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """
@@ -74,9 +214,15 @@ def get_all_prices():
         },
         ...
     ]
+
+    Query parameters:
+        font (optional): add a 'layout' object with segment/block pixel widths
     """
     try:
         prices = db.get_latest_prices()
+        error = _apply_layout(prices)
+        if error:
+            return error
         return jsonify(prices), 200
     except Exception as e:
         logger.error(f"Error fetching all prices: {e}")
@@ -102,6 +248,9 @@ def get_prices_by_class(asset_class):
 
     try:
         prices = db.get_latest_prices(asset_class=asset_class)
+        error = _apply_layout(prices)
+        if error:
+            return error
         return jsonify(prices), 200
     except Exception as e:
         logger.error(f"Error fetching {asset_class} prices: {e}")
@@ -137,6 +286,10 @@ def get_price_by_symbol(asset_class, symbol):
                 'error': f'No data found for {symbol} in {asset_class}'
             }), 404
 
+        error = _apply_layout(prices)
+        if error:
+            return error
+
         # Return the first (and should be only) result
         return jsonify(prices[0]), 200
 
@@ -185,6 +338,41 @@ def get_selected_assets():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/fonts', methods=['GET'])
+def list_fonts():
+    """
+    List the BDF fonts the hub can compute text widths for.
+
+    Returns:
+        JSON array of font names usable as the ?font= query parameter
+    """
+    return jsonify(font_metrics.available_fonts()), 200
+
+
+@app.route('/fonts/<font_name>', methods=['GET'])
+def get_font_widths(font_name):
+    """
+    Get the glyph width table for a font.
+
+    Query parameters:
+        first, last (optional): codepoint range (default printable ASCII)
+
+    Returns:
+        JSON object with the font bounding box and a codepoint -> width map
+    """
+    font = font_metrics.get_font(font_name)
+    if font is None:
+        return jsonify({'error': f'Unknown font: {font_name}'}), 404
+
+    first = request.args.get('first', 32, type=int)
+    last = request.args.get('last', 126, type=int)
+    return jsonify({
+        'font': font.name,
+        'bounding_box': list(font.bounding_box),
+        'widths': font.width_table(first, last)
+    }), 200
+
+
 # ==================== Device Management Endpoints ====================
 
 @app.route('/device/<device_id>/settings', methods=['GET'])
@@ -421,16 +609,8 @@ def run_api_server(database: Database, price_scheduler, host=config.API_HOST, po
     server_thread.start()
 
     logger.info(f"API server running - accessible at http://{host}:{port}")
-    logger.info("Available endpoints:")
-    logger.info(f"  - GET /health")
-    logger.info(f"  - GET /prices")
-    logger.info(f"  - GET /prices/<asset_class>")
-    logger.info(f"  - GET /prices/<asset_class>/<symbol>")
-    logger.info(f"  - GET /status")
-    logger.info(f"  - GET /assets")
-    logger.info(f"  - GET /device/<device_id>/settings")
-    logger.info(f"  - POST /device/<device_id>/settings")
-    logger.info(f"  - POST /device/<device_id>/heartbeat")
-    logger.info(f"  - GET /devices")
+    logger.debug("Endpoints: %s", ', '.join(sorted(
+        f"{'/'.join(sorted(rule.methods - {'HEAD', 'OPTIONS'}))} {rule.rule}"
+        for rule in app.url_map.iter_rules() if rule.endpoint != 'static')))
 
     return server_thread
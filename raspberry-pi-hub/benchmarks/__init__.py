@@ -0,0 +1,10 @@
+"""
+Performance benchmarks for the hub.
+
+Run from the raspberry-pi-hub directory:
+
+    python -m benchmarks.hub_bench --symbols 60 --devices 10 --duration 15
+
+mock_market serves stand-ins for the Alpaca and Twelve Data endpoints the
+clients call, so a benchmark never touches the real APIs or your credits.
+"""
@@ -0,0 +1,456 @@
+"""
+Simulated device fleet: how many displays can one hub serve?
+
+Emulates Matrix Portal scroll, Matrix Portal single and CYD clients with
+asyncio (one task per virtual device, a new TCP connection per request as
+on the real boards) and grows the fleet in steps. Request patterns follow
+the firmware:
+
+  scroll   boot: /time, /prices + settings; then heartbeat every 120 s,
+           /prices every update_interval (from settings), settings with
+           the fetch when the 300 s settings cache has expired
+  single   boot: /time, settings, /prices; then heartbeat every 120 s and
+           settings + /prices every update_interval
+  cyd      heartbeat + /prices every 300 s
+
+Intervals get +/-10% jitter and new devices start spread over a ramp.
+--time-scale divides every interval, so N virtual devices at scale k put
+the load of N*k real displays on the hub.
+
+For every step the report has latency percentiles and throughput per
+route, errors and timeouts, the hub's CPU use (% of one core) and RSS
+sampled from /proc/<pid>, and the generator's own CPU and event loop lag
+(if those are high the generator, not the hub, is the bottleneck).
+
+By default a hub is started in a subprocess (a temporary database seeded
+with --symbols assets priced from the mock market server) and serves the
+unchanged api_server through run_api_server:
+
+    python -m benchmarks.fleet_load --steps 50,200,500,1000 --step-duration 60 --time-scale 10
+
+or point it at a running hub (devices named fleet-* are registered there):
+
+    python -m benchmarks.fleet_load --hub http://tickertronixhub.local:5001 --hub-pid 1234
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+HUB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if HUB_DIR not in sys.path:
+    sys.path.insert(0, HUB_DIR)
+
+from benchmarks.stats import summarize  # noqa: E402
+
+REPORT_VERSION = 1
+ROUTES = ('prices', 'settings', 'heartbeat', 'time')
+
+HEARTBEAT_INTERVAL = 120
+SETTINGS_CACHE_INTERVAL = 300      # scroll build re-fetches settings at most this often
+CYD_UPDATE_INTERVAL = 300          # DATA_UPDATE_INTERVAL in the CYD sketch
+DEFAULT_UPDATE_INTERVAL = 300      # hub default device setting
+INTERVAL_JITTER = 0.10
+DEVICE_TYPES = {
+    'scroll': 'matrix_portal_scroll',
+    'single': 'matrix_portal_single',
+    'cyd': 'cyd_il9341',
+}
+
+
+class Collector:
+    """Latency samples and error counts of the current step."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.samples: Dict[str, List[float]] = {r: [] for r in ROUTES}
+        self.errors: Dict[str, Dict[str, int]] = {r: {} for r in ROUTES}
+        self.max_lag = 0.0
+
+    def ok(self, route: str, ms: float):
+        self.samples[route].append(ms)
+
+    def error(self, route: str, reason: str):
+        self.errors[route][reason] = self.errors[route].get(reason, 0) + 1
+
+    def lag(self, seconds: float):
+        if seconds > self.max_lag:
+            self.max_lag = seconds
+
+
+class VirtualDevice:
+    """One emulated display following its firmware's request schedule."""
+
+    def __init__(self, kind: str, index: int, hub: 'HubTarget', collector: Collector,
+                 rng: random.Random, time_scale: float, timeout: float, prefix: str):
+        self.kind = kind
+        self.device_id = f"{prefix}-{kind}-{index:05d}"
+        self.hub = hub
+        self.collector = collector
+        self.rng = rng
+        self.time_scale = time_scale
+        self.timeout = timeout
+        self.update_interval = CYD_UPDATE_INTERVAL if kind == 'cyd' else DEFAULT_UPDATE_INTERVAL
+
+    def _interval(self, seconds: float) -> float:
+        jitter = self.rng.uniform(1 - INTERVAL_JITTER, 1 + INTERVAL_JITTER)
+        return seconds * jitter / self.time_scale
+
+    async def _sleep_until(self, when: float):
+        loop = asyncio.get_running_loop()
+        delay = when - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.collector.lag(loop.time() - when)
+
+    async def request(self, route: str, method: str, path: str, body: Optional[Dict] = None):
+        """Issue one request, record its latency, return the parsed JSON body (or None)."""
+        start = time.perf_counter()
+        try:
+            status, payload = await asyncio.wait_for(self.hub.request(method, path, body), self.timeout)
+        except asyncio.TimeoutError:
+            self.collector.error(route, 'timeout')
+            return None
+        except OSError as e:
+            self.collector.error(route, type(e).__name__)
+            return None
+        elapsed = (time.perf_counter() - start) * 1000.0
+        if status != 200:
+            self.collector.error(route, str(status))
+            return None
+        self.collector.ok(route, elapsed)
+        if route == 'settings':
+            try:
+                return json.loads(payload)
+            except ValueError:
+                return None
+        return None
+
+    async def heartbeat(self):
+        await self.request('heartbeat', 'POST', f"/device/{self.device_id}/heartbeat",
+                           {'device_type': DEVICE_TYPES[self.kind], 'device_name': self.device_id})
+
+    async def settings(self):
+        data = await self.request('settings', 'GET', f"/device/{self.device_id}/settings"
+                                  f"?device_type={DEVICE_TYPES[self.kind]}")
+        if data and data.get('update_interval'):
+            try:
+                self.update_interval = max(15, min(900, int(data['update_interval'])))
+            except (TypeError, ValueError):
+                pass
+
+    async def prices(self):
+        await self.request('prices', 'GET', '/prices')
+
+    async def run(self, start_delay: float):
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(start_delay)
+        if self.kind == 'cyd':
+            while True:
+                due = loop.time() + self._interval(self.update_interval)
+                await self.heartbeat()
+                await self.prices()
+                await self._sleep_until(due)
+
+        await self.request('time', 'GET', '/time')
+        if self.kind == 'scroll':
+            await asyncio.gather(self.prices(), self.settings())
+        else:
+            await self.settings()
+            await self.prices()
+        now = loop.time()
+        next_hb = now
+        next_fetch = now + self._interval(self.update_interval)
+        settings_at = now
+        while True:
+            if loop.time() >= next_hb:
+                await self.heartbeat()
+                next_hb = loop.time() + self._interval(HEARTBEAT_INTERVAL)
+            await self._sleep_until(min(next_fetch, next_hb))
+            if loop.time() < next_fetch:
+                continue
+            if self.kind == 'single' or (loop.time() - settings_at) * self.time_scale > SETTINGS_CACHE_INTERVAL:
+                # The firmware prefetches both on the same pass
+                await asyncio.gather(self.prices(), self.settings())
+                settings_at = loop.time()
+            else:
+                await self.prices()
+            next_fetch = loop.time() + self._interval(self.update_interval)
+
+
+class HubTarget:
+    """Minimal HTTP/1.1 client: one connection per request, like the boards."""
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+
+    async def request(self, method: str, path: str, body: Optional[Dict] = None):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            payload = json.dumps(body).encode() if body is not None else b''
+            head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                    f"User-Agent: tickertronix-fleet\r\nConnection: close\r\n")
+            if body is not None:
+                head += f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+            writer.write(head.encode() + b"\r\n" + payload)
+            await writer.drain()
+            data = await reader.read()
+        finally:
+            writer.close()
+        status_line, _, rest = data.partition(b"\r\n")
+        parts = status_line.split(b" ", 2)
+        status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+        return status, rest.partition(b"\r\n\r\n")[2]
+
+
+def read_proc(pid: int) -> Optional[Dict]:
+    """CPU seconds, RSS and thread count of a process from /proc (None if unavailable)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        rss_kb = threads = None
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    rss_kb = int(line.split()[1])
+                elif line.startswith('Threads:'):
+                    threads = int(line.split()[1])
+        return {'cpu_s': cpu, 'rss_mb': round((rss_kb or 0) / 1024.0, 1), 'threads': threads}
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+async def sample_process(pid: Optional[int], samples: List[Dict], stop: asyncio.Event):
+    while pid and not stop.is_set():
+        proc = read_proc(pid)
+        if proc:
+            samples.append(proc)
+        try:
+            await asyncio.wait_for(stop.wait(), 1.0)
+        except asyncio.TimeoutError:
+            pass
+
+
+def pick_kinds(mix: Dict[str, float], count: int, rng: random.Random) -> List[str]:
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    return [rng.choices(kinds, weights)[0] for _ in range(count)]
+
+
+async def run_fleet(args, base_url: str, hub_pid: Optional[int]) -> Dict:
+    rng = random.Random(args.seed)
+    hub = HubTarget(base_url)
+    collector = Collector()
+    tasks: List[asyncio.Task] = []
+    kinds_total: Dict[str, int] = {k: 0 for k in args.mix}
+    steps = []
+
+    for target in args.steps:
+        new = max(0, target - len(tasks))
+        ramp = args.ramp if args.ramp is not None else min(args.step_duration / 2, DEFAULT_UPDATE_INTERVAL / args.time_scale)
+        for kind in pick_kinds(args.mix, new, rng):
+            device = VirtualDevice(kind, len(tasks), hub, collector, random.Random(rng.random()),
+                                   args.time_scale, args.timeout, args.id_prefix)
+            kinds_total[kind] += 1
+            tasks.append(asyncio.ensure_future(device.run(rng.uniform(0, ramp))))
+
+        collector.reset()
+        proc_samples: List[Dict] = []
+        stop = asyncio.Event()
+        sampler = asyncio.ensure_future(sample_process(hub_pid, proc_samples, stop))
+        hub_before = read_proc(hub_pid) if hub_pid else None
+        self_before = os.times()
+        wall_start = time.monotonic()
+        await asyncio.sleep(args.step_duration)
+        wall = time.monotonic() - wall_start
+        self_after = os.times()
+        hub_after = read_proc(hub_pid) if hub_pid else None
+        stop.set()
+        await sampler
+
+        routes = {}
+        for route in ROUTES:
+            summary = summarize(collector.samples[route], sum(collector.errors[route].values()), wall)
+            summary['error_reasons'] = collector.errors[route]
+            routes[route] = summary
+        hub_stats = None
+        if hub_before and hub_after:
+            hub_stats = {
+                'cpu_percent': round(100.0 * (hub_after['cpu_s'] - hub_before['cpu_s']) / wall, 1),
+                'rss_mb': hub_after['rss_mb'],
+                'rss_mb_max': max(s['rss_mb'] for s in proc_samples) if proc_samples else hub_after['rss_mb'],
+                'threads_max': max(s['threads'] or 0 for s in proc_samples) if proc_samples else hub_after['threads'],
+            }
+        self_cpu = (self_after.user + self_after.system) - (self_before.user + self_before.system)
+        step = {
+            'devices': len(tasks),
+            'equivalent_devices': int(len(tasks) * args.time_scale),
+            'kinds': dict(kinds_total),
+            'duration_s': round(wall, 1),
+            'requests': sum(r['count'] for r in routes.values()),
+            'errors': sum(r['errors'] for r in routes.values()),
+            'throughput_rps': round(sum(r['count'] for r in routes.values()) / wall, 2),
+            'routes': routes,
+            'hub': hub_stats,
+            'generator': {
+                'cpu_percent': round(100.0 * self_cpu / wall, 1),
+                'max_loop_lag_ms': round(collector.max_lag * 1000.0, 1),
+            },
+        }
+        steps.append(step)
+        print_step(step)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {
+        'benchmark': 'fleet',
+        'version': REPORT_VERSION,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'hub': base_url,
+        'params': {
+            'steps': args.steps, 'step_duration_s': args.step_duration, 'time_scale': args.time_scale,
+            'mix': args.mix, 'timeout_s': args.timeout, 'symbols': args.symbols if not args.hub else None,
+        },
+        'steps': steps,
+    }
+
+
+def print_step(step: Dict):
+    prices = step['routes']['prices']
+    hub = step['hub'] or {}
+    print(f"devices={step['devices']:>6} (~{step['equivalent_devices']} real)  "
+          f"rps={step['throughput_rps']:>8.1f}  errors={step['errors']:>5}  "
+          f"prices p50={prices['p50_ms']:>7.1f}ms p99={prices['p99_ms']:>8.1f}ms  "
+          f"hub cpu={hub.get('cpu_percent', '-')}% rss={hub.get('rss_mb', '-')}MB  "
+          f"gen cpu={step['generator']['cpu_percent']}% lag={step['generator']['max_loop_lag_ms']}ms",
+          file=sys.stderr, flush=True)
+
+
+def serve(args):
+    """Subprocess entry: seed a temporary hub database and serve the API until killed."""
+    import threading
+
+    import api_server
+    import config
+    from alpaca_client import AlpacaClient
+    from db import Database
+    from scheduler import PriceScheduler
+
+    from benchmarks.hub_bench import seed
+    from benchmarks.mock_market import MockMarket, start_mock_market
+
+    logging.basicConfig(level=logging.WARNING, format=config.LOG_FORMAT)
+    _, market_url = start_mock_market(MockMarket())
+    config.ALPACA_BASE_URL = market_url
+    config.TWELVE_DATA_BASE_URL = market_url
+    config.TWELVE_DATA_API_KEY = 'fleet'
+    config.RATE_LIMIT_DELAY = 0
+
+    db = Database(os.path.join(tempfile.mkdtemp(prefix='hub-fleet-'), 'fleet.db'))
+    seed(db, args.symbols, 0)
+    price_scheduler = PriceScheduler(db, AlpacaClient('fleet-key', 'fleet-secret'))
+    price_scheduler.is_running = True
+    price_scheduler.update_all_prices()
+    price_scheduler.update_forex_prices()
+
+    api_server.run_api_server(db, price_scheduler, host='127.0.0.1', port=args.port)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    interval = config.UPDATE_INTERVAL_MINUTES * 60 / args.time_scale
+    while True:
+        threading.Event().wait(interval)
+        price_scheduler.update_all_prices()
+
+
+def spawn_hub(args):
+    cmd = [sys.executable, '-m', 'benchmarks.fleet_load', '--serve', '--port', str(args.port),
+           '--symbols', str(args.symbols), '--time-scale', str(args.time_scale)]
+    proc = subprocess.Popen(cmd, cwd=HUB_DIR, stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{args.port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"hub subprocess exited with {proc.returncode}")
+        try:
+            status, _ = asyncio.run(HubTarget(base_url).request('GET', '/health'))
+            if status in (200, 503):
+                return proc, base_url
+        except OSError:
+            pass
+        time.sleep(0.3)
+    proc.kill()
+    raise SystemExit("hub subprocess did not come up within 30 s")
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        if kind not in DEVICE_TYPES:
+            raise argparse.ArgumentTypeError(f"unknown device kind {kind!r} (use {', '.join(DEVICE_TYPES)})")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hub', help='base URL of a running hub (default: start one in a subprocess)')
+    parser.add_argument('--hub-pid', type=int, help='PID of the running hub, for CPU/RSS sampling')
+    parser.add_argument('--steps', type=lambda s: [int(x) for x in s.split(',')], default=[50, 200, 500, 1000],
+                        help='fleet sizes, comma separated (devices are kept between steps)')
+    parser.add_argument('--step-duration', type=float, default=60.0, help='seconds measured per step')
+    parser.add_argument('--ramp', type=float, default=None,
+                        help='seconds over which new devices start (default: half a step, at most one update interval)')
+    parser.add_argument('--time-scale', type=float, default=1.0, help='divide all device intervals by this')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('scroll=0.5,single=0.3,cyd=0.2'))
+    parser.add_argument('--timeout', type=float, default=10.0, help='per-request timeout in seconds')
+    parser.add_argument('--symbols', type=int, default=60, help='assets seeded into a spawned hub')
+    parser.add_argument('--port', type=int, default=5099, help='port for a spawned hub')
+    parser.add_argument('--id-prefix', default='fleet', help='device id prefix')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    proc = None
+    if args.hub:
+        base_url, hub_pid = args.hub.rstrip('/'), args.hub_pid
+    else:
+        proc, base_url = spawn_hub(args)
+        hub_pid = proc.pid
+    try:
+        report = asyncio.run(run_fleet(args, base_url, hub_pid))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
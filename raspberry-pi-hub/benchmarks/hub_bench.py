@@ -0,0 +1,304 @@
+"""
+Hub throughput and latency benchmark.
+
+Starts the mock market data server (mock_market.py) and the hub API on
+loopback ports against a temporary database, seeds N selected symbols and
+M devices, runs one price and one forex cycle, then drives concurrent device
+traffic for a fixed time: every device thread loops GET /prices, with a
+settings GET and a heartbeat POST every few iterations, while the price job
+keeps running on the scheduler's cadence (shortened) to contend for SQLite.
+
+The report is JSON (stdout, or --output) with p50/p90/p99 latency and
+throughput per route, scheduler cycle times, DB write calls per Database
+method (from the /metrics registry) and provider request/429 counts, so two
+runs can be compared with --compare:
+
+    python -m benchmarks.hub_bench --symbols 60 --devices 10 --duration 15 --output before.json
+    python -m benchmarks.hub_bench --symbols 60 --devices 10 --duration 15 --compare before.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List
+
+HUB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if HUB_DIR not in sys.path:
+    sys.path.insert(0, HUB_DIR)
+
+import requests  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+import api_server  # noqa: E402
+import config  # noqa: E402
+import metrics  # noqa: E402
+from alpaca_client import AlpacaClient  # noqa: E402
+from db import Database  # noqa: E402
+from scheduler import PriceScheduler  # noqa: E402
+
+from benchmarks.mock_market import MockMarket, start_mock_market  # noqa: E402
+from benchmarks.stats import percentile, summarize  # noqa: E402
+
+REPORT_VERSION = 1
+
+# Database methods that write; their call counts are reported as DB writes
+WRITE_METHODS = (
+    'update_price', 'register_device', 'update_device_settings', 'touch_device_settings',
+    'update_device_last_seen', 'add_selected_asset', 'save_config', 'cleanup_price_history',
+)
+
+
+def db_write_counts() -> Dict[str, int]:
+    counts = {}
+    for method in WRITE_METHODS:
+        snap = metrics.DB_QUERY_SECONDS.snapshot(method=method)
+        counts[method] = snap[0] if snap else 0
+    return counts
+
+
+def counts_delta(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+    return {k: after[k] - before.get(k, 0) for k in after if after[k] - before.get(k, 0)}
+
+
+def provider_counts() -> Dict[str, int]:
+    return {
+        'requests': metrics.PROVIDER_REQUEST_SECONDS.total_count(),
+        'rate_limited': int(metrics.PROVIDER_RATE_LIMITED.total()),
+        'errors': int(metrics.PROVIDER_ERRORS.total()),
+    }
+
+
+def seed(db: Database, symbols: int, devices: int) -> Dict[str, int]:
+    """Select ``symbols`` assets (60% stocks, 30% crypto, rest forex) and register ``devices`` devices."""
+    stocks = int(symbols * 0.6)
+    crypto = int(symbols * 0.3)
+    forex = symbols - stocks - crypto
+    for i in range(stocks):
+        db.add_selected_asset(f"S{i:03d}", 'stocks')
+    for i in range(crypto):
+        db.add_selected_asset(f"C{i:03d}/USD", 'crypto')
+    for i in range(forex):
+        db.add_selected_asset(f"F{i:02d}/USD", 'forex')
+    for i in range(devices):
+        device_id = f"bench-device-{i:03d}"
+        db.register_device(device_id, f"Bench {i}", 'matrix_portal_scroll', device_id)
+    return {'stocks': stocks, 'crypto': crypto, 'forex': forex, 'devices': devices}
+
+
+def run_cycle(fn) -> Dict:
+    writes_before = db_write_counts()
+    provider_before = provider_counts()
+    start = time.perf_counter()
+    fn()
+    duration = time.perf_counter() - start
+    provider_after = provider_counts()
+    return {
+        'duration_s': round(duration, 3),
+        'db_writes': counts_delta(writes_before, db_write_counts()),
+        'provider': {k: provider_after[k] - provider_before[k] for k in provider_after},
+    }
+
+
+def device_worker(index: int, base_url: str, args, stop: threading.Event,
+                  samples: Dict[str, List[float]], errors: Dict[str, int], lock: threading.Lock):
+    """One simulated display: /prices every iteration, settings and heartbeat every few."""
+    device_id = f"bench-device-{index % max(1, args.devices):03d}"
+    session = requests.Session()
+    prices_url = f"{base_url}/prices" + (f"?font={args.font}" if args.font else '')
+    local = {'prices': [], 'settings': [], 'heartbeat': []}
+    local_errors = {'prices': 0, 'settings': 0, 'heartbeat': 0}
+    iteration = 0
+    while not stop.is_set():
+        calls = [('prices', 'GET', prices_url, None)]
+        if args.settings_every and iteration % args.settings_every == 0:
+            calls.append(('settings', 'GET', f"{base_url}/device/{device_id}/settings", None))
+        if args.heartbeat_every and iteration % args.heartbeat_every == 0:
+            calls.append(('heartbeat', 'POST', f"{base_url}/device/{device_id}/heartbeat",
+                          {'device_type': 'matrix_portal_scroll'}))
+        for route, method, url, body in calls:
+            start = time.perf_counter()
+            try:
+                resp = session.request(method, url, json=body, timeout=10)
+                resp.content
+                ok = resp.status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000.0
+            if ok:
+                local[route].append(elapsed)
+            else:
+                local_errors[route] += 1
+        iteration += 1
+        if args.think_ms:
+            stop.wait(args.think_ms / 1000.0)
+    session.close()
+    with lock:
+        for route in local:
+            samples[route].extend(local[route])
+            errors[route] += local_errors[route]
+
+
+def cycle_worker(price_scheduler: PriceScheduler, interval: float, stop: threading.Event, cycles: List[float]):
+    while not stop.wait(interval):
+        start = time.perf_counter()
+        price_scheduler.update_all_prices()
+        cycles.append(time.perf_counter() - start)
+
+
+def run(args) -> Dict:
+    market = MockMarket(args.latency_ms, args.jitter_ms, args.rate_limit)
+    market_server, market_url = start_mock_market(market)
+    config.ALPACA_BASE_URL = market_url
+    config.ALPACA_BROKER_URL = market_url
+    config.TWELVE_DATA_BASE_URL = market_url
+    config.TWELVE_DATA_API_KEY = 'bench'
+
+    workdir = tempfile.mkdtemp(prefix='hub-bench-')
+    db = Database(os.path.join(workdir, 'bench.db'))
+    seed_start = time.perf_counter()
+    seeded = seed(db, args.symbols, args.devices)
+    seed_s = time.perf_counter() - seed_start
+
+    price_scheduler = PriceScheduler(db, AlpacaClient('bench-key', 'bench-secret'))
+    price_scheduler.is_running = True  # jobs are driven directly; APScheduler is not started
+    cycles = {
+        'prices': run_cycle(price_scheduler.update_all_prices),
+        'forex': run_cycle(price_scheduler.update_forex_prices),
+    }
+
+    api_server.init_api(db, price_scheduler)
+    http_server = make_server('127.0.0.1', 0, api_server.app, threaded=True)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{http_server.server_port}"
+
+    samples = {'prices': [], 'settings': [], 'heartbeat': []}
+    errors = {'prices': 0, 'settings': 0, 'heartbeat': 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+    load_cycles: List[float] = []
+
+    writes_before = db_write_counts()
+    provider_before = provider_counts()
+    threads = [threading.Thread(target=device_worker, args=(i, base_url, args, stop, samples, errors, lock))
+               for i in range(args.concurrency or args.devices)]
+    if args.cycle_interval:
+        threads.append(threading.Thread(target=cycle_worker,
+                                        args=(price_scheduler, args.cycle_interval, stop, load_cycles)))
+    load_start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    load_s = time.perf_counter() - load_start
+    provider_after = provider_counts()
+
+    http_server.shutdown()
+    market_server.shutdown()
+
+    routes = {route: summarize(samples[route], errors[route], load_s) for route in samples}
+    total = sum(r['count'] for r in routes.values())
+    load_cycles.sort()
+    return {
+        'benchmark': 'hub',
+        'version': REPORT_VERSION,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {
+            'symbols': args.symbols, 'devices': args.devices,
+            'concurrency': args.concurrency or args.devices, 'duration_s': args.duration,
+            'settings_every': args.settings_every, 'heartbeat_every': args.heartbeat_every,
+            'think_ms': args.think_ms, 'cycle_interval_s': args.cycle_interval, 'font': args.font,
+            'mock_latency_ms': args.latency_ms, 'mock_jitter_ms': args.jitter_ms,
+            'mock_rate_limit': args.rate_limit,
+        },
+        'seed': dict(seeded, duration_s=round(seed_s, 3)),
+        'cycles': cycles,
+        'load': {
+            'duration_s': round(load_s, 3),
+            'requests': total,
+            'errors': sum(errors.values()),
+            'throughput_rps': round(total / load_s, 2) if load_s else 0.0,
+            'routes': routes,
+            'price_cycles': {
+                'count': len(load_cycles),
+                'p50_s': round(percentile(load_cycles, 50), 3),
+                'max_s': round(load_cycles[-1], 3) if load_cycles else 0.0,
+            },
+            'db_writes': counts_delta(writes_before, db_write_counts()),
+            'provider': {k: provider_after[k] - provider_before[k] for k in provider_after},
+        },
+        'mock_market': market.stats(),
+    }
+
+
+def compare(report: Dict, baseline: Dict, max_regression: float) -> bool:
+    """Print per-route changes against a baseline report; False if any exceeds max_regression."""
+    ok = True
+    print(f"{'metric':<28}{'baseline':>12}{'current':>12}{'change':>10}", file=sys.stderr)
+    checks = [('load.throughput_rps', baseline['load']['throughput_rps'], report['load']['throughput_rps'], False)]
+    for route, cur in report['load']['routes'].items():
+        base = baseline['load']['routes'].get(route)
+        if not base or not base['count']:
+            continue
+        checks.append((f"{route}.p50_ms", base['p50_ms'], cur['p50_ms'], True))
+        checks.append((f"{route}.p99_ms", base['p99_ms'], cur['p99_ms'], True))
+    for name, base, cur, higher_is_worse in checks:
+        change = (cur - base) / base if base else 0.0
+        worse = change > max_regression if higher_is_worse else -change > max_regression
+        ok = ok and not worse
+        print(f"{name:<28}{base:>12.3f}{cur:>12.3f}{change:>+9.1%}{'  REGRESSION' if worse else ''}",
+              file=sys.stderr)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=60, help='selected assets to seed')
+    parser.add_argument('--devices', type=int, default=10, help='devices to register')
+    parser.add_argument('--concurrency', type=int, default=0, help='device threads (default: one per device)')
+    parser.add_argument('--duration', type=float, default=15.0, help='seconds of device traffic')
+    parser.add_argument('--settings-every', type=int, default=5, help='settings GET every N iterations (0 = never)')
+    parser.add_argument('--heartbeat-every', type=int, default=10, help='heartbeat POST every N iterations (0 = never)')
+    parser.add_argument('--think-ms', type=float, default=0.0, help='pause per device iteration (0 = closed loop)')
+    parser.add_argument('--cycle-interval', type=float, default=5.0,
+                        help='seconds between price jobs during the load phase (0 = none)')
+    parser.add_argument('--font', default=None, help='request /prices?font=<name> layouts')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='mock provider response delay')
+    parser.add_argument('--jitter-ms', type=float, default=10.0)
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='share of provider requests answered with 429')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', help='baseline JSON report to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help='with --compare, exit 1 if a p50/p99 grows or throughput drops by more than this share')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format=config.LOG_FORMAT)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(report, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Local stand-in for the Alpaca market data and Twelve Data HTTP APIs.
+
+Serves the endpoints alpaca_client.py and twelvedata_client.py call, with
+deterministic prices per symbol, a configurable response delay and a share
+of requests answered with HTTP 429. Used by hub_bench, or on its own to
+point a running hub at it:
+
+    python -m benchmarks.mock_market --port 8099 --latency-ms 80 --rate-limit 0.05
+    ALPACA_BASE_URL=http://127.0.0.1:8099 TWELVE_DATA_BASE_URL=http://127.0.0.1:8099 python main_headless.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+def _iso(ts: datetime) -> str:
+    return ts.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class MockMarket:
+    """Price model, latency/429 injection and request counters shared by the handler threads."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 rate_limit: float = 0.0, seed: int = 1):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.rate_limited: Dict[str, int] = {}
+
+    def _base_price(self, symbol: str) -> float:
+        return 1.0 + (zlib.crc32(symbol.encode()) % 90000) / 100.0
+
+    def _bar(self, symbol: str, ts: datetime, day_offset: int = 0) -> Dict:
+        base = self._base_price(symbol) * (1 + 0.01 * day_offset)
+        return {'t': _iso(ts), 'o': round(base, 4), 'h': round(base * 1.02, 4),
+                'l': round(base * 0.98, 4), 'c': round(base * 1.01, 4), 'v': 1000}
+
+    def _quote(self, symbol: str, ts: datetime) -> Dict:
+        mid = self._base_price(symbol) * 1.01
+        return {'t': _iso(ts), 'bp': round(mid * 0.999, 4), 'ap': round(mid * 1.001, 4)}
+
+    def delay_and_throttle(self, path: str) -> bool:
+        """Count the request, sleep the configured latency; True if it should get a 429."""
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            delay = self.latency_ms + (self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+            limited = self.rate_limit > 0 and self._rng.random() < self.rate_limit
+            if limited:
+                self.rate_limited[path] = self.rate_limited.get(path, 0) + 1
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        return limited
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'requests': dict(self.requests),
+                'rate_limited': dict(self.rate_limited),
+                'total_requests': sum(self.requests.values()),
+                'total_rate_limited': sum(self.rate_limited.values()),
+            }
+
+    def respond(self, path: str, query: Dict[str, str]) -> Optional[object]:
+        """JSON body for an endpoint, or None if the path is unknown."""
+        now = datetime.now(timezone.utc)
+        symbols = [s for s in query.get('symbols', query.get('symbol', '')).split(',') if s]
+
+        if path == '/v2/account':
+            return {'id': 'mock-account', 'status': 'ACTIVE'}
+        if path == '/v2/stocks/snapshots':
+            return {s: {
+                'latestTrade': {'t': _iso(now), 'p': round(self._base_price(s) * 1.01, 4)},
+                'latestQuote': self._quote(s, now),
+                'minuteBar': self._bar(s, now),
+                'dailyBar': self._bar(s, now),
+                'prevDailyBar': self._bar(s, now - timedelta(days=1), -1),
+            } for s in symbols}
+        if path in ('/v2/stocks/bars', '/v1beta3/crypto/us/bars'):
+            return {'bars': {s: [self._bar(s, now - timedelta(days=1), -1), self._bar(s, now)]
+                             for s in symbols}}
+        if path in ('/v2/stocks/quotes/latest', '/v1beta3/crypto/us/latest/quotes'):
+            return {'quotes': {s: self._quote(s, now) for s in symbols}}
+        if path == '/v1beta3/crypto/us/latest/bars':
+            return {'bars': {s: self._bar(s, now) for s in symbols}}
+        if path == '/quote':
+            quotes = {s: {
+                'symbol': s,
+                'price': f"{self._base_price(s) / 100:.5f}",
+                'previous_close': f"{self._base_price(s) / 101:.5f}",
+                'datetime': _iso(now),
+            } for s in symbols}
+            return next(iter(quotes.values())) if len(quotes) == 1 else quotes
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    market: MockMarket = None
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        if self.market.delay_and_throttle(parts.path):
+            self._send(429, {'message': 'too many requests'})
+            return
+        body = self.market.respond(parts.path, query)
+        if body is None:
+            self._send(404, {'message': 'not found'})
+        else:
+            self._send(200, body)
+
+    def _send(self, status: int, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_market(market: MockMarket, host: str = '127.0.0.1', port: int = 0):
+    """
+    Serve ``market`` on a background thread.
+
+    Returns:
+        (server, base_url); call ``server.shutdown()`` to stop it.
+    """
+    handler = type('MockMarketHandler', (_Handler,), {'market': market})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='share of requests answered with 429 (0-1)')
+    args = parser.parse_args()
+
+    market = MockMarket(args.latency_ms, args.jitter_ms, args.rate_limit)
+    server, url = start_mock_market(market, args.host, args.port)
+    print(f"Mock market data API on {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(json.dumps(market.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""
+Small helpers shared by the benchmark reports.
+"""
+
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0 for an empty list)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies_ms: List[float], errors: int, seconds: float) -> Dict:
+    """Count, error count, throughput and latency percentiles (ms) of one request type."""
+    values = sorted(latencies_ms)
+    return {
+        'count': len(values),
+        'errors': errors,
+        'throughput_rps': round(len(values) / seconds, 2) if seconds else 0.0,
+        'mean_ms': round(sum(values) / len(values), 3) if values else 0.0,
+        'p50_ms': round(percentile(values, 50), 3),
+        'p90_ms': round(percentile(values, 90), 3),
+        'p99_ms': round(percentile(values, 99), 3),
+        'max_ms': round(values[-1], 3) if values else 0.0,
+    }
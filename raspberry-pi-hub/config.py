@@ -17,8 +17,9 @@ os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(LOG_DIR, exist_ok=True)
 
 # Alpaca API Configuration
-ALPACA_BASE_URL = 'https://data.alpaca.markets'  # Market data endpoint
-ALPACA_BROKER_URL = 'https://paper-api.alpaca.markets'  # For account verification
+# Both can be pointed at a local stand-in (benchmarks/mock_market.py)
+ALPACA_BASE_URL = os.environ.get('ALPACA_BASE_URL', 'https://data.alpaca.markets')  # Market data endpoint
+ALPACA_BROKER_URL = os.environ.get('ALPACA_BROKER_URL', 'https://paper-api.alpaca.markets')  # For account verification
 
 # Asset limits per class
 MAX_ASSETS_PER_CLASS = 50
@@ -26,7 +27,16 @@ MAX_ASSETS_PER_CLASS = 50
 # Price update configuration
 UPDATE_INTERVAL_MINUTES = 5  # How often to fetch prices
 PRICE_RETENTION_DAYS = 7  # How many days of price history to retain
-PRICE_CLEANUP_INTERVAL_HOURS = 24  # How often to prune old prices
+PRICE_CLEANUP_INTERVAL_HOURS = 24  # How often to prune old prices (and reclaim free pages)
+PRICE_CLEANUP_BATCH = 500  # rows deleted per transaction
+PRICE_CLEANUP_PAUSE_SEC = 0.05  # pause between delete batches so readers get the database
+VACUUM_MAX_PAGES = 2000  # free pages returned to the filesystem per cleanup run (0 = all)
+PRICE_CACHE_SECONDS = 5.0  # get_latest_prices() results are reused this long at most (0 = no cache)
+SCHEDULER_MISFIRE_GRACE_SECONDS = 60  # a run later than this is counted as missed; late runs are coalesced into one
+
+# Schema migrations (migrations.py): row backfills run in the background in short batches
+MIGRATION_BACKFILL_BATCH = 500  # rows per transaction
+MIGRATION_BACKFILL_PAUSE_SEC = 0.05  # pause between batches so requests get the database
 
 # Twelve Data (forex) budget guidance (credits are 1 per symbol)
 FOREX_CREDITS_PER_DAY = 800
@@ -45,10 +55,36 @@ RATE_LIMIT_DELAY = 0.5  # Delay between API calls to respect rate limits (second
 # Local API server configuration
 API_HOST = '0.0.0.0'  # Listen on all interfaces for LAN access
 API_PORT = 5001
+WEB_PORT = 8080  # browser UI, served from the same process (runtime.py)
+
+# Request profiling (profiling.py); toggled at runtime via POST /admin/profiling
+PROFILE_ENABLED = os.environ.get('HUB_PROFILE', '0') == '1'
+PROFILE_SAMPLE_RATE = float(os.environ.get('HUB_PROFILE_SAMPLE_RATE', '0.01'))  # share of requests always kept
+PROFILE_SLOW_MS = float(os.environ.get('HUB_PROFILE_SLOW_MS', '500'))  # also keep requests slower than this (0 = off)
+PROFILE_INTERVAL_MS = 5  # stack sampling interval
+PROFILE_DIR = os.path.join(LOG_DIR, 'profiles')
+PROFILE_MAX_FILES = 200  # oldest profiles are deleted beyond this
+HUB_ADMIN_TOKEN = os.environ.get('HUB_ADMIN_TOKEN')  # allows /admin/* and the web UI's /api/profiling from the LAN; otherwise loopback only
+
+# BDF fonts used by the displays (for server-side text width tables).
+# HUB_FONT_DIRS may list extra directories separated by os.pathsep.
+FONT_DIRS = [
+    p for p in os.environ.get('HUB_FONT_DIRS', '').split(os.pathsep) if p
+] + [
+    os.path.join(BASE_DIR, 'fonts'),
+    os.path.join(BASE_DIR, '..', 'matrix-portal-scroll', 'fonts'),
+    os.path.join(BASE_DIR, '..', 'matrix-portal-single', 'fonts'),
+]
 
-# Logging configuration
-LOG_LEVEL = 'INFO'
+# Logging configuration (logging_setup.py)
+LOG_LEVEL = os.environ.get('HUB_LOG_LEVEL', 'INFO')
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_FILE_FORMAT = os.environ.get('HUB_LOG_FILE_FORMAT', 'json')  # 'json' (one object per line) or 'text'
+LOG_MAX_BYTES = 5 * 1024 * 1024  # app.log is rotated at this size
+LOG_BACKUP_COUNT = 3  # rotated files kept (app.log.1 ... app.log.3)
+LOG_QUEUE_SIZE = 10000  # records waiting for the writer thread; new records are dropped beyond this
+LOG_RATE_LIMIT = 20  # records per call site per window; the rest are counted and dropped (0 = off)
+LOG_RATE_WINDOW_SECONDS = 60
 
 # Asset classes
 ASSET_CLASSES = {
@@ -3,21 +3,37 @@ Database operations for Raspberry Pi Hub.
 Uses SQLite for local storage of credentials, selected assets, and price data.
 """
 
+import os
 import sqlite3
 import logging
+import threading
+import time
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Tuple
 import config
+import metrics
+import migrations
 
 logger = logging.getLogger(__name__)
 
 
+@metrics.timed_methods(metrics.DB_QUERY_SECONDS, metrics.DB_ERRORS,
+                        exclude=('get_connection', 'run_backfills'))
 class Database:
     """Handles all database operations for the price hub."""
 
+    # Database files already migrated to the latest version by this process
+    _ready_paths = set()
+    _ready_lock = threading.Lock()
+    # Database files already reported as lacking incremental auto-vacuum
+    _vacuum_warned_paths = set()
+
     def __init__(self, db_path: str = config.DB_PATH):
         """Initialize database connection and create tables if needed."""
         self.db_path = db_path
+        self._price_cache_lock = threading.Lock()
+        self._price_cache: Dict[Tuple, Tuple[float, List[Dict]]] = {}
+        self._price_generation = 0
         self.init_db()
 
     def get_connection(self) -> sqlite3.Connection:
@@ -27,95 +43,42 @@ class Database:
         return conn
 
     def init_db(self):
-        """Create all necessary tables if they don't exist."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # Config table for storing API credentials and settings
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS config (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        """)
-
-        # Selected assets table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS selected_assets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT NOT NULL,
-                asset_class TEXT NOT NULL,
-                enabled BOOLEAN DEFAULT 1,
-                UNIQUE(symbol, asset_class)
-            )
-        """)
-
-        # Asset prices table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS asset_prices (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT NOT NULL,
-                asset_class TEXT NOT NULL,
-                date DATE NOT NULL,
-                open_price REAL,
-                prev_close REAL,
-                last_price REAL,
-                last_updated TIMESTAMP,
-                UNIQUE(symbol, asset_class, date)
-            )
-        """)
+        """
+        Bring the schema up to date (see migrations.py).
 
-        # Ensure prev_close column exists (for existing databases)
-        cursor.execute("PRAGMA table_info(asset_prices)")
-        columns = [row['name'] for row in cursor.fetchall()]
-        if 'prev_close' not in columns:
-            cursor.execute("ALTER TABLE asset_prices ADD COLUMN prev_close REAL")
-            logger.info("Added prev_close column to asset_prices")
+        A file that is already at the latest version costs one query on the
+        first open in a process and nothing after that.
+        """
+        path = os.path.abspath(self.db_path)
+        with Database._ready_lock:
+            if path in Database._ready_paths and os.path.exists(path):
+                return
 
-        # Device registration and identification
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS devices (
-                device_id TEXT PRIMARY KEY,
-                device_name TEXT,
-                device_type TEXT,
-                device_key TEXT UNIQUE,
-                first_seen TIMESTAMP,
-                last_seen TIMESTAMP,
-                enabled BOOLEAN DEFAULT 1
-            )
-        """)
+        conn = self.get_connection()
+        try:
+            if migrations.current_version(conn.cursor()) < migrations.LATEST_VERSION:
+                migrations.apply_migrations(conn)
+                logger.info(f"Database initialized successfully (schema version {migrations.LATEST_VERSION})")
+        finally:
+            conn.close()
+        with Database._ready_lock:
+            Database._ready_paths.add(path)
 
-        # Device-specific display settings
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS device_settings (
-                device_id TEXT PRIMARY KEY,
-                scroll_mode TEXT DEFAULT 'single',
-                scroll_speed INTEGER DEFAULT 100,
-                brightness INTEGER DEFAULT 10,
-                update_interval INTEGER DEFAULT 300,
-                top_sources TEXT DEFAULT '["stocks"]',
-                bottom_sources TEXT DEFAULT '["crypto","forex"]',
-                dwell_seconds INTEGER DEFAULT 3,
-                asset_order TEXT DEFAULT '["stocks","crypto","forex"]',
-                font TEXT DEFAULT 'default',
-                updated_at TIMESTAMP,
-                FOREIGN KEY (device_id) REFERENCES devices(device_id)
-            )
-        """)
-
-        # Ensure optional columns exist for upgraded databases
-        cursor.execute("PRAGMA table_info(device_settings)")
-        ds_cols = [row['name'] for row in cursor.fetchall()]
-        if 'dwell_seconds' not in ds_cols:
-            cursor.execute("ALTER TABLE device_settings ADD COLUMN dwell_seconds INTEGER DEFAULT 3")
-            logger.info("Added dwell_seconds column to device_settings")
-        if 'asset_order' not in ds_cols:
-            cursor.execute("ALTER TABLE device_settings ADD COLUMN asset_order TEXT DEFAULT '[\"stocks\",\"crypto\",\"forex\"]'")
-            logger.info("Added asset_order column to device_settings")
+    def pending_backfills(self) -> List[str]:
+        """Descriptions of migrations whose row backfill has not finished."""
+        conn = self.get_connection()
+        try:
+            return [f"{m.version}: {m.description}" for m in migrations.pending_backfills(conn)]
+        finally:
+            conn.close()
 
-        conn.commit()
-        conn.close()
-        logger.info("Database initialized successfully")
+    def run_backfills(self, stop: Optional[threading.Event] = None) -> Dict[int, int]:
+        """Run pending migration backfills in short batches; returns rows changed per version."""
+        conn = self.get_connection()
+        try:
+            return migrations.run_backfills(conn, stop=stop)
+        finally:
+            conn.close()
 
     # ==================== Config Operations ====================
 
@@ -128,7 +91,7 @@ class Database:
         """, (key, value))
         conn.commit()
         conn.close()
-        logger.debug(f"Saved config: {key}")
+        logger.debug("Saved config: %s", key)
 
     def get_config(self, key: str) -> Optional[str]:
         """Retrieve a config value."""
@@ -163,6 +126,7 @@ class Database:
                 VALUES (?, ?, 1)
             """, (symbol, asset_class))
             conn.commit()
+            self._invalidate_prices()
             logger.info(f"Added asset: {symbol} ({asset_class})")
         except sqlite3.IntegrityError:
             # Asset already exists
@@ -184,6 +148,7 @@ class Database:
         """, (symbol, asset_class))
         conn.commit()
         conn.close()
+        self._invalidate_prices()
         logger.info(f"Removed asset: {symbol} ({asset_class})")
 
     def get_selected_assets(self, asset_class: Optional[str] = None,
@@ -248,6 +213,7 @@ class Database:
 
         conn.commit()
         conn.close()
+        self._invalidate_prices()
 
     def set_asset_enabled(self, symbol: str, asset_class: str, enabled: bool):
         """Enable or disable a selected asset without removing it."""
@@ -260,6 +226,7 @@ class Database:
         """, (1 if enabled else 0, symbol, asset_class))
         conn.commit()
         conn.close()
+        self._invalidate_prices()
 
     # ==================== Price Data Operations ====================
 
@@ -299,14 +266,14 @@ class Database:
                         last_updated = ?
                     WHERE id = ?
                 """, (open_price, prev_close, last_price, now, existing['id']))
-                logger.debug(f"Updated price for {symbol}: open={open_price}, prev_close={prev_close}, last={last_price}")
+                logger.debug("Updated price for %s: open=%s, prev_close=%s, last=%s", symbol, open_price, prev_close, last_price)
             else:
                 cursor.execute("""
                     UPDATE asset_prices
                     SET last_price = ?, last_updated = ?
                     WHERE id = ?
                 """, (last_price, now, existing['id']))
-                logger.debug(f"Updated price for {symbol}: last={last_price}")
+                logger.debug("Updated price for %s: last=%s", symbol, last_price)
         else:
             # Insert new record with both open and last price
             cursor.execute("""
@@ -314,32 +281,53 @@ class Database:
                 (symbol, asset_class, date, open_price, prev_close, last_price, last_updated)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (symbol, asset_class, price_date, open_price, prev_close, last_price, now))
-            logger.debug(f"Inserted new price for {symbol}: open={open_price}, prev_close={prev_close}, last={last_price}")
+            logger.debug("Inserted new price for %s: open=%s, prev_close=%s, last=%s", symbol, open_price, prev_close, last_price)
 
         conn.commit()
         conn.close()
+        self._invalidate_prices()
 
-    def cleanup_price_history(self, retention_days: int = config.PRICE_RETENTION_DAYS) -> int:
+    def cleanup_price_history(self, retention_days: int = config.PRICE_RETENTION_DAYS,
+                              batch_size: int = config.PRICE_CLEANUP_BATCH,
+                              pause: float = config.PRICE_CLEANUP_PAUSE_SEC) -> int:
         """
         Delete price history older than the configured retention window.
 
+        Rows are deleted in batches of batch_size (found through the date
+        index), each batch in its own short transaction, so readers and the
+        price update job are never blocked for long.
+
         Args:
             retention_days: Number of days of history to retain (inclusive of today).
+            batch_size: Rows per delete transaction
+            pause: Seconds to wait between batches
 
         Returns:
             Number of rows removed.
         """
         cutoff_date = date.today() - timedelta(days=retention_days - 1)
 
+        deleted = 0
         conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "DELETE FROM asset_prices WHERE date < ?",
-            (cutoff_date,)
-        )
-        deleted = cursor.rowcount if cursor.rowcount is not None else 0
-        conn.commit()
-        conn.close()
+        try:
+            while True:
+                cursor = conn.execute("""
+                    DELETE FROM asset_prices
+                    WHERE id IN (
+                        SELECT id FROM asset_prices WHERE date < ? LIMIT ?
+                    )
+                """, (cutoff_date, batch_size))
+                conn.commit()
+                count = cursor.rowcount if cursor.rowcount is not None else 0
+                deleted += count
+                if count < batch_size:
+                    break
+                time.sleep(pause)
+        finally:
+            conn.close()
+        if deleted:
+            self._invalidate_prices()
+            metrics.RETENTION_DELETED_ROWS.inc(deleted)
 
         logger.info(
             "Pruned price history older than %s (retention=%s days). Removed %s rows.",
@@ -349,6 +337,95 @@ class Database:
         )
         return deleted
 
+    def reclaim_space(self, max_pages: int = config.VACUUM_MAX_PAGES) -> Dict:
+        """
+        Return free pages left by deletes to the filesystem.
+
+        Runs PRAGMA incremental_vacuum for at most max_pages pages (0 = all),
+        which only moves pages at the end of the file. A database created
+        before incremental auto-vacuum was enabled is left alone (logged once
+        per file); enable_incremental_vacuum() converts it.
+
+        Returns:
+            storage_stats() plus 'reclaimed_pages'
+        """
+        conn = self.get_connection()
+        conn.isolation_level = None
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                if self.db_path not in Database._vacuum_warned_paths:
+                    Database._vacuum_warned_paths.add(self.db_path)
+                    logger.warning("Database does not use incremental auto-vacuum; free pages are not "
+                                   "reclaimed. Run scripts/cleanup_price_history.py --enable-vacuum "
+                                   "once (rewrites the file) to switch it over")
+                reclaimed = 0
+            else:
+                before = conn.execute("PRAGMA page_count").fetchone()[0]
+                # executescript steps the pragma to completion (execute() frees one page)
+                conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)});")
+                reclaimed = max(0, before - conn.execute("PRAGMA page_count").fetchone()[0])
+        finally:
+            conn.close()
+
+        metrics.DB_RECLAIMED_PAGES.inc(reclaimed)
+        stats = self.storage_stats()
+        stats['reclaimed_pages'] = reclaimed
+        if reclaimed:
+            logger.info("Reclaimed %s pages; database is %s bytes with %s free pages",
+                        reclaimed, stats['size_bytes'], stats['freelist_pages'])
+        return stats
+
+    def enable_incremental_vacuum(self) -> Dict:
+        """
+        Switch an existing database to incremental auto-vacuum.
+
+        SQLite only applies the mode with a full VACUUM, which rewrites the
+        whole file under an exclusive lock, so this is an operator step
+        (scripts/cleanup_price_history.py --enable-vacuum), not part of the
+        scheduled cleanup. Does nothing if the mode is already set.
+
+        Returns:
+            storage_stats() plus 'reclaimed_pages'
+        """
+        conn = self.get_connection()
+        conn.isolation_level = None  # VACUUM cannot run inside a transaction
+        try:
+            before = conn.execute("PRAGMA page_count").fetchone()[0]
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                logger.info("Switching database to incremental auto-vacuum (VACUUM)")
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            reclaimed = max(0, before - conn.execute("PRAGMA page_count").fetchone()[0])
+        finally:
+            conn.close()
+
+        Database._vacuum_warned_paths.discard(self.db_path)
+        metrics.DB_RECLAIMED_PAGES.inc(reclaimed)
+        stats = self.storage_stats()
+        stats['reclaimed_pages'] = reclaimed
+        return stats
+
+    def storage_stats(self) -> Dict:
+        """Database file size and page counts (also published to /metrics)."""
+        conn = self.get_connection()
+        try:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        finally:
+            conn.close()
+        stats = {
+            'size_bytes': page_size * page_count,
+            'page_size': page_size,
+            'page_count': page_count,
+            'freelist_pages': freelist,
+            'auto_vacuum': {0: 'none', 1: 'full', 2: 'incremental'}.get(auto_vacuum, auto_vacuum),
+        }
+        metrics.DB_SIZE_BYTES.set(stats['size_bytes'])
+        metrics.DB_FREELIST_PAGES.set(freelist)
+        return stats
+
     def get_latest_prices(self, asset_class: Optional[str] = None,
                           symbol: Optional[str] = None) -> List[Dict]:
         """
@@ -356,7 +433,34 @@ class Database:
         Can filter by asset_class and/or symbol.
         Returns calculated change_amount and change_percent.
         Only returns assets that are currently selected/enabled.
+
+        Results are cached per filter until the next price or selection
+        write made through this instance, and for at most
+        config.PRICE_CACHE_SECONDS (for writers in other processes). The API
+        and the web UI share one Database, so they share one read per
+        update. Callers get their own copies of the rows.
         """
+        key = (asset_class, symbol)
+        now = time.monotonic()
+        with self._price_cache_lock:
+            generation = self._price_generation
+            cached = self._price_cache.get(key)
+        if cached and now - cached[0] < config.PRICE_CACHE_SECONDS:
+            return [dict(row) for row in cached[1]]
+
+        rows = self._query_latest_prices(asset_class, symbol)
+        with self._price_cache_lock:
+            if generation == self._price_generation:
+                self._price_cache[key] = (now, rows)
+        return [dict(row) for row in rows]
+
+    def _invalidate_prices(self):
+        """Drop cached get_latest_prices() results after a write."""
+        with self._price_cache_lock:
+            self._price_generation += 1
+            self._price_cache.clear()
+
+    def _query_latest_prices(self, asset_class: Optional[str], symbol: Optional[str]) -> List[Dict]:
         conn = self.get_connection()
         cursor = conn.cursor()
 
@@ -4,23 +4,15 @@ Demo mode - runs API server with sample data (no Alpaca API needed).
 Perfect for testing the API endpoints without real credentials.
 """
 
-import sys
 import logging
 from datetime import datetime, date
-import time
-import signal
 
 import config
-from db import Database
-from scheduler import PriceScheduler
-from alpaca_client import AlpacaClient
-from api_server import run_api_server
+import logging_setup
+from runtime import HubRuntime
 
 # Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+logging_setup.setup_logging()
 logger = logging.getLogger(__name__)
 
 def create_sample_data(db):
@@ -66,16 +58,8 @@ def create_sample_data(db):
 
     logger.info(f"Created {len(stocks)} stocks, {len(crypto)} crypto, {len(forex)} forex")
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals."""
-    logger.info("Shutting down demo mode...")
-    sys.exit(0)
-
 def main():
     """Run demo mode."""
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-
     print("=" * 70)
     print("Raspberry Pi Hub - DEMO MODE")
     print("=" * 70)
@@ -83,19 +67,16 @@ def main():
     print("Running with sample data (no Alpaca API needed)")
     print()
 
-    # Initialize database
-    db = Database(db_path='./data/demo_prices.db')
+    # API only, no scheduler: prices stay at the sample values
+    runtime = HubRuntime(db_path='./data/demo_prices.db', web_port=None, scheduler_mode='never')
+    runtime.install_signal_handlers()
 
     # Create sample data
-    create_sample_data(db)
-
-    # Create dummy client and scheduler
-    client = AlpacaClient()
-    scheduler = PriceScheduler(db, client)
+    create_sample_data(runtime.db)
 
     # Start API server
     logger.info("Starting API server...")
-    run_api_server(db, scheduler)
+    runtime.start()
 
     print()
     print("=" * 70)
@@ -114,12 +95,9 @@ def main():
     print("=" * 70)
     print()
 
-    # Keep running
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        logger.info("Demo mode stopped")
+    runtime.wait()
+    runtime.shutdown()
+    logger.info("Demo mode stopped")
 
 if __name__ == '__main__':
     main()
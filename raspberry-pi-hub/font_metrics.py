@@ -0,0 +1,204 @@
+"""
+Glyph-width tables for the BDF fonts shipped with the Matrix Portal builds.
+
+The displays measure text glyph by glyph with ``font.get_glyph(ord(ch))``.
+This module parses the same BDF files on the hub so that the pixel width of
+every segment of a feed item (ticker, price, arrow, change) and of the whole
+scroll block can be returned alongside the prices, letting devices size their
+bitmaps without a measuring pass.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Layout defaults mirror matrix-portal-scroll/code.py (BLOCK_* constants, _layout_block)
+DEFAULT_CHAR_SPACING = 2
+DEFAULT_SEGMENT_GAP = 8
+DEFAULT_BLOCK_SPACING = 10
+
+_fonts_lock = threading.Lock()
+_fonts: Dict[str, 'BDFFont'] = {}
+
+
+class BDFFont:
+    """Metrics-only view of a BDF font (bitmaps are skipped while parsing)."""
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.bounding_box = (0, 0, 0, 0)
+        # codepoint -> BBX width, matching adafruit_bitmap_font Glyph.width
+        self.widths: Dict[int, int] = {}
+        self._parse()
+
+    def _parse(self):
+        encoding = None
+        with open(self.path, 'r', encoding='latin-1') as f:
+            for line in f:
+                if line.startswith('BITMAP'):
+                    continue
+                parts = line.split()
+                if not parts:
+                    continue
+                keyword = parts[0]
+                if keyword == 'FONTBOUNDINGBOX':
+                    self.bounding_box = tuple(int(p) for p in parts[1:5])
+                elif keyword == 'STARTCHAR':
+                    encoding = None
+                elif keyword == 'ENCODING':
+                    encoding = int(parts[1])
+                elif keyword == 'BBX':
+                    if encoding is not None and encoding >= 0:
+                        self.widths[encoding] = int(parts[1])
+        logger.info(f"Loaded font metrics for {self.name}: {len(self.widths)} glyphs")
+
+    def glyph_width(self, ch: str) -> Optional[int]:
+        """Width of a single character, or None if the font has no glyph for it."""
+        return self.widths.get(ord(ch))
+
+    def text_width(self, text: str, char_spacing: int = DEFAULT_CHAR_SPACING) -> int:
+        """
+        Pen advance for ``text`` exactly as the devices accumulate it:
+        each present glyph adds its width plus ``char_spacing``; missing glyphs add nothing.
+        """
+        width = 0
+        widths = self.widths
+        for ch in text or '':
+            w = widths.get(ord(ch))
+            if w is not None:
+                width += w + char_spacing
+        return width
+
+    def width_table(self, first: int = 32, last: int = 126) -> Dict[str, int]:
+        """Compact width table for a codepoint range (keys are codepoints as strings for JSON)."""
+        return {str(cp): self.widths[cp] for cp in range(first, last + 1) if cp in self.widths}
+
+
+def _font_dirs() -> List[str]:
+    return [d for d in getattr(config, 'FONT_DIRS', []) if d and os.path.isdir(d)]
+
+
+def _normalize_name(name: str) -> str:
+    base = os.path.basename(name or '')
+    if base.lower().endswith('.bdf'):
+        base = base[:-4]
+    return base
+
+
+def available_fonts() -> List[str]:
+    """Names of all BDF fonts found in the configured font directories."""
+    names = set()
+    for d in _font_dirs():
+        try:
+            for entry in os.listdir(d):
+                if entry.lower().endswith('.bdf'):
+                    names.add(entry[:-4])
+        except OSError:
+            continue
+    return sorted(names)
+
+
+def get_font(name: str) -> Optional[BDFFont]:
+    """
+    Load (once) and return the metrics for a font by name, e.g. 'spleen-16x32'
+    or 'fonts/spleen-16x32.bdf'. Returns None if the font cannot be found.
+    """
+    key = _normalize_name(name)
+    if not key:
+        return None
+
+    font = _fonts.get(key)
+    if font is not None:
+        return font
+
+    with _fonts_lock:
+        font = _fonts.get(key)
+        if font is not None:
+            return font
+        for d in _font_dirs():
+            path = os.path.join(d, key + '.bdf')
+            if os.path.isfile(path):
+                try:
+                    font = BDFFont(key, path)
+                except Exception as e:
+                    logger.error(f"Failed to parse font {path}: {e}")
+                    return None
+                _fonts[key] = font
+                return font
+
+    logger.warning(f"Font not found: {name}")
+    return None
+
+
+def segment_texts(item: Dict) -> List[str]:
+    """
+    Render the display segments for one price record the same way the scroll
+    build formats them: [ticker, price, arrow, change].
+    """
+    asset_class = (item.get('asset_class') or '').lower()
+    symbol = item.get('symbol') or '?'
+    last = float(item.get('last_price') or 0)
+
+    if asset_class == 'forex':
+        return [symbol.upper(), "{:.4f}".format(last), '', '']
+
+    if asset_class == 'crypto':
+        pct = float(item.get('change_percent') or 0)
+        arrow = "↑" if pct >= 0 else "↓"
+        return [symbol.upper(), "${:.2f}".format(last), arrow, "{:+.2f}%".format(pct)]
+
+    change = float(item.get('change_amount') or 0)
+    arrow = "↑" if change >= 0 else "↓"
+    return [symbol, "${:.2f}".format(last), arrow, "{:+.2f}".format(change)]
+
+
+def layout_item(item: Dict, font: BDFFont,
+                char_spacing: int = DEFAULT_CHAR_SPACING,
+                segment_gap: int = DEFAULT_SEGMENT_GAP,
+                block_spacing: int = DEFAULT_BLOCK_SPACING) -> Dict:
+    """
+    Compute segment and block widths for one feed item.
+
+    The block width includes the gaps the scroll build inserts before the
+    price, arrow and change segments plus the trailing block spacing, so a
+    device can place consecutive blocks by summing ``block_width``.
+    """
+    segments = segment_texts(item)
+    widths = [font.text_width(text, char_spacing) for text in segments]
+
+    block = widths[0] + segment_gap + widths[1]
+    if segments[2]:
+        block += segment_gap + widths[2]
+    if segments[3]:
+        block += segment_gap + widths[3]
+    block += block_spacing
+
+    return {
+        'font': font.name,
+        'segments': segments,
+        'segment_widths': widths,
+        'block_width': block
+    }
+
+
+def attach_layouts(items: List[Dict], font_name: str,
+                   char_spacing: int = DEFAULT_CHAR_SPACING,
+                   segment_gap: int = DEFAULT_SEGMENT_GAP,
+                   block_spacing: int = DEFAULT_BLOCK_SPACING) -> bool:
+    """
+    Add a 'layout' entry to every price record in place.
+
+    Returns False (leaving items untouched) if the font is unknown.
+    """
+    font = get_font(font_name)
+    if font is None:
+        return False
+    for item in items:
+        item['layout'] = layout_item(item, font, char_spacing, segment_gap, block_spacing)
+    return True
@@ -0,0 +1,188 @@
+"""
+Logging pipeline shared by the hub entry points.
+
+``setup_logging()`` puts one ``QueueHandler`` on the root logger. A thread
+that logs (a request handler, a scheduler job) only renders the message and
+appends the record to a bounded in-memory queue; a ``QueueListener`` thread
+does the formatting and the file and console writes. If the queue is full
+(the SD card stalls), new records are dropped and counted instead of
+blocking the caller.
+
+Before a record is queued it passes a per-key rate limit: at most
+``LOG_RATE_LIMIT`` records per call site (or per ``extra={'log_key': ...}``)
+in each ``LOG_RATE_WINDOW_SECONDS``. The first record after a window with
+drops carries ``suppressed=<n>``.
+
+The log file is rotated by size and holds one JSON object per line; the
+console keeps the plain text format.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Optional
+
+import config
+import metrics
+
+# LogRecord attributes that are not user-supplied ``extra`` fields
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_setup_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; ``extra`` fields are added as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """``config.LOG_FORMAT`` plus a note when similar records were suppressed."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', None)
+        return f"{text} [{suppressed} similar suppressed]" if suppressed else text
+
+
+class RateLimitFilter(logging.Filter):
+    """Let at most ``limit`` records per key through in each ``window`` seconds."""
+
+    def __init__(self, limit: int, window: float):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        self._windows: Dict = {}  # key -> [window start, passed, suppressed]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0:
+            return True
+        key = getattr(record, 'log_key', None) or (record.pathname, record.lineno)
+        now = record.created
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._windows[key] = [now, 1, 0]
+            elif state[1] < self.limit:
+                state[1] += 1
+                suppressed = 0
+            else:
+                state[2] += 1
+                metrics.LOG_RECORDS_DROPPED.inc(reason='rate_limited')
+                return False
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Queues a copy of the record with its message and traceback rendered; drops when full."""
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.LOG_RECORDS_DROPPED.inc(reason='queue_full')
+
+
+def setup_logging(level: str = config.LOG_LEVEL, console: bool = True) -> QueueListener:
+    """
+    Route the root logger through the queue and start the writer thread.
+
+    Safe to call more than once; later calls only change the level.
+
+    Args:
+        level: Root log level name
+        console: Also write plain text to stdout
+
+    Returns:
+        The running QueueListener (stopped and flushed at exit)
+    """
+    global _listener, _queue_handler
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+
+        Path(config.LOG_DIR).mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            config.LOG_PATH,
+            maxBytes=config.LOG_MAX_BYTES,
+            backupCount=config.LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        if config.LOG_FILE_FORMAT == 'json':
+            file_handler.setFormatter(JsonFormatter())
+        else:
+            file_handler.setFormatter(TextFormatter(config.LOG_FORMAT))
+        handlers = [file_handler]
+        if console:
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(TextFormatter(config.LOG_FORMAT))
+            handlers.append(stream_handler)
+
+        _queue_handler = _NonBlockingQueueHandler(queue.Queue(maxsize=config.LOG_QUEUE_SIZE))
+        _queue_handler.addFilter(RateLimitFilter(config.LOG_RATE_LIMIT, config.LOG_RATE_WINDOW_SECONDS))
+
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+        root.addHandler(_queue_handler)
+
+        _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """Stop the writer thread after it has written everything queued so far."""
+    global _listener, _queue_handler
+    with _setup_lock:
+        listener, _listener = _listener, None
+        queue_handler, _queue_handler = _queue_handler, None
+    if listener is None:
+        return
+    logging.getLogger().removeHandler(queue_handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
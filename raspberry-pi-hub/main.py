@@ -12,30 +12,15 @@ Usage:
 import sys
 import logging
 import signal
-from pathlib import Path
 
 import config
-from db import Database
-from alpaca_client import AlpacaClient
-from scheduler import PriceScheduler
-from api_server import run_api_server
-from ui import PriceHubGUI
+import logging_setup
+from runtime import HubRuntime
 
 
 def setup_logging():
     """Configure application logging."""
-    # Create logs directory if it doesn't exist
-    Path(config.LOG_DIR).mkdir(parents=True, exist_ok=True)
-
-    # Configure root logger
-    logging.basicConfig(
-        level=getattr(logging, config.LOG_LEVEL),
-        format=config.LOG_FORMAT,
-        handlers=[
-            logging.FileHandler(config.LOG_PATH),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    logging_setup.setup_logging()
 
     logger = logging.getLogger(__name__)
     logger.info("=" * 70)
@@ -65,40 +50,21 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    try:
-        # Initialize database
-        logger.info("Initializing database...")
-        db = Database()
-
-        # Initialize Alpaca client
-        logger.info("Initializing Alpaca client...")
-        alpaca_client = AlpacaClient()
-
-        # Check if we have stored credentials
-        api_key, api_secret = db.get_credentials()
-        if api_key and api_secret:
-            alpaca_client.set_credentials(api_key, api_secret)
-            logger.info("Loaded credentials from database")
+    # API only; the GUI starts the scheduler once assets are selected
+    runtime = HubRuntime(web_port=None, scheduler_mode='never')
 
-        # Initialize scheduler
-        logger.info("Initializing price scheduler...")
-        scheduler = PriceScheduler(db, alpaca_client)
-
-        # Start local API server
-        logger.info("Starting local HTTP API server...")
-        api_thread = run_api_server(db, scheduler)
+    try:
+        runtime.start()
 
-        # Create and run GUI
+        # Create and run GUI (tkinter is imported once the API is already serving)
         logger.info("Starting GUI...")
-        gui = PriceHubGUI(db, alpaca_client, scheduler)
+        from ui import PriceHubGUI
+        gui = PriceHubGUI(runtime.db, runtime.alpaca_client, runtime.scheduler)
 
         # Run the GUI (this blocks until window is closed)
         gui.run()
 
-        # Cleanup after GUI closes
         logger.info("Application shutting down...")
-        scheduler.stop()
-        logger.info("Scheduler stopped")
 
     except KeyboardInterrupt:
         logger.info("Application interrupted by user")
@@ -106,7 +72,7 @@ def main():
         logger.error(f"Fatal error: {e}", exc_info=True)
         sys.exit(1)
     finally:
-        logger.info("Raspberry Pi Hub - Shutdown Complete")
+        runtime.shutdown()
 
 
 if __name__ == '__main__':
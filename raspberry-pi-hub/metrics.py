@@ -0,0 +1,346 @@
+"""
+In-process metrics registry for the hub, exposed by the API as ``/metrics``
+in the Prometheus text format.
+
+Counters, gauges and histograms live in this module and are updated from the
+request hooks in api_server, the Database methods, the provider HTTP sessions
+and the scheduler jobs. Every metric keeps its own small lock that is held
+only while a series value is updated, so recording costs a dict lookup and a
+few additions; nothing is sent anywhere, a scraper (or ``curl``) reads the
+current values.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; covers a local SQLite read (sub-millisecond) up to a slow provider call
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CYCLE_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 150)
+
+_registry_lock = threading.Lock()
+_registry: List['_Metric'] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = '') -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class: a named family of series keyed by label values."""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple, object] = {}
+        with _registry_lock:
+            _registry.append(self)
+
+    def _key(self, labels: Dict) -> Tuple:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def clear(self):
+        """Drop all series (used by tests and benchmarks)."""
+        with self._lock:
+            self._series.clear()
+
+    def collect(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            series = sorted(self._series.items())
+            lines.extend(self._render(series))
+        return lines
+
+    def _render(self, series) -> List[str]:
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+                for key, value in series]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._series.get(self._key(labels), 0)
+
+    def total(self) -> float:
+        """Sum over all label values."""
+        with self._lock:
+            return sum(self._series.values())
+
+
+class Gauge(_Metric):
+    """Value that is set to the latest reading."""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def value(self, **labels) -> Optional[float]:
+        return self._series.get(self._key(labels))
+
+
+class _HistogramSeries:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """Distribution of observations in fixed cumulative buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets) + 1)
+            series.counts[index] += 1
+            series.sum += value
+            series.count += 1
+
+    def time(self, **labels):
+        """Context manager that observes the elapsed wall time of its block."""
+        return _Timer(self, labels)
+
+    def snapshot(self, **labels) -> Optional[Tuple[int, float]]:
+        """(count, sum) of one series, or None if nothing was observed."""
+        series = self._series.get(self._key(labels))
+        return (series.count, series.sum) if series else None
+
+    def total_count(self) -> int:
+        """Observations over all label values."""
+        with self._lock:
+            return sum(series.count for series in self._series.values())
+
+    def _render(self, series) -> List[str]:
+        lines = []
+        for key, data in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), data.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(data.sum)}')
+            lines.append(f'{self.name}_count{labels} {data.count}')
+        return lines
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram: Histogram, labels: Dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.collect())
+    return '\n'.join(lines) + '\n'
+
+
+# -- Hub metrics ------------------------------------------------------------
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'tickertronix_http_request_duration_seconds',
+    'Local API request latency by route template.',
+    ('method', 'route'))
+HTTP_REQUESTS = Counter(
+    'tickertronix_http_requests_total',
+    'Local API responses by route template and status code.',
+    ('method', 'route', 'status'))
+DEVICE_REQUESTS = Counter(
+    'tickertronix_device_requests_total',
+    'Device-facing requests (prices, time, device settings/heartbeat) by client address.',
+    ('client', 'route'))
+DEVICE_LAST_SEEN = Gauge(
+    'tickertronix_device_last_request_timestamp_seconds',
+    'Unix time of the latest device-facing request per client address.',
+    ('client',))
+
+DB_QUERY_SECONDS = Histogram(
+    'tickertronix_db_query_duration_seconds',
+    'Time spent in each Database method, including connection setup and commit.',
+    ('method',))
+DB_ERRORS = Counter(
+    'tickertronix_db_errors_total',
+    'Database methods that raised.',
+    ('method',))
+
+PROVIDER_REQUEST_SECONDS = Histogram(
+    'tickertronix_provider_request_duration_seconds',
+    'Upstream market data request latency by provider and endpoint path.',
+    ('provider', 'endpoint'))
+PROVIDER_ERRORS = Counter(
+    'tickertronix_provider_errors_total',
+    'Failed upstream requests (HTTP status >= 400 or connection error).',
+    ('provider', 'endpoint', 'reason'))
+PROVIDER_RATE_LIMITED = Counter(
+    'tickertronix_provider_rate_limited_total',
+    'Upstream responses with HTTP 429.',
+    ('provider', 'endpoint'))
+
+CYCLE_SECONDS = Histogram(
+    'tickertronix_update_cycle_duration_seconds',
+    'Duration of scheduler update jobs.',
+    ('job',), buckets=CYCLE_BUCKETS)
+CYCLE_SYMBOLS = Histogram(
+    'tickertronix_update_cycle_symbols',
+    'Symbols written to the database per update cycle and asset class.',
+    ('asset_class',), buckets=COUNT_BUCKETS)
+SYMBOLS_UPDATED = Counter(
+    'tickertronix_symbols_updated_total',
+    'Price rows written by the scheduler.',
+    ('asset_class',))
+SCHEDULER_JOB_RUNS = Counter(
+    'tickertronix_scheduler_job_runs_total',
+    'Scheduler job runs by outcome (success, error, skipped while still running, missed).',
+    ('job', 'outcome'))
+LAST_CYCLE_TIMESTAMP = Gauge(
+    'tickertronix_update_cycle_last_timestamp_seconds',
+    'Unix time the last run of each scheduler job finished.',
+    ('job',))
+
+DB_SIZE_BYTES = Gauge(
+    'tickertronix_db_size_bytes',
+    'Database file size after the last retention run.')
+DB_FREELIST_PAGES = Gauge(
+    'tickertronix_db_freelist_pages',
+    'Unused pages inside the database file after the last retention run.')
+DB_RECLAIMED_PAGES = Counter(
+    'tickertronix_db_reclaimed_pages_total',
+    'Free pages returned to the filesystem by incremental vacuum.')
+RETENTION_DELETED_ROWS = Counter(
+    'tickertronix_retention_deleted_rows_total',
+    'Price history rows deleted by retention.')
+STARTUP_SECONDS = Gauge(
+    'tickertronix_startup_seconds',
+    'Startup of this process: boot (process start to runtime start), database, api, scheduler, '
+    'web phases, and api_ready / ready measured from process start.',
+    ('phase',))
+LOG_RECORDS_DROPPED = Counter(
+    'tickertronix_log_records_dropped_total',
+    'Log records not written: rate_limited (per call site) or queue_full (writer behind).',
+    ('reason',))
+
+
+def timed_methods(histogram: Histogram, errors: Optional[Counter] = None,
+                  exclude: Sequence[str] = ()):
+    """
+    Class decorator timing every public method into ``histogram`` (label
+    ``method``) and counting exceptions into ``errors``.
+    """
+    def decorate(cls):
+        for name, func in list(vars(cls).items()):
+            if name.startswith('_') or name in exclude or not callable(func):
+                continue
+            setattr(cls, name, _timed(func, name, histogram, errors))
+        return cls
+    return decorate
+
+
+def _timed(func, name: str, histogram: Histogram, errors: Optional[Counter]):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            if errors is not None:
+                errors.inc(method=name)
+            raise
+        finally:
+            histogram.observe(time.perf_counter() - start, method=name)
+    return wrapper
+
+
+def instrument_session(session, provider: str):
+    """
+    Record latency, errors and 429s for every request made through a
+    ``requests.Session``. The endpoint label is the URL path (query strings
+    carry symbols and keys and are dropped).
+    """
+    send = session.request
+
+    def request(method, url, *args, **kwargs):
+        endpoint = urlsplit(url).path or '/'
+        start = time.perf_counter()
+        try:
+            response = send(method, url, *args, **kwargs)
+        except Exception as e:
+            PROVIDER_ERRORS.inc(provider=provider, endpoint=endpoint, reason=type(e).__name__)
+            raise
+        finally:
+            PROVIDER_REQUEST_SECONDS.observe(time.perf_counter() - start,
+                                             provider=provider, endpoint=endpoint)
+        status = response.status_code
+        if status == 429:
+            PROVIDER_RATE_LIMITED.inc(provider=provider, endpoint=endpoint)
+        if status >= 400:
+            PROVIDER_ERRORS.inc(provider=provider, endpoint=endpoint, reason=str(status))
+        return response
+
+    session.request = request
+    return session
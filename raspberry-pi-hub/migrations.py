@@ -0,0 +1,267 @@
+"""
+Versioned schema migrations for the hub database.
+
+Every schema change is a numbered step in ``MIGRATIONS``. ``apply_migrations``
+runs the steps above the version recorded in ``schema_version``; each step
+and its ``schema_version`` row are committed in one transaction, so a step
+that fails leaves the database at the previous version.
+
+A step that has to rewrite existing rows keeps the schema change in
+``upgrade`` (fast, done at startup) and the row work in ``backfill``: a
+function that handles one batch of at most ``batch_size`` rows that still
+need it and returns how many it changed. ``run_backfills`` calls it in short
+transactions, pausing between batches so requests and price writes get the
+database in between, until a batch returns 0. The hub runs backfills in a
+background thread after it starts serving; an interrupted backfill resumes
+at the next start, so backfills must pick their rows by what is still missing.
+
+To change the schema, append ``Migration(<next number>, '<what>', upgrade[, backfill])``
+and never edit a step that has already shipped.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class Migration:
+    """One numbered schema step."""
+
+    __slots__ = ('version', 'description', 'upgrade', 'backfill')
+
+    def __init__(self, version: int, description: str,
+                 upgrade: Callable[[sqlite3.Cursor], None],
+                 backfill: Optional[Callable[[sqlite3.Cursor, int], int]] = None):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+        self.backfill = backfill
+
+
+def add_column(cursor: sqlite3.Cursor, table: str, column: str, declaration: str):
+    """ALTER TABLE ... ADD COLUMN unless the column is already there."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+        logger.info(f"Added {column} column to {table}")
+
+
+# ==================== Steps ====================
+
+def _baseline(cursor: sqlite3.Cursor):
+    """Tables as of 1.1, plus the columns that older databases lack."""
+    # Config table for storing API credentials and settings
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS config (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+
+    # Selected assets table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS selected_assets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol TEXT NOT NULL,
+            asset_class TEXT NOT NULL,
+            enabled BOOLEAN DEFAULT 1,
+            UNIQUE(symbol, asset_class)
+        )
+    """)
+
+    # Asset prices table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS asset_prices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol TEXT NOT NULL,
+            asset_class TEXT NOT NULL,
+            date DATE NOT NULL,
+            open_price REAL,
+            prev_close REAL,
+            last_price REAL,
+            last_updated TIMESTAMP,
+            UNIQUE(symbol, asset_class, date)
+        )
+    """)
+    add_column(cursor, 'asset_prices', 'prev_close', 'REAL')
+
+    # Device registration and identification
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS devices (
+            device_id TEXT PRIMARY KEY,
+            device_name TEXT,
+            device_type TEXT,
+            device_key TEXT UNIQUE,
+            first_seen TIMESTAMP,
+            last_seen TIMESTAMP,
+            enabled BOOLEAN DEFAULT 1
+        )
+    """)
+
+    # Device-specific display settings
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS device_settings (
+            device_id TEXT PRIMARY KEY,
+            scroll_mode TEXT DEFAULT 'single',
+            scroll_speed INTEGER DEFAULT 100,
+            brightness INTEGER DEFAULT 10,
+            update_interval INTEGER DEFAULT 300,
+            top_sources TEXT DEFAULT '["stocks"]',
+            bottom_sources TEXT DEFAULT '["crypto","forex"]',
+            dwell_seconds INTEGER DEFAULT 3,
+            asset_order TEXT DEFAULT '["stocks","crypto","forex"]',
+            font TEXT DEFAULT 'default',
+            updated_at TIMESTAMP,
+            FOREIGN KEY (device_id) REFERENCES devices(device_id)
+        )
+    """)
+    add_column(cursor, 'device_settings', 'dwell_seconds', 'INTEGER DEFAULT 3')
+    add_column(cursor, 'device_settings', 'asset_order', "TEXT DEFAULT '[\"stocks\",\"crypto\",\"forex\"]'")
+
+
+def _price_date_index(cursor: sqlite3.Cursor):
+    """Lets retention find old rows without scanning the table."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_asset_prices_date ON asset_prices(date)")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'Baseline schema (config, assets, prices, devices, device settings)', _baseline),
+    Migration(2, 'Index asset_prices.date for retention', _price_date_index),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# ==================== Engine ====================
+
+def _ensure_version_table(cursor: sqlite3.Cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER NOT NULL,
+            applied_at TIMESTAMP
+        )
+    """)
+    add_column(cursor, 'schema_version', 'description', 'TEXT')
+    add_column(cursor, 'schema_version', 'backfilled_at', 'TIMESTAMP')
+
+
+def current_version(cursor: sqlite3.Cursor) -> int:
+    """Highest applied migration, 0 for a new (or pre-versioning) database."""
+    try:
+        cursor.execute("SELECT MAX(version) FROM schema_version")
+    except sqlite3.OperationalError:
+        return 0
+    row = cursor.fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn: sqlite3.Connection,
+                     migrations: List[Migration] = MIGRATIONS) -> List[int]:
+    """
+    Apply every step above the current version, each in its own transaction.
+
+    Returns:
+        Versions applied by this call
+
+    Raises:
+        RuntimeError: if a step fails (that step is rolled back)
+    """
+    conn.isolation_level = None  # explicit BEGIN/COMMIT below
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master")
+    if cursor.fetchone()[0] == 0:
+        # New file: the vacuum mode must be chosen before the first table exists
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    _ensure_version_table(cursor)
+    current = current_version(cursor)
+    if current > migrations[-1].version:
+        logger.warning(f"Database schema version {current} is newer than this code "
+                       f"({migrations[-1].version}); continuing without migrating")
+        return []
+
+    applied = []
+    for migration in migrations:
+        if migration.version <= current:
+            continue
+        started = time.perf_counter()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            if current_version(cursor) >= migration.version:
+                cursor.execute("ROLLBACK")  # another process got there first
+                continue
+            migration.upgrade(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.description, datetime.now())
+            )
+            cursor.execute("COMMIT")
+        except Exception as e:
+            cursor.execute("ROLLBACK")
+            raise RuntimeError(
+                f"Migration {migration.version} ({migration.description}) failed: {e}") from e
+        logger.info(f"Applied migration {migration.version}: {migration.description} "
+                    f"({time.perf_counter() - started:.2f}s)")
+        applied.append(migration.version)
+    return applied
+
+
+def pending_backfills(conn: sqlite3.Connection,
+                      migrations: List[Migration] = MIGRATIONS) -> List[Migration]:
+    """Applied steps whose backfill has not finished yet."""
+    with_backfill = {m.version: m for m in migrations if m.backfill}
+    if not with_backfill:
+        return []
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT version FROM schema_version WHERE backfilled_at IS NULL")
+    except sqlite3.OperationalError:
+        return []  # not migrated yet
+    return [with_backfill[row[0]] for row in cursor.fetchall() if row[0] in with_backfill]
+
+
+def run_backfills(conn: sqlite3.Connection, migrations: List[Migration] = MIGRATIONS,
+                  batch_size: int = config.MIGRATION_BACKFILL_BATCH,
+                  pause: float = config.MIGRATION_BACKFILL_PAUSE_SEC,
+                  stop: Optional[threading.Event] = None) -> Dict[int, int]:
+    """
+    Run pending backfills batch by batch, one short transaction per batch.
+
+    Args:
+        stop: Checked between batches; set it to stop early (resumed next start)
+
+    Returns:
+        Rows changed per migration version
+    """
+    conn.isolation_level = None
+    cursor = conn.cursor()
+    changed: Dict[int, int] = {}
+    for migration in pending_backfills(conn, migrations):
+        logger.info(f"Backfilling migration {migration.version}: {migration.description}")
+        changed[migration.version] = 0
+        while not (stop and stop.is_set()):
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                count = migration.backfill(cursor, batch_size)
+                if not count:
+                    cursor.execute("UPDATE schema_version SET backfilled_at = ? WHERE version = ?",
+                                   (datetime.now(), migration.version))
+                cursor.execute("COMMIT")
+            except Exception as e:
+                cursor.execute("ROLLBACK")
+                logger.error(f"Backfill for migration {migration.version} failed "
+                             f"(will retry at next start): {e}", exc_info=True)
+                break
+            if not count:
+                logger.info(f"Backfill for migration {migration.version} complete "
+                            f"({changed[migration.version]} rows)")
+                break
+            changed[migration.version] += count
+            time.sleep(pause)
+    return changed
@@ -0,0 +1,268 @@
+"""
+Opt-in request profiling for the hub's Flask apps.
+
+``install(app, name)`` hooks a Flask app. While profiling is enabled, a
+background thread samples the Python stack of every thread that is serving
+a request (every ``PROFILE_INTERVAL_MS``). When the request finishes, its
+samples are kept if the request was picked by ``sample_rate`` or took longer
+than ``slow_ms``, and are otherwise dropped. Kept profiles are written to
+``PROFILE_DIR`` in collapsed-stack format (``frame;frame;frame count`` per
+line), which flamegraph.pl, speedscope and inferno read directly.
+
+In ``cprofile`` mode the requests picked by ``sample_rate`` run under
+cProfile instead and a ``.prof`` file (pstats) is written; slow-request
+capture needs the sampler, because only sampling can decide after the fact.
+
+Settings change at runtime through ``profiler.configure()``, which the
+``/admin/profiling`` endpoint and the web UI's ``/api/profiling`` call; both
+check ``admin_allowed()`` first.
+"""
+
+import cProfile
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from flask import g, request
+
+import config
+
+logger = logging.getLogger(__name__)
+
+MODES = ('sample', 'cprofile')
+
+
+class _Capture:
+    __slots__ = ('app', 'method', 'route', 'start', 'keep', 'stacks', 'profile')
+
+    def __init__(self, app: str, method: str, route: str, keep: bool):
+        self.app = app
+        self.method = method
+        self.route = route
+        self.start = time.perf_counter()
+        self.keep = keep
+        self.stacks: Dict[str, int] = {}
+        self.profile: Optional[cProfile.Profile] = None
+
+
+class RequestProfiler:
+    """Runtime-configurable sampler shared by all installed apps."""
+
+    def __init__(self):
+        self.enabled = False
+        self.mode = 'sample'
+        self.sample_rate = config.PROFILE_SAMPLE_RATE
+        self.slow_ms = config.PROFILE_SLOW_MS
+        self.interval_ms = config.PROFILE_INTERVAL_MS
+        self.directory = config.PROFILE_DIR
+        self.max_files = config.PROFILE_MAX_FILES
+        self.written = 0
+        self._lock = threading.Lock()
+        self._active: Dict[int, _Capture] = {}
+        self._sampler: Optional[threading.Thread] = None
+
+    # ---- configuration ----
+
+    def configure(self, enabled: Optional[bool] = None, mode: Optional[str] = None,
+                  sample_rate: Optional[float] = None, slow_ms: Optional[float] = None,
+                  interval_ms: Optional[float] = None) -> Dict:
+        """
+        Update settings; omitted values are unchanged.
+
+        Raises:
+            ValueError: on an unknown mode or an out-of-range value
+        """
+        if mode is not None and mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+        if sample_rate is not None and not 0.0 <= float(sample_rate) <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if slow_ms is not None and float(slow_ms) < 0:
+            raise ValueError("slow_ms must be >= 0")
+        if interval_ms is not None and float(interval_ms) < 1:
+            raise ValueError("interval_ms must be >= 1")
+
+        with self._lock:
+            if mode is not None:
+                self.mode = mode
+            if sample_rate is not None:
+                self.sample_rate = float(sample_rate)
+            if slow_ms is not None:
+                self.slow_ms = float(slow_ms)
+            if interval_ms is not None:
+                self.interval_ms = float(interval_ms)
+            if enabled is not None:
+                self.enabled = bool(enabled)
+            start_sampler = self.enabled and self.mode == 'sample' and not (
+                self._sampler and self._sampler.is_alive())
+            if start_sampler:
+                self._sampler = threading.Thread(target=self._sample_loop, name='request-profiler', daemon=True)
+                self._sampler.start()
+        logger.info("Request profiling %s (mode=%s, sample_rate=%s, slow_ms=%s)",
+                    'enabled' if self.enabled else 'disabled', self.mode, self.sample_rate, self.slow_ms)
+        return self.status()
+
+    def status(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            'mode': self.mode,
+            'sample_rate': self.sample_rate,
+            'slow_ms': self.slow_ms,
+            'interval_ms': self.interval_ms,
+            'directory': self.directory,
+            'profiles_written': self.written,
+            'recent': self.recent_files(10),
+        }
+
+    def recent_files(self, limit: int) -> List[str]:
+        try:
+            names = sorted(os.listdir(self.directory), reverse=True)
+        except OSError:
+            return []
+        return names[:limit]
+
+    # ---- request hooks ----
+
+    def begin(self, app: str, method: str, route: str) -> Optional[_Capture]:
+        if not self.enabled:
+            return None
+        picked = random.random() < self.sample_rate
+        if self.mode == 'cprofile':
+            if not picked:
+                return None
+            capture = _Capture(app, method, route, True)
+            capture.profile = cProfile.Profile()
+            try:
+                capture.profile.enable()
+            except ValueError:
+                return None  # another request is already under cProfile (one per interpreter on 3.12+)
+            return capture
+        if not picked and not self.slow_ms:
+            return None
+        capture = _Capture(app, method, route, picked)
+        with self._lock:
+            self._active[threading.get_ident()] = capture
+        return capture
+
+    def end(self, capture: Optional[_Capture], status: Optional[int]):
+        if capture is None:
+            return
+        elapsed_ms = (time.perf_counter() - capture.start) * 1000.0
+        if capture.profile is not None:
+            capture.profile.disable()
+        else:
+            with self._lock:
+                self._active.pop(threading.get_ident(), None)
+        keep = capture.keep or (self.slow_ms and elapsed_ms >= self.slow_ms)
+        if not keep:
+            return
+        try:
+            self._write(capture, status, elapsed_ms)
+        except OSError as e:
+            logger.warning(f"Could not write request profile: {e}")
+
+    # ---- sampling ----
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while self.enabled and self.mode == 'sample':
+            time.sleep(self.interval_ms / 1000.0)
+            with self._lock:
+                active = list(self._active.items())
+            if not active:
+                continue
+            frames = sys._current_frames()
+            for ident, capture in active:
+                frame = frames.get(ident)
+                if frame is None or ident == own:
+                    continue
+                key = _collapse(frame)
+                capture.stacks[key] = capture.stacks.get(key, 0) + 1
+
+    # ---- output ----
+
+    def _write(self, capture: _Capture, status: Optional[int], elapsed_ms: float):
+        os.makedirs(self.directory, exist_ok=True)
+        route = re.sub(r'[^A-Za-z0-9]+', '_', capture.route).strip('_') or 'root'
+        stamp = time.strftime('%Y%m%d-%H%M%S') + f"-{int(time.time() * 1000) % 1000:03d}"
+        base = os.path.join(self.directory,
+                            f"{stamp}_{capture.app}_{capture.method}_{route}_{int(elapsed_ms)}ms")
+        if capture.profile is not None:
+            capture.profile.dump_stats(base + '.prof')
+        else:
+            if not capture.stacks:
+                return  # finished between two samples
+            root = f"{capture.app};{capture.method} {capture.route} ({status})"
+            with open(base + '.folded', 'w') as f:
+                for stack, count in sorted(capture.stacks.items()):
+                    f.write(f"{root};{stack} {count}\n")
+        self.written += 1
+        self._prune()
+
+    def _prune(self):
+        try:
+            names = sorted(os.listdir(self.directory))
+        except OSError:
+            return
+        for name in names[:max(0, len(names) - self.max_files)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+def _collapse(frame) -> str:
+    """Root-first ``;``-joined frames of a stack, as flamegraph tools expect."""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    parts.reverse()
+    return ';'.join(parts)
+
+
+profiler = RequestProfiler()
+
+
+def install(app, name: str):
+    """Register the profiling hooks on a Flask app (no cost while profiling is disabled)."""
+
+    @app.before_request
+    def _profile_begin():
+        if profiler.enabled:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            g.profile_capture = profiler.begin(name, request.method, route)
+
+    @app.after_request
+    def _profile_status(response):
+        g.profile_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _profile_end(exc):
+        capture = g.pop('profile_capture', None)
+        if capture is not None:
+            profiler.end(capture, g.pop('profile_status', 500 if exc else None))
+
+    return app
+
+
+def admin_allowed() -> bool:
+    """
+    Whether the current request may read or change profiling settings.
+
+    Loopback callers are allowed; when HUB_ADMIN_TOKEN is set, only callers
+    presenting it in an X-Admin-Token header are. Used by both Flask apps.
+    """
+    if config.HUB_ADMIN_TOKEN:
+        return request.headers.get('X-Admin-Token') == config.HUB_ADMIN_TOKEN
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+
+if config.PROFILE_ENABLED:
+    profiler.configure(enabled=True)
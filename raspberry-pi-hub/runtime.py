@@ -0,0 +1,272 @@
+"""
+Single-process runtime shared by the hub entry points.
+
+HubRuntime owns one Database, one AlpacaClient and one PriceScheduler and
+serves the device API (``API_PORT``) and, when enabled, the web UI
+(``WEB_PORT``) from the same process with those same instances, so both apps
+share the Database's price cache and the scheduler's job state.
+
+Components are created on first use, and modules that are slow to import
+(requests, APScheduler, the web UI) are imported only when needed. start()
+brings the device API up first, serving the prices already in the database,
+and only then builds the scheduler and the web UI. The time to each step is
+logged, kept in ``startup_timings`` and exported as
+``tickertronix_startup_seconds``. Lifecycle:
+
+    created -> running -> stopping -> stopped
+
+Pending schema backfills (migrations.py) run in a background thread once
+the servers are up. ``shutdown()`` stops the HTTP servers first (no new
+requests), then the backfill (after its current batch), then the scheduler
+(a running job finishes), then flushes the log queue.
+"""
+
+import logging
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import config
+import logging_setup
+import metrics
+from db import Database
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_MODES = ('auto', 'always', 'never')
+
+
+def process_uptime() -> Optional[float]:
+    """Seconds since this process started (Linux /proc), or None elsewhere."""
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class HubRuntime:
+    """Shared components and HTTP servers of one hub process."""
+
+    def __init__(self, db_path: str = config.DB_PATH, host: str = config.API_HOST,
+                 api_port: int = config.API_PORT, web_port: Optional[int] = config.WEB_PORT,
+                 scheduler_mode: str = 'auto'):
+        """
+        Args:
+            db_path: SQLite database file
+            host: Interface both servers bind to
+            api_port: Device API port
+            web_port: Web UI port, or None to serve the API only
+            scheduler_mode: 'auto' (start when Alpaca credentials are stored),
+                'always', or 'never' (started later by the UI, if at all)
+        """
+        if scheduler_mode not in SCHEDULER_MODES:
+            raise ValueError(f"scheduler_mode must be one of {', '.join(SCHEDULER_MODES)}")
+        self.db_path = db_path
+        self.host = host
+        self.api_port = api_port
+        self.web_port = web_port
+        self.scheduler_mode = scheduler_mode
+        self.state = 'created'
+        self._lock = threading.RLock()
+        self._stop_requested = threading.Event()
+        self._db: Optional[Database] = None
+        self._alpaca_client = None
+        self._scheduler = None
+        self._servers: List[Tuple[str, object, threading.Thread]] = []
+        self._backfill: Optional[threading.Thread] = None
+        self.startup_timings: Dict[str, float] = {}
+
+    # ==================== Shared components ====================
+
+    @property
+    def db(self) -> Database:
+        with self._lock:
+            if self._db is None:
+                logger.info(f"Opening database {self.db_path}")
+                self._db = Database(self.db_path)
+            return self._db
+
+    @property
+    def alpaca_client(self):
+        """Shared AlpacaClient (imports requests on first use)."""
+        with self._lock:
+            if self._alpaca_client is None:
+                from alpaca_client import AlpacaClient
+                self._alpaca_client = AlpacaClient()
+                api_key, api_secret = self.db.get_credentials()
+                if api_key and api_secret:
+                    self._alpaca_client.set_credentials(api_key, api_secret)
+                    logger.info("Loaded credentials from database")
+            return self._alpaca_client
+
+    @property
+    def scheduler(self):
+        """Shared PriceScheduler (imports APScheduler on first use)."""
+        with self._lock:
+            if self._scheduler is None:
+                from scheduler import PriceScheduler
+                self._scheduler = PriceScheduler(self.db, self.alpaca_client)
+            return self._scheduler
+
+    def has_credentials(self) -> bool:
+        api_key, api_secret = self.db.get_credentials()
+        return bool(api_key and api_secret)
+
+    # ==================== Lifecycle ====================
+
+    def start(self):
+        """
+        Start the device API, then the scheduler and the web UI.
+
+        The API serves stored prices (and reports the scheduler as stopped)
+        while the rest is still being set up.
+        """
+        with self._lock:
+            if self.state != 'created':
+                raise RuntimeError(f"Runtime already {self.state}")
+
+            uptime = process_uptime()
+            if uptime is not None:
+                self._record('boot', uptime)
+            started = time.perf_counter()
+
+            with self._timed('database'):
+                db = self.db
+            with self._timed('api'):
+                import api_server
+                api_server.init_api(db, None)
+                logging.getLogger('werkzeug').setLevel(logging.WARNING)
+                self._serve('api', api_server.app, self.api_port)
+            self._record('api_ready', (uptime or 0.0) + time.perf_counter() - started)
+
+            with self._timed('scheduler'):
+                api_server.init_api(db, self.scheduler)
+
+            if self.web_port is not None:
+                with self._timed('web'):
+                    import web_ui
+                    web_ui.init_web_ui(db, self.alpaca_client, self.scheduler)
+                    self._serve('web', web_ui.web_app, self.web_port)
+
+            self._record('ready', (uptime or 0.0) + time.perf_counter() - started)
+            self.state = 'running'
+
+        logger.info(f"Startup: {self.startup_summary()}")
+        self._start_scheduler()
+        self._start_backfills()
+
+    def _start_backfills(self):
+        """Run pending migration backfills in the background while serving."""
+        pending = self.db.pending_backfills()
+        if not pending:
+            return
+        logger.info(f"Running schema backfills in the background: {', '.join(pending)}")
+        self._backfill = threading.Thread(target=self.db.run_backfills, kwargs={'stop': self._stop_requested},
+                                          name='schema-backfill', daemon=True)
+        self._backfill.start()
+
+    def startup_summary(self) -> str:
+        """One line with the startup timings, e.g. for the console banner."""
+        t = self.startup_timings
+        since = "process start" if 'boot' in t else "start()"
+        phases = ', '.join(f"{name} {t[name] * 1000:.0f} ms"
+                           for name in ('boot', 'database', 'api', 'scheduler', 'web') if name in t)
+        return (f"API serving {t.get('api_ready', 0) * 1000:.0f} ms after {since}, "
+                f"ready after {t.get('ready', 0) * 1000:.0f} ms ({phases})")
+
+    def _record(self, phase: str, seconds: float):
+        self.startup_timings[phase] = seconds
+        metrics.STARTUP_SECONDS.set(round(seconds, 4), phase=phase)
+
+    @contextmanager
+    def _timed(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(phase, time.perf_counter() - start)
+
+    def _serve(self, name: str, app, port: int):
+        from werkzeug.serving import make_server
+        server = make_server(self.host, port, app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, name=f'{name}-http', daemon=True)
+        thread.start()
+        self._servers.append((name, server, thread))
+        logger.info(f"{name} server listening on http://{self.host}:{server.server_port}")
+
+    def _start_scheduler(self):
+        if self.scheduler_mode == 'never':
+            logger.info("Scheduler not started (scheduler_mode=never)")
+            return
+        if self.scheduler_mode == 'auto' and not self.has_credentials():
+            logger.warning("Scheduler not started automatically: missing Alpaca credentials")
+            return
+        try:
+            self.scheduler.start()
+            logger.info(f"Scheduler running - interval {config.UPDATE_INTERVAL_MINUTES} minutes")
+        except Exception as e:
+            logger.error(f"Failed to start scheduler: {e}", exc_info=True)
+
+    def install_signal_handlers(self):
+        """Turn SIGINT/SIGTERM into a graceful shutdown (call from the main thread)."""
+        def handle(signum, frame):
+            logger.info(f"Received signal {signum}, shutting down...")
+            self._stop_requested.set()
+
+        signal.signal(signal.SIGINT, handle)
+        signal.signal(signal.SIGTERM, handle)
+
+    def request_shutdown(self):
+        """Ask wait() to return; safe from any thread."""
+        self._stop_requested.set()
+
+    def wait(self):
+        """Block until a shutdown is requested."""
+        while not self._stop_requested.wait(1.0):
+            pass
+
+    def run(self):
+        """start(), wait for SIGINT/SIGTERM, then shutdown()."""
+        self.install_signal_handlers()
+        try:
+            self.start()
+            self.wait()
+        finally:
+            self.shutdown()
+
+    def shutdown(self, wait_for_jobs: bool = True):
+        """
+        Stop servers, then the scheduler, then flush logs. Safe to call twice.
+
+        Args:
+            wait_for_jobs: Let a scheduler job that is running finish first
+        """
+        with self._lock:
+            if self.state in ('stopping', 'stopped'):
+                return
+            self.state = 'stopping'
+        self._stop_requested.set()
+
+        for name, server, thread in reversed(self._servers):
+            server.shutdown()
+            server.server_close()
+            thread.join(timeout=5)
+            logger.info(f"{name} server stopped")
+        self._servers.clear()
+
+        if self._backfill is not None:
+            self._backfill.join(timeout=5)  # stops after its current batch
+
+        if self._scheduler is not None:
+            self._scheduler.stop(wait=wait_for_jobs)
+
+        logger.info("Raspberry Pi Hub - Shutdown Complete")
+        self.state = 'stopped'
+        logging_setup.shutdown_logging()
@@ -1,20 +1,41 @@
 """
 Background scheduler for periodic price updates.
 Uses APScheduler to fetch prices at regular intervals.
+
+Every job runs through PriceScheduler._run_job, which allows one run per job
+at a time (a second one is skipped, or waits when it is a manual refresh)
+and records duration, outcome and skipped/missed counts in get_status() and
+/metrics.
 """
 
 import logging
+import threading
+import time
+import uuid
 from datetime import datetime, date, timedelta
-from typing import Optional, List
+from typing import Dict, Optional, List
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 import config
+import metrics
 from db import Database
 from alpaca_client import AlpacaClient
 
 logger = logging.getLogger(__name__)
 
+# APScheduler job id -> job name used in stats and metrics
+JOB_NAMES = {
+    'price_update_job': 'prices',
+    'initial_update': 'prices',
+    'forex_update_job': 'forex',
+    'initial_forex_update': 'forex',
+    'price_cleanup_job': 'cleanup',
+    'initial_price_cleanup': 'cleanup',
+}
+MANUAL_JOB_HISTORY = 20  # manual refresh records kept for polling
+
 
 class PriceScheduler:
     """Manages periodic price updates for selected assets."""
@@ -29,11 +50,20 @@ class PriceScheduler:
         """
         self.db = db
         self.alpaca_client = alpaca_client
-        self.scheduler = BackgroundScheduler()
+        self.scheduler = BackgroundScheduler(job_defaults={
+            'coalesce': True,
+            'max_instances': 1,
+            'misfire_grace_time': config.SCHEDULER_MISFIRE_GRACE_SECONDS,
+        })
+        self.scheduler.add_listener(self._on_job_event, EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
         self.last_update_time: Optional[datetime] = None
         self.next_update_time: Optional[datetime] = None
         self.is_running = False
         self.last_forex_update: Optional[datetime] = None
+        self._job_locks = {name: threading.Lock() for name in ('prices', 'forex', 'cleanup')}
+        self._stats_lock = threading.Lock()
+        self.job_stats: Dict[str, Dict] = {name: self._new_stats() for name in self._job_locks}
+        self._manual: Dict[str, Dict] = {}
 
     def start(self, interval_minutes: int = config.UPDATE_INTERVAL_MINUTES):
         """
@@ -79,9 +109,7 @@ class PriceScheduler:
         self.is_running = True
 
         # Calculate next update time
-        jobs = [j for j in self.scheduler.get_jobs() if j.id == 'price_update_job']
-        if jobs:
-            self.next_update_time = jobs[0].next_run_time
+        self._refresh_next_update_time()
 
         logger.info(f"Scheduler started - updating every {interval_minutes} minutes")
         logger.info(f"Next update scheduled for: {self.next_update_time}")
@@ -105,101 +133,201 @@ class PriceScheduler:
             replace_existing=True
         )
 
-    def stop(self):
-        """Stop the scheduler."""
+    def stop(self, wait: bool = False):
+        """
+        Stop the scheduler.
+
+        Args:
+            wait: Block until a job that is currently running has finished
+        """
         if not self.is_running:
             return
 
-        self.scheduler.shutdown(wait=False)
+        self.scheduler.shutdown(wait=wait)
         self.is_running = False
         logger.info("Scheduler stopped")
 
-    def update_all_prices(self):
+    def update_all_prices(self, wait: bool = False) -> str:
         """
-        Main function to update prices for all selected assets.
+        Update prices for all selected assets (stocks and crypto).
         This is called periodically by the scheduler.
+
+        Args:
+            wait: If another price update is running, wait for it instead of skipping
+
+        Returns:
+            Run outcome: 'success', 'error' or 'skipped'
         """
-        logger.info("=" * 60)
+        return self._run_job('prices', self._update_all_prices, wait)
+
+    def _update_all_prices(self):
         logger.info("Starting scheduled price update")
-        logger.info("=" * 60)
 
         update_start = datetime.now()
 
-        try:
-            # Get all selected assets grouped by class
-            all_assets = self.db.get_selected_assets()
+        # Get all selected assets grouped by class
+        all_assets = self.db.get_selected_assets()
 
-            if not all_assets:
-                logger.warning("No assets selected for tracking")
-                return
+        if not all_assets:
+            logger.warning("No assets selected for tracking")
+            return
 
-            # Group assets by class
-            assets_by_class = {
-                'stocks': [],
-                'forex': [],
-                'crypto': []
-            }
+        # Group assets by class
+        assets_by_class = {
+            'stocks': [],
+            'forex': [],
+            'crypto': []
+        }
 
-            for asset in all_assets:
-                asset_class = asset['asset_class']
-                if asset_class in assets_by_class:
-                    assets_by_class[asset_class].append(asset['symbol'])
+        for asset in all_assets:
+            asset_class = asset['asset_class']
+            if asset_class in assets_by_class:
+                assets_by_class[asset_class].append(asset['symbol'])
 
-            # Update prices for each asset class
-            total_updated = 0
+        # Update prices for each asset class
+        total_updated = 0
+        failed = []
 
-            for asset_class, symbols in assets_by_class.items():
-                if not symbols:
-                    continue
-                # Skip forex here; handled by dedicated job to respect Twelve Data limits
-                if asset_class == 'forex':
-                    continue
+        for asset_class, symbols in assets_by_class.items():
+            if not symbols:
+                continue
+            # Skip forex here; handled by dedicated job to respect Twelve Data limits
+            if asset_class == 'forex':
+                continue
 
-                logger.info(f"Updating {len(symbols)} {asset_class} assets...")
+            logger.info(f"Updating {len(symbols)} {asset_class} assets...")
+            try:
                 updated = self._update_class_prices(asset_class, symbols)
-                total_updated += updated
+            except Exception as e:
+                # Keep going so one provider outage does not stall the other classes
+                logger.error(f"Error updating {asset_class} prices: {e}")
+                failed.append(asset_class)
+                updated = 0
+            self._record_symbols(asset_class, updated)
+            total_updated += updated
+
+        # Update timestamps
+        self.last_update_time = update_start
+        self._refresh_next_update_time()
+
+        update_duration = (datetime.now() - update_start).total_seconds()
+        logger.info(f"Price update completed: {total_updated} assets updated in {update_duration:.2f}s "
+                    f"(next update: {self.next_update_time})")
+        if failed:
+            raise RuntimeError(f"Price update failed for {', '.join(failed)}")
+
+    def update_forex_prices(self, wait: bool = False) -> str:
+        """
+        Dedicated forex updater (uses Twelve Data via scheduler).
 
-            # Update timestamps
-            self.last_update_time = update_start
-            jobs = self.scheduler.get_jobs()
-            if jobs:
-                self.next_update_time = jobs[0].next_run_time
+        Returns:
+            Run outcome: 'success', 'error' or 'skipped'
+        """
+        return self._run_job('forex', self._update_forex_prices, wait)
+
+    def _update_forex_prices(self):
+        assets = self.db.get_selected_assets(asset_class='forex')
+        # Only enabled ones
+        symbols = [a['symbol'] for a in assets if a.get('enabled')]
+        if not symbols:
+            logger.info("No forex assets selected/enabled; skipping forex update")
+            return
 
-            update_duration = (datetime.now() - update_start).total_seconds()
-            logger.info(f"Price update completed: {total_updated} assets updated in {update_duration:.2f}s")
-            logger.info(f"Next update: {self.next_update_time}")
+        updated = self._update_class_prices('forex', symbols, use_twelve_data=True)
+        self._record_symbols('forex', updated)
+        self.last_forex_update = datetime.now()
+        logger.info(f"Forex update completed: {updated} assets updated")
+
+    def cleanup_price_history(self, wait: bool = False) -> str:
+        """Prune old price history rows to enforce retention limits, then reclaim the freed pages."""
+        return self._run_job('cleanup', self._cleanup_price_history, wait)
+
+    def _cleanup_price_history(self):
+        removed = self.db.cleanup_price_history()
+        stats = self.db.reclaim_space()
+        logger.info(
+            "Price history cleanup completed; removed %s old rows, reclaimed %s pages.",
+            removed,
+            stats['reclaimed_pages']
+        )
 
-        except Exception as e:
-            logger.error(f"Error during price update: {e}", exc_info=True)
+    # ==================== Job bookkeeping ====================
 
-    def update_forex_prices(self):
-        """
-        Dedicated forex updater (uses Twelve Data via scheduler).
-        """
-        try:
-            assets = self.db.get_selected_assets(asset_class='forex')
-            # Only enabled ones
-            symbols = [a['symbol'] for a in assets if a.get('enabled')]
-            if not symbols:
-                logger.info("No forex assets selected/enabled; skipping forex update")
-                return
+    @staticmethod
+    def _new_stats() -> Dict:
+        return {
+            'runs': 0, 'errors': 0, 'skipped': 0, 'missed': 0, 'running': False,
+            'last_outcome': None, 'last_started': None,
+            'last_duration_s': None, 'max_duration_s': None,
+        }
 
-            updated = self._update_class_prices('forex', symbols, use_twelve_data=True)
-            self.last_forex_update = datetime.now()
-            logger.info(f"Forex update completed: {updated} assets updated")
-        except Exception as e:
-            logger.error(f"Error during forex update: {e}", exc_info=True)
+    def _run_job(self, job: str, fn, wait: bool = False) -> str:
+        """
+        Run one job body with overrun protection and bookkeeping.
 
-    def cleanup_price_history(self):
-        """Prune old price history rows to enforce retention limits."""
+        A run that finds the same job still in progress is skipped (scheduled
+        runs) or waits for it (manual refreshes); exceptions are logged and
+        reported as the 'error' outcome instead of propagating.
+        """
+        lock = self._job_locks[job]
+        if not lock.acquire(blocking=wait):
+            logger.warning(f"Skipping {job} job: previous run still in progress")
+            self._count(job, 'skipped')
+            return 'skipped'
+
+        started = time.perf_counter()
+        with self._stats_lock:
+            self.job_stats[job]['running'] = True
+            self.job_stats[job]['last_started'] = datetime.now().isoformat()
+        outcome = 'success'
         try:
-            removed = self.db.cleanup_price_history()
-            logger.info(
-                "Price history cleanup completed; removed %s old rows.",
-                removed
-            )
+            fn()
         except Exception as e:
-            logger.error("Error during price history cleanup: %s", e, exc_info=True)
+            outcome = 'error'
+            logger.error(f"Error during {job} job: {e}", exc_info=True)
+        finally:
+            duration = time.perf_counter() - started
+            lock.release()
+            with self._stats_lock:
+                stats = self.job_stats[job]
+                stats['running'] = False
+                stats['runs'] += 1
+                stats['last_outcome'] = outcome
+                stats['last_duration_s'] = round(duration, 3)
+                stats['max_duration_s'] = round(max(duration, stats['max_duration_s'] or 0), 3)
+                if outcome == 'error':
+                    stats['errors'] += 1
+            metrics.CYCLE_SECONDS.observe(duration, job=job)
+            metrics.LAST_CYCLE_TIMESTAMP.set(time.time(), job=job)
+            metrics.SCHEDULER_JOB_RUNS.inc(job=job, outcome=outcome)
+        return outcome
+
+    def _count(self, job: str, outcome: str):
+        with self._stats_lock:
+            self.job_stats[job][outcome] += 1
+        metrics.SCHEDULER_JOB_RUNS.inc(job=job, outcome=outcome)
+
+    def _on_job_event(self, event):
+        """APScheduler listener: count runs dropped for being late or because the job was still running."""
+        job = JOB_NAMES.get(event.job_id)
+        if job is None:
+            return
+        if event.code == EVENT_JOB_MISSED:
+            logger.warning(f"{job} job missed its run time ({event.scheduled_run_time})")
+            self._count(job, 'missed')
+        else:
+            logger.warning(f"{job} job skipped: previous run still in progress")
+            self._count(job, 'skipped')
+
+    def _refresh_next_update_time(self):
+        job = self.scheduler.get_job('price_update_job')
+        if job is not None:
+            self.next_update_time = getattr(job, 'next_run_time', None)
+
+    @staticmethod
+    def _record_symbols(asset_class: str, updated: int):
+        metrics.CYCLE_SYMBOLS.observe(updated, asset_class=asset_class)
+        metrics.SYMBOLS_UPDATED.inc(updated, asset_class=asset_class)
 
     def _update_class_prices(self, asset_class: str, symbols: List[str], use_twelve_data: bool = False) -> int:
         """
@@ -212,58 +340,47 @@ class PriceScheduler:
 
         Returns:
             Number of assets successfully updated
+
+        Raises:
+            RuntimeError: if no prices came back for the symbols
         """
-        try:
-            # Fetch latest prices from Alpaca
-            if use_twelve_data and asset_class == 'forex':
-                try:
-                    from twelvedata_client import TwelveDataClient
-                    td_client = TwelveDataClient()
-                    prices = td_client.get_forex_quotes(symbols)
-                except Exception as e:
-                    logger.error(f"Twelve Data client error: {e}", exc_info=True)
-                    prices = {}
+        # Fetch latest prices from Alpaca (provider and database errors propagate to _run_job)
+        if use_twelve_data and asset_class == 'forex':
+            from twelvedata_client import TwelveDataClient
+            td_client = TwelveDataClient(db=self.db)
+            prices = td_client.get_forex_quotes(symbols)
+        else:
+            prices = self.alpaca_client.get_prices_for_class(asset_class, symbols)
+
+        if not prices:
+            # The clients log provider errors and return {}; that is a failed run
+            raise RuntimeError(f"No prices received for {len(symbols)} {asset_class} symbols")
+
+        # Update database
+        updated_count = 0
+        today = date.today()
+
+        for symbol, price_data in prices.items():
+            open_price = price_data.get('open')
+            last_price = price_data.get('last')
+            prev_close = price_data.get('prev_close')
+
+            if open_price is not None and last_price is not None:
+                self.db.update_price(
+                    symbol=symbol,
+                    asset_class=asset_class,
+                    open_price=open_price,
+                    last_price=last_price,
+                    price_date=today,
+                    prev_close=prev_close
+                )
+                updated_count += 1
+                logger.debug("%s: open=%s, last=%s", symbol, open_price, last_price)
             else:
-                prices = self.alpaca_client.get_prices_for_class(asset_class, symbols)
-
-            if not prices:
-                logger.warning(f"No prices received for {asset_class}")
-                return 0
-
-            # Update database
-            updated_count = 0
-            today = date.today()
-
-            for symbol, price_data in prices.items():
-                try:
-                    open_price = price_data.get('open')
-                    last_price = price_data.get('last')
-                    prev_close = price_data.get('prev_close')
-
-                    if open_price is not None and last_price is not None:
-                        self.db.update_price(
-                            symbol=symbol,
-                            asset_class=asset_class,
-                            open_price=open_price,
-                            last_price=last_price,
-                            price_date=today,
-                            prev_close=prev_close
-                        )
-                        updated_count += 1
-                        logger.debug(f"{symbol}: open={open_price}, last={last_price}")
-                    else:
-                        logger.warning(f"Missing price data for {symbol}")
-
-                except Exception as e:
-                    logger.error(f"Error updating {symbol}: {e}")
-                    continue
-
-            logger.info(f"Updated {updated_count}/{len(symbols)} {asset_class} prices")
-            return updated_count
+                logger.warning(f"Missing price data for {symbol}")
 
-        except Exception as e:
-            logger.error(f"Error updating {asset_class} prices: {e}")
-            return 0
+        logger.info(f"Updated {updated_count}/{len(symbols)} {asset_class} prices")
+        return updated_count
 
     def get_status(self) -> dict:
         """
@@ -272,24 +389,92 @@ class PriceScheduler:
         Returns:
             Dict with status information
         """
+        with self._stats_lock:
+            jobs = {name: dict(stats) for name, stats in self.job_stats.items()}
         return {
             'is_running': self.is_running,
             'last_update': self.last_update_time.isoformat() if self.last_update_time else None,
             'next_update': self.next_update_time.isoformat() if self.next_update_time else None,
             'interval_minutes': config.UPDATE_INTERVAL_MINUTES,
             'forex_interval_minutes': getattr(config, 'FOREX_POLL_MINUTES', None),
-            'last_forex_update': self.last_forex_update.isoformat() if self.last_forex_update else None
+            'last_forex_update': self.last_forex_update.isoformat() if self.last_forex_update else None,
+            'jobs': jobs
         }
 
-    def trigger_manual_update(self):
-        """Trigger an immediate price update outside the schedule."""
+    # ==================== Manual refresh ====================
+
+    def queue_refresh(self, include_forex: bool = True) -> Dict:
+        """
+        Queue an immediate price refresh on the scheduler's executor.
+
+        A refresh that is already queued or running is returned instead of
+        queuing another one. Poll the returned 'id' with get_refresh().
+
+        Returns:
+            The refresh record ('id', 'status', timestamps, per-job 'outcomes')
+
+        Raises:
+            RuntimeError: if the scheduler is not running
+        """
         if not self.is_running:
-            logger.warning("Cannot trigger update - scheduler not running")
-            return
+            raise RuntimeError("Scheduler not running")
+
+        with self._stats_lock:
+            for record in self._manual.values():
+                if record['status'] in ('queued', 'running'):
+                    return dict(record)
+            job_id = uuid.uuid4().hex[:12]
+            record = {
+                'id': job_id,
+                'status': 'queued',
+                'include_forex': include_forex,
+                'queued_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'outcomes': {}
+            }
+            self._manual[job_id] = record
+            while len(self._manual) > MANUAL_JOB_HISTORY:
+                self._manual.pop(next(iter(self._manual)))
 
-        logger.info("Triggering manual price update")
         self.scheduler.add_job(
-            self.update_all_prices,
-            id='manual_update',
-            replace_existing=True
+            self._run_manual_refresh,
+            args=[job_id],
+            id=f'manual_{job_id}',
+            name='Manual price refresh',
+            misfire_grace_time=None
         )
+        logger.info(f"Manual price refresh queued ({job_id})")
+        return dict(record)
+
+    def get_refresh(self, job_id: str) -> Optional[Dict]:
+        """State of a manual refresh queued with queue_refresh(), or None if unknown."""
+        with self._stats_lock:
+            record = self._manual.get(job_id)
+            return dict(record, outcomes=dict(record['outcomes'])) if record else None
+
+    def _run_manual_refresh(self, job_id: str):
+        with self._stats_lock:
+            record = self._manual.get(job_id)
+            if record is None:
+                return
+            record['status'] = 'running'
+            record['started_at'] = datetime.now().isoformat()
+
+        outcomes = {'prices': self.update_all_prices(wait=True)}
+        if record['include_forex']:
+            outcomes['forex'] = self.update_forex_prices(wait=True)
+
+        with self._stats_lock:
+            record['outcomes'] = outcomes
+            record['status'] = 'done' if all(o == 'success' for o in outcomes.values()) else 'failed'
+            record['finished_at'] = datetime.now().isoformat()
+
+    def trigger_manual_update(self) -> Optional[str]:
+        """Trigger an immediate price update outside the schedule; returns the refresh id."""
+        if not self.is_running:
+            logger.warning("Cannot trigger update - scheduler not running")
+            return None
+
+        logger.info("Triggering manual price update")
+        return self.queue_refresh(include_forex=False)['id']
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Utility script to prune old price history from the local database."""
 
+import argparse
 import logging
 from pathlib import Path
 
@@ -11,19 +12,45 @@ import config
 from db import Database
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--days', type=int, default=config.PRICE_RETENTION_DAYS,
+                        help='Days of history to keep (default: %(default)s)')
+    parser.add_argument('--batch-size', type=int, default=config.PRICE_CLEANUP_BATCH,
+                        help='Rows deleted per transaction (default: %(default)s)')
+    parser.add_argument('--max-pages', type=int, default=0,
+                        help='Free pages to reclaim, 0 = all (default: %(default)s)')
+    parser.add_argument('--no-vacuum', action='store_true',
+                        help='Only delete rows; leave the free pages in the file')
+    parser.add_argument('--enable-vacuum', action='store_true',
+                        help='Switch a database created before incremental auto-vacuum over '
+                             '(one full VACUUM; best run while the hub is stopped)')
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     logger = logging.getLogger(__name__)
 
     logger.info(
         "Starting price history cleanup (retaining last %s days)...",
-        config.PRICE_RETENTION_DAYS,
+        args.days,
     )
 
+    # Same engine as the hub's daily cleanup job
     db = Database()
-    removed = db.cleanup_price_history()
+    removed = db.cleanup_price_history(retention_days=args.days, batch_size=args.batch_size)
     logger.info("Cleanup complete. Removed %s old rows.", removed)
 
+    if args.enable_vacuum:
+        db.enable_incremental_vacuum()
+    stats = db.storage_stats() if args.no_vacuum else db.reclaim_space(max_pages=args.max_pages)
+    logger.info(
+        "Database: %s bytes, %s free pages (auto_vacuum=%s).",
+        stats['size_bytes'], stats['freelist_pages'], stats['auto_vacuum'],
+    )
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Show or apply schema migrations and run pending backfills (the hub does both on start)."""
+
+import argparse
+import logging
+import sqlite3
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import config
+import migrations
+from db import Database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--db', default=config.DB_PATH, help='Database file (default: %(default)s)')
+    parser.add_argument('--status', action='store_true', help='Only show the schema version and pending backfills')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger(__name__)
+
+    if args.status:
+        if not Path(args.db).exists():
+            logger.info("No database at %s yet", args.db)
+            return
+        conn = sqlite3.connect(args.db)
+        version = migrations.current_version(conn.cursor())
+        pending = [f"{m.version}: {m.description}" for m in migrations.pending_backfills(conn)] if version else []
+        conn.close()
+        logger.info("Schema version %s (latest %s)", version, migrations.LATEST_VERSION)
+        logger.info("Pending backfills: %s", ', '.join(pending) or 'none')
+        return
+
+    db = Database(args.db)
+    changed = db.run_backfills()
+    logger.info("Schema at version %s; backfilled rows: %s", migrations.LATEST_VERSION, changed or 'none pending')
+
+
+if __name__ == "__main__":
+    main()
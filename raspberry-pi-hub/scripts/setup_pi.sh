@@ -93,6 +93,23 @@ EnvironmentFile=-$INSTALL_DIR/.env
 WantedBy=multi-user.target
 EOF
 
+AVAHI_SERVICE_FILE="/etc/avahi/services/${SERVICE_NAME}.service"
+echo "[INFO] Announcing hub API via mDNS ($AVAHI_SERVICE_FILE)"
+cat > "$AVAHI_SERVICE_FILE" <<'EOF'
+<?xml version="1.0" standalone='no'?>
+<!DOCTYPE service-group SYSTEM "avahi-service.dtd">
+<service-group>
+  <name replace-wildcards="yes">Tickertronix Hub on %h</name>
+  <service>
+    <type>_tickertronix._tcp</type>
+    <port>5001</port>
+    <txt-record>path=/prices</txt-record>
+    <txt-record>time=/time</txt-record>
+  </service>
+</service-group>
+EOF
+systemctl restart avahi-daemon || true
+
 echo "[INFO] Enabling and starting service..."
 systemctl daemon-reload
 systemctl enable "$SERVICE_NAME"
@@ -170,11 +170,26 @@ setup_hostname() {
 setup_avahi() {
     log_step "Configuring mDNS (Avahi)"
     
+    # Announce the hub API as a service that displays can browse for
+    cat > /etc/avahi/services/tickertronix-hub.service << 'EOF'
+<?xml version="1.0" standalone='no'?>
+<!DOCTYPE service-group SYSTEM "avahi-service.dtd">
+<service-group>
+  <name replace-wildcards="yes">Tickertronix Hub on %h</name>
+  <service>
+    <type>_tickertronix._tcp</type>
+    <port>5001</port>
+    <txt-record>path=/prices</txt-record>
+    <txt-record>time=/time</txt-record>
+  </service>
+</service-group>
+EOF
+
     # Enable and start avahi-daemon for .local hostname resolution
     systemctl enable avahi-daemon
-    systemctl start avahi-daemon
+    systemctl restart avahi-daemon
     
-    log_info "Avahi configured - device will be discoverable as $(hostname).local"
+    log_info "Avahi configured - device will be discoverable as $(hostname).local (service _tickertronix._tcp)"
 }
 
 create_service_user() {
@@ -8,6 +8,7 @@ import requests
 import time
 
 import config
+import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -15,20 +16,21 @@ logger = logging.getLogger(__name__)
 class TwelveDataClient:
     """Lightweight Twelve Data client for forex quotes."""
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, db=None):
         # Prefer provided key, then env/config, then DB if available
-        self.api_key = api_key or config.TWELVE_DATA_API_KEY or self._load_key_from_db()
+        self.api_key = api_key or config.TWELVE_DATA_API_KEY or self._load_key_from_db(db)
         self.base_url = config.TWELVE_DATA_BASE_URL
-        self.session = requests.Session()
+        self.session = metrics.instrument_session(requests.Session(), 'twelvedata')
 
     def set_api_key(self, api_key: str):
         self.api_key = api_key
 
-    def _load_key_from_db(self) -> str:
-        """Try to pull key from DB config if not in env."""
+    def _load_key_from_db(self, db=None) -> str:
+        """Try to pull key from DB config (the caller's Database if given) if not in env."""
         try:
-            from db import Database
-            db = Database(config.DB_PATH)
+            if db is None:
+                from db import Database
+                db = Database(config.DB_PATH)
             return db.get_config('twelve_data_api_key')
         except Exception:
             return None
@@ -10,16 +10,15 @@ import os
 import socket
 from datetime import datetime
 import config
+import profiling
 from db import Database
-from alpaca_client import AlpacaClient
-from scheduler import PriceScheduler
-from twelvedata_client import TwelveDataClient
 
 logger = logging.getLogger(__name__)
 
 # Create Flask app with static folder
 web_app = Flask(__name__, static_folder='static', static_url_path='/static')
 web_app.secret_key = 'raspberry-pi-hub-secret-key-change-in-production'
+profiling.install(web_app, 'web')
 
 # Global instances (set by init_web_ui)
 db = None
@@ -336,22 +335,59 @@ def api_status():
 
 @web_app.route('/api/refresh', methods=['POST'])
 def api_refresh():
-    """Trigger an immediate price refresh."""
+    """
+    Queue an immediate price refresh (stocks/crypto, then forex) on the scheduler.
+
+    Returns 202 with the refresh 'job_id'; poll GET /api/refresh/<job_id>
+    until 'status' is 'done' or 'failed'. A refresh already in progress is
+    returned instead of queuing a second one.
+    """
     if not scheduler:
         return jsonify({'success': False, 'message': 'Scheduler not initialized'}), 500
 
     try:
-        scheduler.update_all_prices()
-        # Also refresh forex (Twelve Data) immediately
-        scheduler.update_forex_prices()
-        return jsonify({'success': True, 'message': 'Prices refreshed'})
-    except Exception as e:
-        logger.error(f"Manual refresh failed: {e}", exc_info=True)
-        return jsonify({'success': False, 'message': str(e)}), 500
+        record = scheduler.queue_refresh(include_forex=True)
+    except RuntimeError as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
+    return jsonify({'success': True, 'job_id': record['id'], 'status': record['status'],
+                    'message': 'Refresh queued'}), 202
+
+
+@web_app.route('/api/refresh/<job_id>')
+def api_refresh_status(job_id):
+    """State of a queued refresh: queued, running, done or failed (with per-job outcomes)."""
+    record = scheduler.get_refresh(job_id) if scheduler else None
+    if record is None:
+        return jsonify({'success': False, 'message': 'Unknown refresh id'}), 404
+    return jsonify(dict(record, success=True))
+
+
+@web_app.route('/api/profiling', methods=['GET', 'POST'])
+def api_profiling():
+    """Show or change request profiling (same settings and access rule as the API's /admin/profiling)."""
+    if not profiling.admin_allowed():
+        return jsonify({'success': False, 'message': 'Forbidden'}), 403
+    if request.method == 'GET':
+        return jsonify(profiling.profiler.status())
+
+    body = request.get_json(silent=True) or {}
+    try:
+        status = profiling.profiler.configure(
+            enabled=body.get('enabled'),
+            mode=body.get('mode'),
+            sample_rate=body.get('sample_rate'),
+            slow_ms=body.get('slow_ms'),
+            interval_ms=body.get('interval_ms')
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify(status)
 
 
 if __name__ == '__main__':
     # This is for standalone testing
+    from alpaca_client import AlpacaClient
+    from scheduler import PriceScheduler
     logging.basicConfig(level=logging.INFO)
     db = Database()
     alpaca_client = AlpacaClient()
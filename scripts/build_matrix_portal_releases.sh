@@ -32,7 +32,7 @@ build_scroll() {
   rm -rf "${stage}"
   mkdir -p "${stage}"
 
-  cp "${ROOT_DIR}/matrix-portal-scroll"/{code.py,api_client.py,provisioning_v2.py,wifimgr.py,boot.py,boot_logo.py,time_sync.py,neopixel.mpy,settings.toml,device_config.json.sample} "${stage}/"
+  cp "${ROOT_DIR}/matrix-portal-scroll"/{code.py,api_client.py,frame_scheduler.py,provisioning_v2.py,wifimgr.py,boot.py,boot_logo.py,time_sync.py,neopixel.mpy,settings.toml,device_config.json.sample} "${stage}/"
   cp -R "${ROOT_DIR}/matrix-portal-scroll/fonts" "${stage}/"
   cp -R "${ROOT_DIR}/matrix-portal-scroll/lib" "${stage}/"
 
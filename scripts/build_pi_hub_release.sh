@@ -9,6 +9,8 @@
 #
 # Output:
 #   dist/tickertronix-raspberry-pi-hub-v{VERSION}.tar.gz
+#
+# The display fonts are bundled so the hub can serve text width tables.
 
 set -euo pipefail
 
@@ -33,6 +35,8 @@ tar -czf "${DIST_DIR}/${OUTPUT}" \
   --exclude='.venv' \
   --exclude='test_*.py' \
   --exclude='debug_*.py' \
-  raspberry-pi-hub/
+  raspberry-pi-hub/ \
+  matrix-portal-scroll/fonts \
+  matrix-portal-single/fonts
 
 echo "Built ${DIST_DIR}/${OUTPUT}"
@@ -143,7 +143,7 @@ echo -e "${GREEN}[2/3]${NC} Copying firmware files..."
 cd matrix-portal-scroll
 
 # Copy main firmware files
-cp code.py api_client.py provisioning_v2.py wifimgr.py boot.py time_sync.py boot_logo.py "${SCROLL_DIR}/"
+cp code.py api_client.py frame_scheduler.py provisioning_v2.py wifimgr.py boot.py time_sync.py boot_logo.py "${SCROLL_DIR}/"
 
 # Copy boot logo if exists
 if [ -f "boot_logo.bmp" ]; then